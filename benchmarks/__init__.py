@@ -0,0 +1,3 @@
+from .fixtures import FixtureSet
+from .stand_in import StandInServer, StandInTradeStream
+from .runner import BenchmarkRunner
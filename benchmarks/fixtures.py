@@ -0,0 +1,313 @@
+import argparse
+import copy
+import json
+import xml.etree.ElementTree as ET
+import zlib
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import requests
+from config.settings import (
+    API_CONFIGS,
+    BENCHMARK_CONFIG,
+    BRAZILIAN_STOCKS,
+    CRYPTO_ASSETS,
+    NASDAQ_STOCKS,
+    NEWS_SEARCH_TERMS
+)
+
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+INTRADAY_MS = {'1m': 60_000, '5m': 300_000, '15m': 900_000, '1h': 3_600_000, '4h': 14_400_000}
+
+RECORDINGS = {
+    'coingecko_market_chart.json': (
+        f"{API_CONFIGS['coingecko_base_url']}/coins/bitcoin/market_chart",
+        {'vs_currency': 'usd', 'days': '3', 'interval': 'daily'}
+    ),
+    'coingecko_markets.json': (
+        f"{API_CONFIGS['coingecko_base_url']}/coins/markets",
+        {'vs_currency': 'usd', 'ids': 'bitcoin'}
+    ),
+    'binance_klines.json': (
+        f"{API_CONFIGS['binance_base_url']}/klines",
+        {'symbol': 'BTCUSDT', 'interval': '1d', 'limit': '3'}
+    ),
+    'binance_ticker_24hr.json': (
+        f"{API_CONFIGS['binance_base_url']}/ticker/24hr",
+        {'symbols': '["BTCUSDT"]'}
+    ),
+    'awesomeapi_usd_brl.json': (API_CONFIGS['awesomeapi_url'], None),
+    'fallback_currency_usd.json': (API_CONFIGS['fallback_currency_url'], None),
+    'google_news_rss.xml': (
+        API_CONFIGS['google_news_base_url'],
+        {'q': 'Bitcoin BTC preço mercado', 'hl': 'pt-BR', 'gl': 'BR', 'ceid': 'BR:pt-419'}
+    ),
+    'yahoo_chart.json': (
+        'https://query1.finance.yahoo.com/v8/finance/chart/AAPL',
+        {'range': '5d', 'interval': '1d'}
+    )
+}
+
+
+def record_fixtures(directory: Path = FIXTURES_DIR):
+    session = requests.Session()
+    session.headers['User-Agent'] = 'Mozilla/5.0'
+    
+    for filename, (url, params) in RECORDINGS.items():
+        response = session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        (directory / filename).write_bytes(response.content)
+        print(f"Recorded {filename} ({len(response.content)} bytes)")
+
+
+def scale_symbol(symbol: str, copy_number: int) -> str:
+    if copy_number == 0:
+        return symbol
+    head, dot, tail = symbol.partition('.')
+    return f"{head}{copy_number}{dot}{tail}"
+
+
+class FixtureSet:
+    
+    def __init__(self, scale: int = 1, years: int = 1, news_per_term: int = None,
+                 directory: Path = FIXTURES_DIR):
+        self.scale = scale
+        self.years = years
+        self.days = 365 * years
+        self.news_per_term = news_per_term or BENCHMARK_CONFIG['news_per_term']
+        self.samples = self._load_samples(directory)
+        self.today = pd.Timestamp.now(tz='UTC').normalize()
+        
+        self.crypto_assets = [
+            {
+                'binance': f"{item['binance'][:-4]}{n or ''}USDT",
+                'coingecko': f"{item['coingecko']}-{n}" if n else item['coingecko']
+            }
+            for n in range(scale) for item in CRYPTO_ASSETS
+        ]
+        self.brazilian_stocks = [scale_symbol(t, n) for n in range(scale) for t in BRAZILIAN_STOCKS]
+        self.nasdaq_stocks = [scale_symbol(t, n) for n in range(scale) for t in NASDAQ_STOCKS]
+        self.news_terms = [
+            {**item, 'ticker': scale_symbol(item['ticker'], n), 'query': f"{item['query']} {n}" if n else item['query']}
+            for n in range(scale) for item in NEWS_SEARCH_TERMS
+        ]
+        self._series: Dict[str, pd.DataFrame] = {}
+        
+    def _load_samples(self, directory: Path) -> Dict[str, object]:
+        samples = {}
+        for path in directory.iterdir():
+            if path.suffix == '.json':
+                samples[path.stem] = json.loads(path.read_text(encoding='utf-8'))
+            elif path.suffix == '.xml':
+                samples[path.stem] = ET.fromstring(path.read_bytes())
+        return samples
+    
+    def series(self, name: str, reference_price: float) -> pd.DataFrame:
+        if name not in self._series:
+            rng = np.random.default_rng(zlib.crc32(name.encode()))
+            dates = pd.date_range(end=self.today, periods=self.days + 1, freq='D')
+            close = reference_price * rng.uniform(0.05, 2.0) * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+            spread = np.abs(rng.normal(0, 0.01, len(dates)))
+            self._series[name] = pd.DataFrame({
+                'open': close * (1 + rng.normal(0, 0.005, len(dates))),
+                'high': close * (1 + spread),
+                'low': close * (1 - spread),
+                'close': close,
+                'volume': rng.uniform(1e5, 1e7, len(dates)).round(),
+                'trades': rng.integers(1000, 100000, len(dates))
+            }, index=dates)
+        return self._series[name]
+    
+    def coingecko_market_chart(self, coin_id: str, days: int) -> dict:
+        sample = self.samples['coingecko_market_chart']
+        frame = self.series(coin_id, sample['prices'][-1][1]).tail(min(days, self.days) + 1)
+        timestamps = frame.index.as_unit('ms').asi8.tolist()
+        market_caps = frame['close'] * (sample['market_caps'][-1][1] / sample['prices'][-1][1])
+        
+        return {
+            'prices': [list(point) for point in zip(timestamps, frame['close'].tolist())],
+            'market_caps': [list(point) for point in zip(timestamps, market_caps.tolist())],
+            'total_volumes': [list(point) for point in zip(timestamps, frame['volume'].tolist())]
+        }
+        
+    def coingecko_markets(self, ids: List[str]) -> List[dict]:
+        prototype = self.samples['coingecko_markets'][0]
+        known = {item['coingecko'] for item in self.crypto_assets}
+        rows = []
+        
+        for coin_id in ids:
+            if coin_id not in known:
+                continue
+            frame = self.series(coin_id, prototype['current_price']).tail(2)
+            row = copy.deepcopy(prototype)
+            row.update({
+                'id': coin_id,
+                'symbol': coin_id[:4],
+                'name': coin_id.title(),
+                'current_price': frame['close'].iloc[-1],
+                'high_24h': frame['high'].iloc[-1],
+                'low_24h': frame['low'].iloc[-1],
+                'price_change_24h': frame['close'].iloc[-1] - frame['close'].iloc[0],
+                'total_volume': frame['volume'].iloc[-1],
+                'market_cap': frame['close'].iloc[-1] * prototype['circulating_supply'],
+                'last_updated': self.today.isoformat()
+            })
+            rows.append(row)
+        return rows
+    
+    def binance_klines(self, symbol: str, limit: int, start_time: Optional[int] = None,
+                       end_time: Optional[int] = None, interval: str = '1d') -> List[list]:
+        prototype = self.samples['binance_klines'][0]
+        frame = self.series(symbol, float(prototype[4]))
+        if interval != '1d':
+            return self.intraday_klines(frame, prototype, INTRADAY_MS[interval], limit, start_time, end_time)
+        if start_time is not None:
+            frame = frame[frame.index.as_unit('ms').asi8 >= start_time]
+        frame = frame.head(limit)
+        
+        rows = []
+        for open_time, row in zip(frame.index.as_unit('ms').asi8, frame.itertuples()):
+            kline = list(prototype)
+            kline[0:9] = [
+                int(open_time), f"{row.open:.8f}", f"{row.high:.8f}", f"{row.low:.8f}", f"{row.close:.8f}",
+                f"{row.volume:.8f}", int(open_time) + 86399999, f"{row.volume * row.close:.8f}", int(row.trades)
+            ]
+            rows.append(kline)
+        return rows
+    
+    def intraday_klines(self, daily: pd.DataFrame, prototype: list, step: int, limit: int,
+                        start_time: Optional[int], end_time: Optional[int]) -> List[list]:
+        first, now = int(daily.index[0].timestamp() * 1000), int(pd.Timestamp.now(tz='UTC').timestamp() * 1000)
+        end = min(end_time if end_time is not None else now, now - step)
+        start = max(start_time if start_time is not None else end - step * limit, first)
+        open_times = np.arange(start - start % step + (step if start % step else 0), end + 1, step)[:limit]
+        if not len(open_times):
+            return []
+        
+        close = np.interp(open_times, daily.index.as_unit('ms').asi8, daily['close'].to_numpy())
+        wiggle = 1 + 0.002 * np.sin(open_times / step)
+        volume = np.interp(open_times, daily.index.as_unit('ms').asi8, daily['volume'].to_numpy()) * step / 86400000
+        return [
+            [int(t), f"{c * w:.8f}", f"{c * 1.001:.8f}", f"{c * 0.999:.8f}", f"{c:.8f}", f"{v:.8f}",
+             int(t) + step - 1, f"{v * c:.8f}", 100, f"{v / 2:.8f}", f"{v * c / 2:.8f}", prototype[11]]
+            for t, c, w, v in zip(open_times.tolist(), close.tolist(), wiggle.tolist(), volume.tolist())
+        ]
+    
+    def binance_ticker_24hr(self) -> List[dict]:
+        prototype = self.samples['binance_ticker_24hr'][0]
+        rows = []
+        
+        for symbol in dict.fromkeys(item['binance'] for item in self.crypto_assets):
+            frame = self.series(symbol, float(prototype['lastPrice'])).tail(2)
+            row = dict(prototype)
+            row.update({
+                'symbol': symbol,
+                'openPrice': f"{frame['open'].iloc[-1]:.8f}",
+                'highPrice': f"{frame['high'].iloc[-1]:.8f}",
+                'lowPrice': f"{frame['low'].iloc[-1]:.8f}",
+                'lastPrice': f"{frame['close'].iloc[-1]:.8f}",
+                'prevClosePrice': f"{frame['close'].iloc[0]:.8f}",
+                'volume': f"{frame['volume'].iloc[-1]:.8f}",
+                'count': int(frame['trades'].iloc[-1])
+            })
+            rows.append(row)
+        return rows
+    
+    def awesomeapi_quote(self) -> dict:
+        return self.samples['awesomeapi_usd_brl']
+    
+    def awesomeapi_daily(self, limit: int, start_date: str = None, end_date: str = None) -> List[dict]:
+        prototype = self.samples['awesomeapi_usd_brl']['USDBRL']
+        frame = self.series('USDBRL', float(prototype['bid']))
+        if start_date:
+            frame = frame[frame.index >= pd.Timestamp(start_date, tz='UTC')]
+        if end_date:
+            frame = frame[frame.index < pd.Timestamp(end_date, tz='UTC') + pd.Timedelta(days=1)]
+        frame = frame.iloc[::-1].head(limit)
+        
+        rows = []
+        for timestamp, row in zip(frame.index.as_unit('s').asi8, frame.itertuples()):
+            rows.append({
+                'high': f"{row.high:.4f}",
+                'low': f"{row.low:.4f}",
+                'varBid': f"{row.close - row.open:.4f}",
+                'pctChange': f"{(row.close / row.open - 1) * 100:.2f}",
+                'bid': f"{row.close:.4f}",
+                'ask': f"{row.close * 1.0002:.4f}",
+                'timestamp': str(int(timestamp) + 72000)
+            })
+        if rows:
+            rows[0] = {key: prototype[key] for key in ('code', 'codein', 'name')} | rows[0]
+        return rows
+    
+    def fallback_currency(self) -> dict:
+        return self.samples['fallback_currency_usd']
+    
+    def google_news(self, query: str) -> bytes:
+        root = copy.deepcopy(self.samples['google_news_rss'])
+        channel = root.find('channel')
+        prototype = channel.find('item')
+        channel.remove(prototype)
+        now = pd.Timestamp.now(tz='UTC')
+        
+        for i in range(self.news_per_term):
+            item = copy.deepcopy(prototype)
+            slug = f"{zlib.crc32(query.encode()):08x}-{i}"
+            item.find('title').text = f"{query} - manchete {i} - Fonte {i % 7}"
+            item.find('link').text = f"https://news.google.com/rss/articles/{slug}?oc=5"
+            item.find('guid').text = slug
+            item.find('pubDate').text = format_datetime((now - pd.Timedelta(minutes=37 * i)).to_pydatetime())
+            item.find('source').text = f"Fonte {i % 7}"
+            channel.append(item)
+            
+        return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+    
+    def yahoo_chart(self, ticker: str, period: str = None, start: str = None) -> dict:
+        sample = copy.deepcopy(self.samples['yahoo_chart'])
+        result = sample['chart']['result'][0]
+        frame = self.series(ticker, result['meta']['regularMarketPrice'])
+        
+        frame = frame[frame.index >= self._window_start(period, start)]
+        frame = frame[frame.index.dayofweek < 5]
+        
+        result['meta'].update({'symbol': ticker, 'regularMarketPrice': float(frame['close'].iloc[-1])})
+        result['timestamp'] = (frame.index + pd.Timedelta(hours=13, minutes=30)).as_unit('s').asi8.tolist()
+        result['indicators']['quote'] = [{
+            'open': frame['open'].tolist(),
+            'high': frame['high'].tolist(),
+            'low': frame['low'].tolist(),
+            'close': frame['close'].tolist(),
+            'volume': frame['volume'].astype('int64').tolist()
+        }]
+        return sample
+    
+    def _window_start(self, period: str, start: str) -> pd.Timestamp:
+        if start:
+            return pd.Timestamp(start, tz='UTC')
+        
+        units: Tuple[Tuple[str, int], ...] = (('mo', 30), ('y', 365), ('d', 1))
+        for suffix, days in units:
+            if period and period.endswith(suffix):
+                return self.today - pd.Timedelta(days=int(period[:-len(suffix)]) * days)
+        return self.today - pd.Timedelta(days=self.days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage benchmark payload fixtures")
+    parser.add_argument('--record', action='store_true',
+                        help="Refresh the sample payloads from the live upstream APIs")
+    args = parser.parse_args()
+    
+    if args.record:
+        record_fixtures()
+    else:
+        fixtures = FixtureSet()
+        print(f"{len(fixtures.samples)} samples in {FIXTURES_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List
+import numpy as np
+import pandas as pd
+from benchmarks.fixtures import FixtureSet
+from benchmarks.stand_in import StandInServer, StandInTradeStream, stand_in_yfinance
+from config import settings
+from config.database import EngineRegistry
+from config.settings import BENCHMARK_CONFIG
+from etl import (
+    BaseETL,
+    BinanceKlinesETL,
+    BrazilianStocksETL,
+    CryptoETL,
+    CurrencyETL,
+    EquityETL,
+    MarketRollupsETL,
+    MercadoGlobalETL,
+    NasdaqStocksETL,
+    NewsETL,
+    TechnicalIndicatorsETL
+)
+from etl.live_ticks import LiveTickStream
+from utils.bulk_writer import BulkWriter
+from utils.change_log import reset_change_log
+from utils.helpers import create_robust_session
+from utils.logger import ETLLogger
+from utils.provider_health import reset_provider_health
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+CASES = [
+    'currency',
+    'crypto_full',
+    'crypto_incremental',
+    'binance_klines',
+    'news',
+    'brazilian_stocks',
+    'nasdaq_stocks',
+    'mercado_global',
+    'rollups',
+    'indicators',
+    'live_ticks',
+    'bulk_write',
+    'bulk_upsert',
+    'bulk_swap',
+    'startup',
+    'crypto_degraded'
+]
+
+STAGES = ['extract', 'transform', 'load']
+
+GATED_METRICS = {'peak_alloc_mb': BENCHMARK_CONFIG['min_delta_mb']}
+
+TIMING_METRICS = {'seconds': BENCHMARK_CONFIG['min_delta_seconds']}
+
+STARTUP_SCRIPT = """
+import sys
+sys.argv = ['orchestrator.py', {etl_name!r}]
+import orchestrator
+from etl import load_etl
+args = orchestrator.parse_args()
+load_etl(args.etl_names[0])
+print(len(sys.modules))
+"""
+
+
+@contextmanager
+def _override(mapping: dict, values: dict):
+    saved = {key: mapping[key] for key in values}
+    mapping.update(values)
+    try:
+        yield
+    finally:
+        mapping.update(saved)
+
+
+@contextmanager
+def _replace_items(items: list, replacement: list):
+    saved = list(items)
+    items[:] = replacement
+    try:
+        yield
+    finally:
+        items[:] = saved
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class BenchmarkRunner:
+    
+    def __init__(self, scale: int = 1, years: int = 1, db_url: str = None, verbose: bool = False):
+        self.scale = scale
+        self.years = years
+        self.db_url = db_url
+        self.verbose = verbose
+        self.fixtures = FixtureSet(scale=scale, years=years)
+        self.logger = ETLLogger("Benchmark")
+        self.results: Dict[str, dict] = {}
+        self.base_url: str = None
+        self.workdir: str = None
+        
+    @property
+    def profile(self) -> str:
+        return f"scale{self.scale}_years{self.years}"
+    
+    def run(self, cases: List[str] = None) -> Dict[str, dict]:
+        workdir = tempfile.mkdtemp(prefix='etl-bench-')
+        os.environ['DB_URL'] = self.db_url or f"sqlite:///{Path(workdir) / 'benchmark.db'}"
+        self.logger.info(f"Running benchmarks ({self.profile}) against {redact_url(os.environ['DB_URL'])}")
+        
+        tracemalloc.start()
+        try:
+            with ExitStack() as stack:
+                server = stack.enter_context(StandInServer(scale=self.scale, years=self.years))
+                stack.enter_context(stand_in_yfinance(server.base_url))
+                self._patch_settings(stack, server, workdir)
+                
+                for case in cases or CASES:
+                    self.results[case] = getattr(self, f"_case_{case}")()
+                    self.logger.info(self._format_result(case, self.results[case]))
+        finally:
+            tracemalloc.stop()
+            EngineRegistry.shared().dispose()
+            
+        return self.results
+    
+    def _patch_settings(self, stack: ExitStack, server: StandInServer, workdir: str):
+        self.base_url = server.base_url
+        self.workdir = workdir
+        stack.enter_context(_override(settings.API_CONFIGS, server.api_configs()))
+        stack.enter_context(_override(settings.CACHE_CONFIG, {'enabled': False}))
+        stack.enter_context(_override(settings.LAKE_CONFIG, {'directory': str(Path(workdir) / 'lake')}))
+        stack.enter_context(_override(settings.HEALTH_CONFIG, {'path': str(Path(workdir) / 'provider_health.json')}))
+        stack.enter_context(_override(settings.CHANGE_LOG_CONFIG, {'path': str(Path(workdir) / 'change_log.sqlite')}))
+        stack.enter_context(_override(settings.NEWS_CONFIG, {'seen_index': str(Path(workdir) / 'news_seen.sqlite')}))
+        stack.callback(reset_change_log)
+        reset_change_log()
+        stack.enter_context(_override(settings.LOAD_CONFIG, {
+            'full_history_days': self.fixtures.days,
+            'full_history_period': f"{self.years}y"
+        }))
+        stack.enter_context(_override(settings.KLINES_CONFIG, {
+            'history_days': BENCHMARK_CONFIG['klines_history_days']
+        }))
+        for provider in settings.RATE_LIMITS:
+            stack.enter_context(_override(settings.RATE_LIMITS[provider], {'rate': 10000, 'capacity': 10000}))
+            
+        stack.enter_context(_replace_items(settings.CRYPTO_ASSETS, self.fixtures.crypto_assets))
+        stack.enter_context(_replace_items(settings.BRAZILIAN_STOCKS, self.fixtures.brazilian_stocks))
+        stack.enter_context(_replace_items(settings.NASDAQ_STOCKS, self.fixtures.nasdaq_stocks))
+        stack.enter_context(_replace_items(settings.NEWS_SEARCH_TERMS, self.fixtures.news_terms))
+        
+    def _case_currency(self) -> dict:
+        return self._run_etl(CurrencyETL())
+    
+    def _case_crypto_full(self) -> dict:
+        return self._run_etl(CryptoETL(full_refresh=True))
+    
+    def _case_crypto_incremental(self) -> dict:
+        return self._run_etl(CryptoETL())
+    
+    def _case_binance_klines(self) -> dict:
+        return self._run_etl(BinanceKlinesETL(full_refresh=True))
+    
+    def _case_news(self) -> dict:
+        return self._run_etl(NewsETL())
+    
+    def _case_brazilian_stocks(self) -> dict:
+        return self._run_etl(BrazilianStocksETL(full_refresh=True))
+    
+    def _case_nasdaq_stocks(self) -> dict:
+        return self._run_etl(NasdaqStocksETL(full_refresh=True))
+    
+    def _case_mercado_global(self) -> dict:
+        return self._run_etl(MercadoGlobalETL(full_refresh=True))
+    
+    def _case_rollups(self) -> dict:
+        return self._run_etl(MarketRollupsETL(full_refresh=True))
+    
+    def _case_indicators(self) -> dict:
+        return self._run_etl(TechnicalIndicatorsETL(full_refresh=True))
+    
+    def _case_live_ticks(self) -> dict:
+        with StandInTradeStream(BENCHMARK_CONFIG['live_trades_per_symbol'], scale=self.scale,
+                                years=self.years) as trade_stream:
+            stream = LiveTickStream(stream_url=trade_stream.url)
+            if not self.verbose:
+                stream.logger.logger.setLevel(logging.WARNING)
+            stages = {'load': self._measure(stream.run_once)}
+        return self._summarize(stages, stream.ticks)
+    
+    def _case_bulk_write(self) -> dict:
+        frame = self._bulk_frame(BENCHMARK_CONFIG['bulk_rows'] * self.scale)
+        writer = BulkWriter(EngineRegistry.shared().get_engine(), self.logger)
+        stages = {'load': self._measure(lambda: writer.write(frame, 'bench_bulk', if_exists='replace'))}
+        return self._summarize(stages, len(frame))
+    
+    def _case_bulk_upsert(self) -> dict:
+        rows = BENCHMARK_CONFIG['bulk_rows'] * self.scale
+        writer = BulkWriter(EngineRegistry.shared().get_engine(), self.logger)
+        writer.write(self._bulk_frame(rows), 'bench_bulk', if_exists='replace')
+        
+        frame = self._bulk_frame(rows, offset=rows // 2)
+        stages = {'load': self._measure(lambda: writer.upsert(frame, 'bench_bulk', ['Date', 'Moeda']))}
+        return self._summarize(stages, len(frame))
+    
+    def _case_bulk_swap(self) -> dict:
+        rows = BENCHMARK_CONFIG['bulk_rows'] * self.scale
+        writer = BulkWriter(EngineRegistry.shared().get_engine(), self.logger)
+        writer.replace(self._bulk_frame(rows), 'bench_swap', ['Moeda', 'Date'])
+        
+        frame = self._bulk_frame(rows, offset=rows // 2)
+        stages = {'load': self._measure(lambda: writer.replace(frame, 'bench_swap', ['Moeda', 'Date']))}
+        return self._summarize(stages, len(frame))
+    
+    def _case_startup(self) -> dict:
+        script = STARTUP_SCRIPT.format(etl_name=BENCHMARK_CONFIG['startup_etl'])
+        root = Path(__file__).parent.parent
+        timings, cpu_timings, modules = [], [], 0
+        
+        for _ in range(BENCHMARK_CONFIG['startup_runs']):
+            cpu_start = self._children_cpu()
+            wall_start = time.perf_counter()
+            completed = subprocess.run([sys.executable, '-c', script], cwd=root, capture_output=True,
+                                       text=True, check=True)
+            timings.append(time.perf_counter() - wall_start)
+            cpu_timings.append(self._children_cpu() - cpu_start)
+            modules = int(completed.stdout.split()[-1])
+            
+        stages = {'load': {
+            'seconds': round(statistics.median(timings), 4),
+            'cpu_seconds': round(statistics.median(cpu_timings), 4),
+            'peak_alloc_mb': 0.0
+        }}
+        return self._summarize(stages, modules)
+    
+    def _case_crypto_degraded(self) -> dict:
+        hedge_after = {'coingecko': BENCHMARK_CONFIG['degraded_hedge_after']}
+        with ExitStack() as stack:
+            stack.enter_context(_override(settings.API_CONFIGS, {
+                'coingecko_base_url': f"{self.base_url}/degraded/coingecko"
+            }))
+            stack.enter_context(_override(settings.HEALTH_CONFIG, {'hedge_after': hedge_after}))
+            stack.enter_context(_override(settings.RETRY_CONFIG, {
+                'max_retries': BENCHMARK_CONFIG['degraded_retries'],
+                'backoff_factor': 0
+            }))
+            stack.callback(reset_provider_health)
+            reset_provider_health(Path(self.workdir) / 'degraded_health.json')
+            etl = CryptoETL(full_refresh=True)
+            etl.session = create_robust_session(retry_rate_limited=False)
+            return self._run_etl(etl)
+    
+    def _children_cpu(self) -> float:
+        if resource is None:
+            return 0.0
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return usage.ru_utime + usage.ru_stime
+    
+    def _bulk_frame(self, rows: int, offset: int = 0) -> pd.DataFrame:
+        assets = max(1, len(self.fixtures.crypto_assets))
+        positions = np.arange(offset, offset + rows)
+        rng = np.random.default_rng(offset)
+        prices = rng.uniform(1, 1000, rows)
+        
+        return pd.DataFrame({
+            'Date': pd.Timestamp('2000-01-01') + pd.to_timedelta(positions // assets, unit='D'),
+            'Moeda': [f"ASSET{i}" for i in positions % assets],
+            'Open Price': prices,
+            'High Price': prices * 1.01,
+            'Low Price': prices * 0.99,
+            'Close Price': prices,
+            'Volume': rng.uniform(1e5, 1e7, rows),
+            'Number of Trades': rng.integers(0, 10000, rows),
+            'Market_Cap': prices * 1e6
+        })
+        
+    def _run_etl(self, etl: BaseETL) -> dict:
+        if not self.verbose:
+            etl.logger.logger.setLevel(logging.WARNING)
+            
+        stages = {}
+        for stage in STAGES:
+            setattr(etl, stage, self._timed(stages, stage, getattr(etl, stage)))
+        etl.execute()
+        
+        if isinstance(etl, (EquityETL, BinanceKlinesETL, MarketRollupsETL)):
+            rows = etl.rows_loaded
+        else:
+            rows = len(etl.df) if etl.df is not None else 0
+        return self._summarize(stages, rows)
+    
+    def _timed(self, stages: Dict[str, dict], stage: str, func: Callable) -> Callable:
+        def wrapper():
+            stages[stage] = self._measure(func)
+        return wrapper
+    
+    def _measure(self, func: Callable) -> Dict[str, float]:
+        tracemalloc.reset_peak()
+        allocated_before = tracemalloc.get_traced_memory()[0]
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        
+        func()
+        
+        seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+        peak = tracemalloc.get_traced_memory()[1] - allocated_before
+        return {
+            'seconds': round(seconds, 4),
+            'cpu_seconds': round(cpu_seconds, 4),
+            'peak_alloc_mb': round(max(peak, 0) / (1024 * 1024), 2)
+        }
+        
+    def _summarize(self, stages: Dict[str, dict], rows: int) -> dict:
+        total = sum(stage['seconds'] for stage in stages.values())
+        return {
+            'rows': rows,
+            'total_seconds': round(total, 4),
+            'rows_per_second': round(rows / total, 1) if total > 0 else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': stages
+        }
+        
+    def _format_result(self, case: str, result: dict) -> str:
+        stages = ', '.join(
+            f"{stage} {metrics['seconds']:.3f}s/{metrics['peak_alloc_mb']:.1f}MB"
+            for stage, metrics in result['stages'].items()
+        )
+        return (f"{case:<20} {result['rows']:>9} rows {result['total_seconds']:>8.3f}s "
+                f"{result['rows_per_second'] or 0:>12,.0f} rows/s  rss {result['peak_rss_mb']}MB  [{stages}]")
+
+
+def redact_url(db_url: str) -> str:
+    scheme, _, rest = db_url.partition('://')
+    return f"{scheme}://{rest.rsplit('@', 1)[-1]}"
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def compare_rows(results: Dict[str, dict], baseline: Dict[str, dict]) -> Dict[str, str]:
+    return {case: f"{case}.rows: {result['rows']} vs baseline {baseline[case]['rows']}"
+            for case, result in results.items() if case in baseline and result['rows'] != baseline[case]['rows']}
+
+
+def compare_to_baseline(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float,
+                        metrics: Dict[str, float] = GATED_METRICS) -> List[str]:
+    regressions = []
+    
+    for case, result in results.items():
+        reference = baseline.get(case)
+        if reference is None:
+            continue
+        
+        for stage, values in result['stages'].items():
+            reference_stage = reference['stages'].get(stage)
+            if reference_stage is None:
+                continue
+            for metric, min_delta in metrics.items():
+                current, expected = values[metric], reference_stage[metric]
+                if current > expected * (1 + tolerance) and current - expected > min_delta:
+                    regressions.append(f"{case}.{stage}.{metric}: {current} vs baseline {expected} "
+                                       f"(+{(current / expected - 1) * 100 if expected else float('inf'):.0f}%)")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline ETL benchmarks against local upstream stand-ins")
+    parser.add_argument('cases', nargs='*', metavar='case',
+                        help=f"Benchmark cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--scale', type=int, default=1,
+                        help="Multiply the number of assets, tickers and news terms")
+    parser.add_argument('--years', type=int, default=1,
+                        help="Years of synthetic history served by the stand-ins")
+    parser.add_argument('--db-url', default=None,
+                        help="SQLAlchemy URL of the load target (default: temporary SQLite file)")
+    parser.add_argument('--tolerance', type=float, default=BENCHMARK_CONFIG['tolerance'],
+                        help="Allowed growth relative to the baseline before failing")
+    parser.add_argument('--gate-timings', action='store_true',
+                        help="Also fail on wall-time slowdowns (only meaningful on the machine that "
+                             "recorded the baseline)")
+    parser.add_argument('--baseline', type=Path,
+                        default=Path(__file__).parent.parent / BENCHMARK_CONFIG['baseline_file'])
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store this run as the new baseline for its scale/years profile")
+    parser.add_argument('--output', type=Path, default=None,
+                        help="Write the full results as JSON to this file")
+    parser.add_argument('--verbose', action='store_true', help="Keep ETL INFO logging")
+    args = parser.parse_args()
+    
+    unknown = [case for case in args.cases if case not in CASES]
+    if unknown:
+        parser.error(f"unknown benchmark case(s): {', '.join(unknown)}")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    runner = BenchmarkRunner(scale=args.scale, years=args.years, db_url=args.db_url, verbose=args.verbose)
+    results = runner.run(args.cases or None)
+    
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({runner.profile: results}, indent=2))
+        
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        baseline[runner.profile] = {**baseline.get(runner.profile, {}), **results}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        runner.logger.success(f"Baseline for {runner.profile} written to {args.baseline}")
+        return 0
+    
+    if runner.profile not in baseline:
+        runner.logger.warning(f"No baseline for {runner.profile}; run with --update-baseline to record one")
+        return 0
+    
+    profile = baseline[runner.profile]
+    regressions = compare_to_baseline(results, profile, args.tolerance)
+    for case, change in compare_rows(results, profile).items():
+        if case in BENCHMARK_CONFIG['ungated_rows']:
+            runner.logger.warning(f"CHANGED {change} (informational, depends on installed package versions)")
+        else:
+            regressions.append(change)
+    for slowdown in compare_to_baseline(results, profile, args.tolerance, TIMING_METRICS):
+        if args.gate_timings:
+            regressions.append(slowdown)
+        else:
+            runner.logger.warning(f"SLOWER {slowdown} (informational, timings depend on the machine)")
+    for regression in regressions:
+        runner.logger.error(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+    
+    runner.logger.success(f"No regressions against baseline ({runner.profile}, tolerance {args.tolerance:.0%})")
+    return 0
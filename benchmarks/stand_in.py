@@ -0,0 +1,226 @@
+import json
+import multiprocessing
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlparse
+import numpy as np
+import pandas as pd
+import requests
+from benchmarks.fixtures import FixtureSet
+from config.settings import BENCHMARK_CONFIG
+
+
+JSON = 'application/json'
+RSS = 'application/rss+xml; charset=utf-8'
+
+
+def route(fixtures: FixtureSet, path: str, params: Dict[str, str]) -> Optional[Tuple[str, object]]:
+    match = re.fullmatch(r'/coingecko/coins/([^/]+)/market_chart', path)
+    if match:
+        return JSON, fixtures.coingecko_market_chart(unquote(match.group(1)), int(params.get('days', 1)))
+    
+    match = re.fullmatch(r'/yahoo/chart/([^/]+)', path)
+    if match:
+        return JSON, fixtures.yahoo_chart(unquote(match.group(1)), params.get('period'), params.get('start'))
+    
+    if path == '/coingecko/coins/markets':
+        return JSON, fixtures.coingecko_markets(params.get('ids', '').split(','))
+    if path == '/binance/klines':
+        start_time = int(params['startTime']) if 'startTime' in params else None
+        end_time = int(params['endTime']) if 'endTime' in params else None
+        return JSON, fixtures.binance_klines(params['symbol'], int(params.get('limit', 500)), start_time,
+                                             end_time, params.get('interval', '1d'))
+    if path == '/binance/ticker/24hr':
+        return JSON, fixtures.binance_ticker_24hr()
+    match = re.fullmatch(r'/currency/json/daily/USD-BRL/(\d+)', path)
+    if match:
+        return JSON, fixtures.awesomeapi_daily(int(match.group(1)), params.get('start_date'), params.get('end_date'))
+    
+    if path == '/currency/last/USD-BRL':
+        return JSON, fixtures.awesomeapi_quote()
+    if path == '/currency/fallback/usd.json':
+        return JSON, fixtures.fallback_currency()
+    if path == '/news/rss/search':
+        return RSS, fixtures.google_news(params.get('q', ''))
+    return None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    
+    protocol_version = 'HTTP/1.1'
+    fixtures: FixtureSet = None
+    lock = threading.Lock()
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        
+        if url.path.startswith('/degraded/'):
+            time.sleep(BENCHMARK_CONFIG['degraded_delay'])
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        with self.lock:
+            routed = route(self.fixtures, url.path, params)
+            
+        if routed is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        content_type, payload = routed
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(fixture_options: dict, port_queue):
+    StandInHandler.fixtures = FixtureSet(**fixture_options)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+class StandInServer:
+    
+    def __init__(self, **fixture_options):
+        self.fixture_options = fixture_options
+        self.process: multiprocessing.Process = None
+        self.base_url: str = None
+        
+    def __enter__(self) -> 'StandInServer':
+        port_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve, args=(self.fixture_options, port_queue), daemon=True)
+        self.process.start()
+        self.base_url = f"http://127.0.0.1:{port_queue.get(timeout=60)}"
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.join()
+        
+    def api_configs(self) -> Dict[str, str]:
+        return {
+            'coingecko_base_url': f"{self.base_url}/coingecko",
+            'binance_base_url': f"{self.base_url}/binance",
+            'awesomeapi_url': f"{self.base_url}/currency/last/USD-BRL",
+            'awesomeapi_daily_url': f"{self.base_url}/currency/json/daily/USD-BRL",
+            'fallback_currency_url': f"{self.base_url}/currency/fallback/usd.json",
+            'google_news_base_url': f"{self.base_url}/news/rss/search"
+        }
+
+
+class StandInTradeStream:
+    
+    def __init__(self, trades_per_symbol: int, spacing_ms: int = 250, **fixture_options):
+        self.trades_per_symbol = trades_per_symbol
+        self.spacing_ms = spacing_ms
+        self.fixtures = FixtureSet(**fixture_options)
+        self.server = None
+        self.thread: threading.Thread = None
+        self.url: str = None
+        
+    def __enter__(self) -> 'StandInTradeStream':
+        from websockets.sync.server import serve
+        
+        self.server = serve(self._handle, '127.0.0.1', 0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"ws://127.0.0.1:{self.server.socket.getsockname()[1]}/stream"
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.thread.join()
+        
+    def _handle(self, websocket):
+        streams = parse_qs(urlparse(websocket.request.path).query).get('streams', [''])[0]
+        symbols = [stream.split('@')[0].upper() for stream in streams.split('/') if stream]
+        for message in self.trade_messages(symbols):
+            websocket.send(message)
+    
+    def trade_messages(self, symbols: List[str]) -> Iterator[str]:
+        reference_price = float(self.fixtures.samples['binance_klines'][0][4])
+        count = self.trades_per_symbol
+        now = int(time.time() * 1000)
+        times = now - (count - np.arange(count)) * self.spacing_ms
+        prices = {}
+        for symbol in symbols:
+            rng = np.random.default_rng(len(prices))
+            last_close = self.fixtures.series(symbol, reference_price)['close'].iloc[-1]
+            prices[symbol] = (last_close * np.exp(np.cumsum(rng.normal(0, 0.0005, count))),
+                              rng.uniform(0.001, 2.0, count))
+        
+        trade_id = 0
+        for i, timestamp in enumerate(times.tolist()):
+            for symbol in symbols:
+                trade_id += 1
+                price, quantity = prices[symbol][0][i], prices[symbol][1][i]
+                yield json.dumps({'stream': f"{symbol.lower()}@trade", 'data': {
+                    'e': 'trade', 'E': timestamp, 's': symbol, 't': trade_id, 'p': f"{price:.8f}",
+                    'q': f"{quantity:.8f}", 'T': timestamp, 'm': bool(trade_id % 2), 'M': True
+                }})
+
+
+class FixtureTicker:
+    
+    base_url: str = None
+    _local = threading.local()
+    
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        
+    def history(self, period: str = None, start: str = None, actions: bool = True, **kwargs) -> pd.DataFrame:
+        params = {'start': start} if start else {'period': period}
+        response = self._session().get(f"{self.base_url}/yahoo/chart/{quote(self.ticker, safe='')}",
+                                       params=params, timeout=30)
+        response.raise_for_status()
+        
+        result = response.json()['chart']['result'][0]
+        quotes = result['indicators']['quote'][0]
+        index = pd.to_datetime(result['timestamp'], unit='s', utc=True)
+        index = index.tz_convert(result['meta']['exchangeTimezoneName']).rename('Date')
+        
+        history = pd.DataFrame({
+            'Open': quotes['open'],
+            'High': quotes['high'],
+            'Low': quotes['low'],
+            'Close': quotes['close'],
+            'Volume': quotes['volume']
+        }, index=index)
+        if actions:
+            history['Dividends'] = 0.0
+            history['Stock Splits'] = 0.0
+        return history
+    
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+
+@contextmanager
+def stand_in_yfinance(base_url: str):
+    import yfinance as yf
+    
+    original = yf.Ticker
+    FixtureTicker.base_url = base_url
+    yf.Ticker = FixtureTicker
+    try:
+        yield
+    finally:
+        yf.Ticker = original
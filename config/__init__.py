@@ -1,2 +1,2 @@
-from .database import DatabaseConfig
+from .database import DatabaseConfig, EngineRegistry
 from .settings import *
@@ -1,13 +1,18 @@
 import os
+import threading
 import urllib.parse
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
 import time
+from typing import Dict
+from config.settings import DATABASE_POOL
 
 
 class DatabaseConfig:
     
     def __init__(self):
+        self.url = os.getenv('DB_URL')
         self.server = os.getenv('DB_SERVER')
         self.database = os.getenv('DB_NAME')
         self.username = os.getenv('DB_USER')
@@ -16,10 +21,15 @@ class DatabaseConfig:
         self._validate_credentials()
         
     def _validate_credentials(self):
+        if self.url:
+            return
         if not all([self.server, self.database, self.username, self.password]):
             raise ValueError("Missing database credentials in environment variables")
     
-    def get_engine(self) -> Engine:
+    def get_engine(self, **engine_kwargs) -> Engine:
+        if self.url:
+            return create_engine(self.url, **engine_kwargs)
+        
         params = urllib.parse.quote_plus(
             f'DRIVER={{ODBC Driver 18 for SQL Server}};'
             f'SERVER={self.server};'
@@ -30,15 +40,120 @@ class DatabaseConfig:
             f'TrustServerCertificate=yes;'
             f'Connection Timeout=180;'
         )
-        return create_engine(f"mssql+pyodbc:///?odbc_connect={params}")
+        return create_engine(f"mssql+pyodbc:///?odbc_connect={params}", fast_executemany=True, **engine_kwargs)
+    
+    def supports_pooling(self) -> bool:
+        if not self.url:
+            return True
+        url = make_url(self.url)
+        return not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'))
     
     def test_connection(self, max_retries: int = 3, wait_seconds: int = 45) -> bool:
+        return EngineRegistry.shared().warm_up(max_retries, wait_seconds)
+
+
+class PoolStats:
+    
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connections_opened = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+        
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+            
+    def record_connect(self):
+        with self._lock:
+            self.connections_opened += 1
+            
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'connections_opened': self.connections_opened,
+                'wait_seconds': round(self.wait_seconds, 4),
+                'max_wait_seconds': round(self.max_wait_seconds, 4)
+            }
+
+
+def _timed_pool_class(stats: PoolStats) -> type:
+    
+    class TimedQueuePool(QueuePool):
+        
+        def connect(self):
+            start = time.perf_counter()
+            connection = super().connect()
+            stats.record_checkout(time.perf_counter() - start)
+            return connection
+        
+    return TimedQueuePool
+
+
+class EngineRegistry:
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, db_config: DatabaseConfig = None):
+        self.db_config = db_config or DatabaseConfig()
+        self.stats = PoolStats()
+        self._engine: Engine = None
+        self._warm = False
+        self._lock = threading.Lock()
+        
+    @classmethod
+    def shared(cls) -> 'EngineRegistry':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+        
+    def get_engine(self) -> Engine:
+        with self._lock:
+            if self._engine is None:
+                self._engine = self._create_engine()
+            return self._engine
+        
+    def _create_engine(self) -> Engine:
+        if not self.db_config.supports_pooling():
+            return self.db_config.get_engine()
+        
+        engine = self.db_config.get_engine(
+            poolclass=_timed_pool_class(self.stats),
+            pool_size=DATABASE_POOL['pool_size'],
+            max_overflow=DATABASE_POOL['max_overflow'],
+            pool_timeout=DATABASE_POOL['pool_timeout'],
+            pool_recycle=DATABASE_POOL['pool_recycle'],
+            pool_pre_ping=DATABASE_POOL['pool_pre_ping']
+        )
+        event.listen(engine, 'connect', lambda *args: self.stats.record_connect())
+        event.listen(engine, 'checkin', lambda *args: self.stats.record_checkin())
+        return engine
+    
+    def warm_up(self, max_retries: int = None, wait_seconds: int = None) -> bool:
+        if self._warm:
+            return True
+        
+        max_retries = max_retries or DATABASE_POOL['warm_up_retries']
+        wait_seconds = wait_seconds if wait_seconds is not None else DATABASE_POOL['warm_up_wait']
         engine = self.get_engine()
         
         for attempt in range(1, max_retries + 1):
             try:
                 with engine.connect() as conn:
                     conn.execute(text("SELECT 1"))
+                self._warm = True
                 return True
             except Exception as e:
                 if attempt < max_retries:
@@ -46,3 +161,16 @@ class DatabaseConfig:
                 else:
                     raise e
         return False
+    
+    def pool_status(self) -> Dict[str, object]:
+        status = self.stats.as_dict()
+        if self._engine is not None:
+            status['pool'] = self._engine.pool.status()
+        return status
+    
+    def dispose(self):
+        with self._lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
+            self._warm = False
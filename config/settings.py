@@ -37,16 +37,63 @@ API_CONFIGS = {
     'coingecko_base_url': 'https://api.coingecko.com/api/v3',
     'binance_base_url': 'https://data-api.binance.vision/api/v3',
     'awesomeapi_url': 'https://economia.awesomeapi.com.br/last/USD-BRL',
+    'awesomeapi_daily_url': 'https://economia.awesomeapi.com.br/json/daily/USD-BRL',
     'fallback_currency_url': 'https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies/usd.json',
-    'google_news_base_url': 'https://news.google.com/rss/search'
+    'google_news_base_url': 'https://news.google.com/rss/search',
+    'binance_stream_url': 'wss://data-stream.binance.vision/stream'
 }
 
 RETRY_CONFIG = {
     'max_retries': 5,
     'backoff_factor': 2,
     'status_forcelist': [429, 500, 502, 503, 504],
-    'timeout': 10,
-    'wait_between_requests': 12
+    'timeout': 10
+}
+
+RATE_LIMITS = {
+    'coingecko': {'rate': 0.5, 'capacity': 5},
+    'binance': {'rate': 10, 'capacity': 20},
+    'news': {'rate': 5, 'capacity': 10}
+}
+
+HEALTH_CONFIG = {
+    'path': 'data/provider_health.json',
+    'window': 50,
+    'min_requests': 5,
+    'min_success_rate': 0.5,
+    'cooldown': 60,
+    'max_cooldown': 900,
+    'max_age': 21600,
+    'save_interval': 30,
+    'hedge_after': {
+        'coingecko': 5.0,
+        'awesomeapi': 3.0
+    }
+}
+
+CRYPTO_CONFIG = {
+    'max_workers': 8,
+    'bulk_mode': True,
+    'markets_page_size': 250
+}
+
+KLINES_CONFIG = {
+    'intervals': ['1h', '1m'],
+    'history_days': {'1h': 730, '1m': 90},
+    'page_limit': 1000,
+    'max_workers': 8,
+    'flush_rows': 100000
+}
+
+LIVE_CONFIG = {
+    'intervals': ['1m', '1h'],
+    'buffer_size': 4096,
+    'flush_interval': 5,
+    'flush_rows': 500,
+    'close_delay': 2,
+    'status_interval': 60,
+    'open_timeout': 10,
+    'reconnect_backoff': [1, 2, 5, 10, 30]
 }
 
 DATABASE_TABLES = {
@@ -54,5 +101,225 @@ DATABASE_TABLES = {
     'brazilian_stocks': 'tb_acoes_br_historico',
     'nasdaq_stocks': 'tb_acoes_nasdaq_historico',
     'currency': 'tb_cotacao_usdt',
-    'news': 'tb_noticias_mercado'
+    'news': 'tb_noticias_mercado',
+    'mercado_global': 'tb_mercado_global',
+    'crypto_klines': 'tb_binance_klines',
+    'crypto_live': 'tb_binance_live',
+    'indicators': 'tb_indicadores_tecnicos',
+    'correlations': 'tb_correlacao_ativos',
+    'latest_snapshot': 'tb_mercado_ultimo',
+    'rollup_weekly': 'tb_mercado_semanal',
+    'rollup_monthly': 'tb_mercado_mensal',
+    'market_summary': 'tb_mercado_resumo'
+}
+
+LOAD_CONFIG = {
+    'full_history_period': '2y',
+    'full_history_days': 365,
+    'overlap_days': 1
+}
+
+BULK_LOAD_CONFIG = {
+    'chunk_size': 5000,
+    'staging_prefix': 'stg_',
+    'max_string_length': 4000,
+    'key_string_length': 256,
+    'shadow_swap': True,
+    'shadow_prefix': 'shd_',
+    'version_separator': '__v',
+    'retain_versions': 2,
+    'swap_lock_timeout_ms': 5000,
+    'swap_retries': 3
+}
+
+SCHEDULER_CONFIG = {
+    'max_workers': 4,
+    'job_timeout': 1800,
+    'cancel_grace': 60,
+    'poll_interval': 1,
+    'default_host_concurrency': 2,
+    'host_concurrency': {
+        'api.coingecko.com': 1
+    }
+}
+
+ETL_UPSTREAM_HOSTS = {
+    'CurrencyETL': 'economia.awesomeapi.com.br',
+    'NewsETL': 'news.google.com',
+    'BrazilianStocksETL': 'query1.finance.yahoo.com',
+    'NasdaqStocksETL': 'query1.finance.yahoo.com',
+    'CryptoETL': 'api.coingecko.com',
+    'BinanceKlinesETL': 'data-api.binance.vision'
+}
+
+ETL_DEPENDENCIES = {
+    'MercadoGlobalETL': ['CurrencyETL', 'CryptoETL', 'BrazilianStocksETL', 'NasdaqStocksETL'],
+    'TechnicalIndicatorsETL': ['CryptoETL', 'BrazilianStocksETL', 'NasdaqStocksETL'],
+    'MarketRollupsETL': ['MercadoGlobalETL']
+}
+
+QUEUE_CONFIG = {
+    'path': 'data/work_queue.sqlite',
+    'journal_mode': 'WAL',
+    'busy_timeout': 30,
+    'default_shard_size': 25,
+    'shard_size': {
+        'CryptoETL': 5,
+        'BrazilianStocksETL': 25,
+        'NasdaqStocksETL': 25
+    },
+    'lease_seconds': 300,
+    'heartbeat_interval': 60,
+    'max_attempts': 3,
+    'retry_delay': 30,
+    'poll_interval': 1,
+    'wait_timeout': 3600,
+    'local_workers': 0,
+    'retention_days': 7
+}
+
+DAEMON_CONFIG = {
+    'run_on_start': True,
+    'max_sleep': 30,
+    'shutdown_timeout': 300
+}
+
+DAEMON_SCHEDULE = {
+    'CurrencyETL': {'interval': 60},
+    'NewsETL': {'interval': 900},
+    'CryptoETL': {'interval': 3600},
+    'BrazilianStocksETL': {'daily_at': '18:30', 'timezone': 'America/Sao_Paulo', 'weekdays': [0, 1, 2, 3, 4]},
+    'NasdaqStocksETL': {'daily_at': '16:30', 'timezone': 'America/New_York', 'weekdays': [0, 1, 2, 3, 4]},
+    'MercadoGlobalETL': {'after': ['CurrencyETL', 'CryptoETL', 'BrazilianStocksETL', 'NasdaqStocksETL'],
+                         'min_interval': 600},
+    'TechnicalIndicatorsETL': {'after': ['CryptoETL', 'BrazilianStocksETL', 'NasdaqStocksETL']},
+    'MarketRollupsETL': {'after': ['MercadoGlobalETL']},
+    'BinanceKlinesETL': {'interval': 900}
+}
+
+NEWS_CONFIG = {
+    'max_workers': 8,
+    'default_depth': 6,
+    'max_age_hours': 24,
+    'seen_index': 'data/news_seen.sqlite',
+    'seen_retention_days': 30,
+    'bloom_capacity': 200000,
+    'bloom_error_rate': 0.001
+}
+
+EQUITY_CONFIG = {
+    'batch_size': 25,
+    'max_workers': 4,
+    'float32_price_limit': 2 ** 17
+}
+
+CURRENCY_CONFIG = {
+    'currency': 'USD',
+    'history_days': 730,
+    'history_page_days': 300
+}
+
+MERCADO_GLOBAL_CONFIG = {
+    'lookback_days': 10
+}
+
+INDICATORS_CONFIG = {
+    'sma': [20, 50, 200],
+    'ema': [12, 26],
+    'volatility': 30,
+    'rsi': 14,
+    'correlation': 90,
+    'correlation_min_periods': 30,
+    'warmup_days': 400,
+    'annualization': {'Cripto': 365, 'Acao_BR': 252, 'Acao_USA': 252}
+}
+
+ROLLUPS_CONFIG = {
+    'periods': {'rollup_weekly': 'W', 'rollup_monthly': 'M'},
+    'all_markets': 'Todos'
+}
+
+CACHE_CONFIG = {
+    'enabled': True,
+    'directory': '.cache/http',
+    'max_size_mb': 256,
+    'ttl': {
+        'coingecko': 300,
+        'binance': 300,
+        'currency': 60,
+        'news': 600
+    }
+}
+
+DATABASE_POOL = {
+    'pool_size': 5,
+    'max_overflow': 5,
+    'pool_timeout': 60,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+    'warm_up_retries': 3,
+    'warm_up_wait': 45
+}
+
+LAKE_CONFIG = {
+    'enabled': True,
+    'directory': 'data/lake',
+    'sources': {
+        'crypto': 'Moeda',
+        'brazilian_stocks': 'Ticker',
+        'nasdaq_stocks': 'Ticker',
+        'news': 'Ativo',
+        'currency': None
+    }
+}
+
+BENCHMARK_CONFIG = {
+    'baseline_file': 'benchmarks/baseline.json',
+    'tolerance': 0.25,
+    'min_delta_seconds': 0.05,
+    'min_delta_mb': 2.0,
+    'ungated_rows': ['startup'],
+    'news_per_term': 20,
+    'klines_history_days': {'1h': 90, '1m': 3},
+    'live_trades_per_symbol': 5000,
+    'bulk_rows': 50000,
+    'startup_etl': 'CurrencyETL',
+    'startup_runs': 5,
+    'degraded_delay': 1.0,
+    'degraded_hedge_after': 0.25,
+    'degraded_retries': 1
+}
+
+CHECKPOINT_CONFIG = {
+    'enabled': True,
+    'path': 'data/checkpoints.sqlite',
+    'journal_mode': 'WAL',
+    'busy_timeout': 30,
+    'retention_days': 7
+}
+
+CHANGE_LOG_CONFIG = {
+    'enabled': True,
+    'path': 'data/change_log.sqlite',
+    'journal_mode': 'WAL',
+    'busy_timeout': 30,
+    'retention_days': 7
+}
+
+LOGGING_CONFIG = {
+    'level': 'INFO',
+    'directory': 'logs',
+    'file': 'etl.jsonl',
+    'rotate_when': 'midnight',
+    'backup_count': 14,
+    'compress': True,
+    'item_level': 'INFO',
+    'item_every': 1
+}
+
+METRICS_CONFIG = {
+    'enabled': True,
+    'directory': 'reports',
+    'prometheus_file': 'etl_metrics.prom',
+    'latency_buckets': [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
 }
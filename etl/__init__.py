@@ -1,6 +1,39 @@
-from .base_etl import BaseETL
-from .currency import CurrencyETL
-from .crypto import CryptoETL
-from .brazilian_stocks import BrazilianStocksETL
-from .nasdaq_stocks import NasdaqStocksETL
-from .news import NewsETL
+import importlib
+
+
+ETL_REGISTRY = {
+    'BaseETL': 'base_etl',
+    'CurrencyETL': 'currency',
+    'CryptoETL': 'crypto',
+    'BinanceKlinesETL': 'binance_klines',
+    'EquityETL': 'equities',
+    'BrazilianStocksETL': 'brazilian_stocks',
+    'NasdaqStocksETL': 'nasdaq_stocks',
+    'NewsETL': 'news',
+    'MercadoGlobalETL': 'mercado_global',
+    'TechnicalIndicatorsETL': 'indicators',
+    'MarketRollupsETL': 'rollups',
+    'LiveTickStream': 'live_ticks',
+    'ShardWorker': 'shard_worker'
+}
+
+__all__ = list(ETL_REGISTRY)
+
+
+def load_etl(name: str):
+    if name not in ETL_REGISTRY:
+        raise KeyError(f"Unknown ETL '{name}'")
+    module = importlib.import_module(f".{ETL_REGISTRY[name]}", __name__)
+    return getattr(module, name)
+
+
+def __getattr__(name: str):
+    if name not in ETL_REGISTRY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = load_etl(name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,44 +1,209 @@
+import time
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import pandas as pd
+from sqlalchemy import inspect, text
 from sqlalchemy.engine import Engine
-from config.database import DatabaseConfig
+from config.database import EngineRegistry
+from config.settings import CHANGE_LOG_CONFIG, CHECKPOINT_CONFIG, LAKE_CONFIG, LOAD_CONFIG, QUEUE_CONFIG
+from utils.bulk_writer import BulkWriter
+from utils.change_log import get_change_log
+from utils.data_lake import DataLake
 from utils.logger import ETLLogger
+from utils.metrics import get_run_metrics
+from utils.scheduler import JobCancelled, current_cancel_event
 
 
 class BaseETL(ABC):
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, full_refresh: bool = False, replay_date: str = None, assets: list = None,
+                 run_id: str = None, resume: bool = False):
         self.name = name
         self.logger = ETLLogger(name)
-        self.db_config = DatabaseConfig()
         self.engine: Engine = None
+        self.writer: BulkWriter = None
         self.df: pd.DataFrame = None
+        self.full_refresh = full_refresh
+        self.watermarks: Dict[str, pd.Timestamp] = {}
+        self.replay_date = replay_date
+        self.assets = assets
+        started = pd.Timestamp.now()
+        self.ingest_date = started.strftime('%Y-%m-%d')
+        self.ingest_run = started.strftime('%H%M%S%f')
+        self.lake = DataLake() if LAKE_CONFIG['enabled'] else None
+        self.row_counts: Dict[str, Optional[int]] = {}
+        self.phase_times: Dict[str, Tuple[float, float]] = {}
+        self.run_id = run_id
+        self.resume = resume
+        self.checkpoints = None
+        self.unit_stages: Dict[str, str] = {}
+        self.cancel_event = current_cancel_event()
         
     def execute(self):
+        start = time.perf_counter()
         try:
             self.logger.info(f"Starting {self.name} ETL process")
             
             self._setup()
-            self.extract()
-            self.transform()
-            self.load()
+            self._begin_checkpoints()
+            self._run_phase('extract', self.extract)
+            self._run_phase('transform', self.transform)
+            self._run_phase('load', self.load)
             
+            if self.checkpoints is not None:
+                self.checkpoints.finish(self.run_id, self.name, 'done')
             self.logger.success(f"{self.name} ETL completed successfully")
             
         except Exception as e:
+            if self.checkpoints is not None:
+                self.checkpoints.finish(self.run_id, self.name, 'failed', str(e))
             self.logger.error(f"{self.name} ETL failed: {str(e)}", exc_info=True)
             raise
         finally:
             self._cleanup()
+            self._report_metrics(time.perf_counter() - start)
+    
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"{self.name} cancelled")
+    
+    def checkpoint(self, unit: str, stage: str, frame: pd.DataFrame = None):
+        if self.checkpoints is not None:
+            self.checkpoints.save(self.run_id, self.name, unit, stage, frame)
+    
+    def resumed_units(self, *stages: str) -> List[str]:
+        return [unit for unit, stage in self.unit_stages.items() if stage in stages]
+    
+    def checkpoint_many(self, units: List[str], stage: str):
+        if self.checkpoints is not None and units:
+            self.checkpoints.mark(self.run_id, self.name, units, stage)
+    
+    def restore_unit(self, unit: str) -> pd.DataFrame:
+        return self.checkpoints.frame(self.run_id, self.name, unit)
+    
+    def _begin_checkpoints(self):
+        if not self.run_id or not CHECKPOINT_CONFIG['enabled'] or self.replay_date:
+            return
+        from utils.checkpoints import get_checkpoint_store
+        self.checkpoints = get_checkpoint_store()
+        self.unit_stages = self.checkpoints.begin(self.run_id, self.name, resume=self.resume)
+        if self.unit_stages:
+            self.logger.info(f"Resuming run {self.run_id} with {len(self.unit_stages)} checkpointed units")
+    
+    def execute_sharded(self, queue, run_id: str):
+        start = time.perf_counter()
+        try:
+            self.logger.info(f"Starting {self.name} ETL process on the shard queue (run {run_id})")
+            
+            self._setup()
+            self._run_phase('extract', lambda: self._run_shards(queue, run_id))
+            self._run_phase('transform', lambda: self.merge_shards(queue.results(run_id, self.name)))
+            self._run_phase('load', self.load)
+            
+            self.logger.success(f"{self.name} ETL completed successfully")
+            
+        except Exception as e:
+            self.logger.error(f"{self.name} ETL failed: {str(e)}", exc_info=True)
+            raise
+        finally:
+            self._cleanup()
+            self._report_metrics(time.perf_counter() - start)
+    
+    def run_shard(self) -> pd.DataFrame:
+        start = time.perf_counter()
+        try:
+            self._setup()
+            self._run_phase('extract', self.extract)
+            self._run_phase('transform', self.transform)
+            return self.shard_result()
+        finally:
+            self._cleanup()
+            self._report_metrics(time.perf_counter() - start)
+    
+    def shard_items(self) -> Optional[list]:
+        return None
+    
+    def prepare_shards(self) -> list:
+        return self.shard_items()
+    
+    def shard_options(self) -> dict:
+        return {'full_refresh': self.full_refresh}
+    
+    def shard_result(self) -> pd.DataFrame:
+        return self.df
+    
+    def merge_shards(self, frames: Iterable[pd.DataFrame]):
+        frames = list(frames)
+        self.df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        
+    def _run_shards(self, queue, run_id: str):
+        items = self.prepare_shards()
+        size = QUEUE_CONFIG['shard_size'].get(self.name, QUEUE_CONFIG['default_shard_size'])
+        shards = [items[i:i + size] for i in range(0, len(items), size)]
+        remaining = queue.publish(run_id, self.name, shards, self.shard_options())
+        self.logger.info(f"Published {len(shards)} shards of up to {size} assets, {remaining} waiting for workers")
+        
+        deadline = time.monotonic() + QUEUE_CONFIG['wait_timeout']
+        last_done = None
+        while True:
+            counts = queue.counts(run_id, self.name)
+            if counts['done'] != last_done:
+                last_done = counts['done']
+                self.logger.info(f"Shards: {counts['done']}/{len(shards)} done, {counts['leased']} running, "
+                                 f"{counts['pending']} pending, {counts['failed']} failed")
+            if not counts['pending'] and not counts['leased']:
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{counts['pending'] + counts['leased']} shards still unfinished after "
+                                   f"{QUEUE_CONFIG['wait_timeout']}s; are any workers running?")
+            time.sleep(QUEUE_CONFIG['poll_interval'])
+            
+        self.row_counts['extract'] = self.row_counts.get('extract', 0) + counts['rows']
+        failures = queue.failures(run_id, self.name)
+        if failures:
+            details = '; '.join(f"shard {shard}: {error}" for shard, error in failures.items())
+            raise RuntimeError(f"{len(failures)} of {len(shards)} shards failed ({details}). "
+                               f"Re-run with --run-id {run_id} to retry only those shards")
+    
+    def _run_phase(self, phase: str, func: Callable):
+        self.check_cancelled()
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        self.logger.phase = phase
+        try:
+            func()
+        finally:
+            self.phase_times[phase] = (time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+            self.logger.phase = None
+            
+        if phase not in self.row_counts and phase != 'extract' and self.df is not None:
+            self.row_counts[phase] = len(self.df)
+    
+    def _report_metrics(self, seconds: float):
+        metrics = get_run_metrics()
+        rows_in = None
+        for phase, (wall_seconds, cpu_seconds) in self.phase_times.items():
+            rows_out = self.row_counts.get(phase)
+            metrics.record_phase(self.name, phase, wall_seconds, cpu_seconds, rows_in, rows_out)
+            rows_in = rows_out
+            
+        metrics.record_etl(self.name, seconds=seconds)
+        self.logger.info(f"{self.name} phases: " + ', '.join(
+            f"{phase} {wall:.2f}s ({self.row_counts.get(phase, '-')} rows)"
+            for phase, (wall, _) in self.phase_times.items()
+        ), duration_seconds=round(seconds, 4), phases={
+            phase: {'seconds': round(wall, 4), 'cpu_seconds': round(cpu, 4), 'rows': self.row_counts.get(phase)}
+            for phase, (wall, cpu) in self.phase_times.items()
+        })
     
     def _setup(self):
         self.logger.info("Setting up database connection")
-        self.engine = self.db_config.get_engine()
+        self.engine = EngineRegistry.shared().get_engine()
+        self.writer = BulkWriter(self.engine, self.logger)
         
     def _cleanup(self):
         if self.engine:
-            self.engine.dispose()
-            self.logger.info("Database connection closed")
+            self.engine = None
+            self.logger.info("Database connection released to shared pool")
     
     @abstractmethod
     def extract(self):
@@ -52,11 +217,92 @@ class BaseETL(ABC):
     def load(self):
         pass
     
-    def save_to_database(self, table_name: str, if_exists: str = 'replace'):
+    def archive(self, source: str, df: pd.DataFrame):
+        if self.lake is None or self.replay_date:
+            return
+        self.lake.write(source, df, self.ingest_date, self.ingest_run)
+        self.logger.info(f"Archived {len(df)} raw rows to lake source '{source}'")
+        
+    def read_archive(self, source: str, columns: List[str] = None,
+                     filters: Dict[str, Iterable] = None) -> pd.DataFrame:
+        if self.lake is None:
+            raise ValueError("Replay requested but the data lake is disabled")
+        
+        ingest_date, _, ingest_run = self.replay_date.partition('/')
+        if ingest_date == 'latest':
+            ingest_date = self.lake.latest_ingest_date(source)
+        if ingest_date is None:
+            raise ValueError(f"No archived data found for lake source '{source}'")
+        
+        df = self.lake.read(source, ingest_date=ingest_date, columns=columns, filters=filters,
+                            ingest_run=ingest_run or None)
+        run = f"run {ingest_run}" if ingest_run else "latest run per partition"
+        self.logger.info(f"Replaying {len(df)} rows from lake source '{source}' ({ingest_date}, {run})")
+        return df
+    
+    def table_exists(self, table_name: str) -> bool:
+        return inspect(self.engine).has_table(table_name)
+    
+    def load_watermarks(self, table_name: str, key_column: str) -> Dict[str, pd.Timestamp]:
+        self.watermarks = {}
+        
+        if self.full_refresh:
+            self.logger.info("Full refresh requested, ignoring stored watermarks")
+            return self.watermarks
+        
+        if not self.table_exists(table_name):
+            self.logger.info(f"Table {table_name} not found, running full backfill")
+            return self.watermarks
+        
+        self.watermarks = self.read_max_dates(table_name, key_column)
+        self.logger.info(f"Loaded watermarks for {len(self.watermarks)} keys from {table_name}")
+        return self.watermarks
+    
+    def read_max_dates(self, table_name: str, key_column: str,
+                       date_column: str = 'Date') -> Dict[str, pd.Timestamp]:
+        max_dates = {}
+        query = text(f"SELECT [{key_column}], MAX([{date_column}]) FROM {table_name} GROUP BY [{key_column}]")
+        with self.engine.connect() as conn:
+            for key, max_date in conn.execute(query):
+                if max_date is not None:
+                    max_dates[key] = pd.Timestamp(max_date)
+        return max_dates
+    
+    def get_start_date(self, key: str) -> Optional[pd.Timestamp]:
+        watermark = self.watermarks.get(key)
+        if watermark is None:
+            return None
+        return (watermark - pd.Timedelta(days=LOAD_CONFIG['overlap_days'])).normalize()
+    
+    def save_to_database(self, table_name: str, if_exists: str = 'replace', index_columns: List[str] = None):
         if self.df is None or self.df.empty:
             self.logger.warning("No data to save")
             return
             
         self.logger.info(f"Saving {len(self.df)} rows to {table_name}")
-        self.df.to_sql(table_name, con=self.engine, if_exists=if_exists, index=False)
+        if if_exists == 'replace':
+            self.writer.replace(self.df, table_name, index_columns)
+        else:
+            self.writer.write(self.df, table_name, if_exists=if_exists)
         self.logger.success(f"Data saved to {table_name}")
+
+    def upsert_to_database(self, table_name: str, key_column: str):
+        if self.df is None or self.df.empty:
+            self.logger.warning("No data to save")
+            return
+        
+        if self.full_refresh or not self.table_exists(table_name):
+            self.save_to_database(table_name, if_exists='replace', index_columns=[key_column, 'Date'])
+        else:
+            self.logger.info(f"Upserting {len(self.df)} rows into {table_name}")
+            self.writer.upsert(self.df, table_name, ['Date', key_column])
+            self.logger.success(f"Data upserted to {table_name}")
+        self.record_changes(table_name, key_column)
+        
+    def record_changes(self, table_name: str, key_column: str, frame: pd.DataFrame = None):
+        frame = self.df if frame is None else frame
+        if not CHANGE_LOG_CONFIG['enabled'] or frame is None or frame.empty:
+            return
+        since = pd.to_datetime(frame['Date']).groupby(frame[key_column], observed=True).min()
+        get_change_log().record(table_name, since.to_dict())
+        
\ No newline at end of file
@@ -0,0 +1,196 @@
+import time
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+from .base_etl import BaseETL
+from config.settings import API_CONFIGS, CRYPTO_ASSETS, DATABASE_TABLES, KLINES_CONFIG
+from utils.helpers import get_session, safe_api_call
+from utils.rate_limiter import get_rate_limiter
+
+
+INTERVAL_MS = {
+    '1m': 60_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '1h': 3_600_000,
+    '4h': 14_400_000,
+    '1d': 86_400_000
+}
+
+FLOAT_COLUMNS = {
+    1: 'Open Price',
+    2: 'High Price',
+    3: 'Low Price',
+    4: 'Close Price',
+    5: 'Volume',
+    7: 'Quote Asset Volume',
+    9: 'Taker Buy Base',
+    10: 'Taker Buy Quote'
+}
+
+INT_COLUMNS = {0: 'Open Time', 6: 'Close Time', 8: 'Number of Trades'}
+
+KLINE_COLUMNS = ['Open Time', 'Moeda', 'Open Price', 'High Price', 'Low Price', 'Close Price', 'Volume',
+                 'Close Time', 'Quote Asset Volume', 'Number of Trades', 'Taker Buy Base', 'Taker Buy Quote']
+
+
+def parse_klines(data: list, moeda: str) -> pd.DataFrame:
+    if not data:
+        return pd.DataFrame(columns=KLINE_COLUMNS)
+    
+    values = np.array(data, dtype=object)
+    floats = values[:, list(FLOAT_COLUMNS)].astype('float64')
+    ints = values[:, list(INT_COLUMNS)].astype('int64')
+    
+    df = pd.DataFrame(floats, columns=list(FLOAT_COLUMNS.values()))
+    for position, (_, column) in enumerate(INT_COLUMNS.items()):
+        df[column] = ints[:, position]
+    df['Open Time'] = pd.to_datetime(df['Open Time'], unit='ms')
+    df['Close Time'] = pd.to_datetime(df['Close Time'], unit='ms')
+    df['Moeda'] = moeda
+    return df[KLINE_COLUMNS]
+
+
+class BinanceKlinesETL(BaseETL):
+    
+    def __init__(self, intervals: List[str] = None, **options):
+        super().__init__("BinanceKlinesETL", **options)
+        self.intervals = intervals or KLINES_CONFIG['intervals']
+        self.session = get_session(self.name, retry_rate_limited=False)
+        self.limiter = get_rate_limiter('binance')
+        self.symbols = list(dict.fromkeys(item['binance'] for item in CRYPTO_ASSETS))
+        self.pages: Iterator[Tuple[str, pd.DataFrame]] = iter(())
+        self.rows_loaded = 0
+        
+        unknown = [interval for interval in self.intervals if interval not in INTERVAL_MS]
+        if unknown:
+            raise ValueError(f"Unsupported kline intervals: {', '.join(unknown)}")
+        
+    def extract(self):
+        if self.replay_date:
+            raise ValueError("Kline backfills are not archived to the data lake and cannot be replayed")
+        
+        self.row_counts.update(extract=0, transform=0, load=0)
+        pages = []
+        for interval in self.intervals:
+            resume_points = self._resume_points(interval)
+            for symbol in self.symbols:
+                pages += self._plan_pages(symbol, interval, resume_points.get(self._moeda(symbol)))
+        
+        self.logger.info(f"Backfilling {len(self.symbols)} symbols at {', '.join(self.intervals)} "
+                         f"in {len(pages)} pages of up to {KLINES_CONFIG['page_limit']} klines")
+        self.pages = self._fetch_pages(pages)
+        
+    def transform(self):
+        self.pages = self._rechunk(self._counted(self.pages, 'extract'))
+        
+    def load(self):
+        if self.full_refresh:
+            for interval in self.intervals:
+                self.writer.drop_table(self._table(interval))
+        
+        indexed = set()
+        for interval, chunk in self._counted(self.pages, 'transform'):
+            table_name = self._table(interval)
+            self.df = chunk
+            self.writer.write(chunk, table_name, if_exists='append', key_columns=['Moeda', 'Open Time'])
+            if table_name not in indexed:
+                self.writer.ensure_index(table_name, ['Moeda', 'Open Time'])
+                indexed.add(table_name)
+            self.rows_loaded += len(chunk)
+            self.row_counts['load'] = self.rows_loaded
+            
+        self.logger.success(f"Loaded {self.rows_loaded} klines")
+        
+    def _resume_points(self, interval: str) -> Dict[str, pd.Timestamp]:
+        table_name = self._table(interval)
+        if self.full_refresh or not self.table_exists(table_name):
+            return {}
+        
+        resume_points = self.read_max_dates(table_name, 'Moeda', 'Open Time')
+        self.logger.info(f"Resuming {interval} backfill for {len(resume_points)} symbols from {table_name}")
+        return resume_points
+    
+    def _plan_pages(self, symbol: str, interval: str, last_open: pd.Timestamp = None) -> List[Tuple[str, str, int, int]]:
+        step = INTERVAL_MS[interval]
+        now = int(time.time() * 1000)
+        end = now - now % step - 1
+        
+        if last_open is not None:
+            start = int(last_open.timestamp() * 1000) + step
+        else:
+            start = now - KLINES_CONFIG['history_days'][interval] * INTERVAL_MS['1d']
+            start -= start % step
+            
+        page_span = step * KLINES_CONFIG['page_limit']
+        return [(symbol, interval, page_start, min(page_start + page_span - 1, end))
+                for page_start in range(start, end, page_span)]
+    
+    def _fetch_pages(self, pages: List[Tuple[str, str, int, int]]) -> Iterator[Tuple[str, pd.DataFrame]]:
+        pages = deque(pages)
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=KLINES_CONFIG['max_workers']) as executor:
+            while pages and len(pending) < 2 * KLINES_CONFIG['max_workers']:
+                pending.append(executor.submit(self._fetch_page, *pages.popleft()))
+                
+            while pending:
+                page = pending.popleft().result()
+                if pages:
+                    pending.append(executor.submit(self._fetch_page, *pages.popleft()))
+                yield page
+    
+    def _fetch_page(self, symbol: str, interval: str, start: int, end: int) -> Tuple[str, pd.DataFrame]:
+        self.check_cancelled()
+        url = f"{API_CONFIGS['binance_base_url']}/klines"
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'startTime': str(start),
+            'endTime': str(end),
+            'limit': str(KLINES_CONFIG['page_limit'])
+        }
+        try:
+            data = safe_api_call(self.session, url, params=params, rate_limiter=self.limiter)
+        except Exception as e:
+            self.logger.error(f"Kline page {symbol} {interval} from {start} failed: {e}")
+            raise
+        return interval, parse_klines(data, self._moeda(symbol))
+    
+    def _rechunk(self, pages: Iterator[Tuple[str, pd.DataFrame]]) -> Iterator[Tuple[str, pd.DataFrame]]:
+        buffer, buffered, current = [], 0, None
+        for interval, frame in pages:
+            if buffer and interval != current:
+                yield current, pd.concat(buffer, ignore_index=True)
+                buffer, buffered = [], 0
+            current = interval
+            if frame.empty:
+                continue
+            
+            buffer.append(frame)
+            buffered += len(frame)
+            if buffered >= KLINES_CONFIG['flush_rows']:
+                yield current, pd.concat(buffer, ignore_index=True)
+                buffer, buffered = [], 0
+        
+        if buffer:
+            yield current, pd.concat(buffer, ignore_index=True)
+    
+    def _counted(self, pages: Iterator[Tuple[str, pd.DataFrame]], phase: str) -> Iterator[Tuple[str, pd.DataFrame]]:
+        for interval, frame in pages:
+            self.check_cancelled()
+            self.row_counts[phase] += len(frame)
+            yield interval, frame
+    
+    def _table(self, interval: str) -> str:
+        return f"{DATABASE_TABLES['crypto_klines']}_{interval}"
+    
+    def _moeda(self, symbol: str) -> str:
+        return symbol.replace('USDT', '')
+
+
+if __name__ == "__main__":
+    etl = BinanceKlinesETL()
+    etl.execute()
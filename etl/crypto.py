@@ -1,65 +1,177 @@
 import pandas as pd
-import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple
 from .base_etl import BaseETL
-from config.settings import CRYPTO_ASSETS, API_CONFIGS, DATABASE_TABLES, RETRY_CONFIG
-from utils.helpers import create_robust_session, safe_api_call
+from .binance_klines import parse_klines
+from config.settings import CRYPTO_ASSETS, API_CONFIGS, DATABASE_TABLES, LOAD_CONFIG, CRYPTO_CONFIG
+from utils.helpers import get_session, safe_api_call
+from utils.provider_health import get_provider_health
+from utils.rate_limiter import get_rate_limiter
 
 
 class CryptoETL(BaseETL):
     
-    def __init__(self):
-        super().__init__("CryptoETL")
-        self.session = create_robust_session()
+    def __init__(self, snapshots: bool = True, **options):
+        super().__init__("CryptoETL", **options)
+        self.session = get_session(self.name, retry_rate_limited=False)
+        self.coingecko_limiter = get_rate_limiter('coingecko')
+        self.binance_limiter = get_rate_limiter('binance')
+        self.health = get_provider_health()
+        self.crypto_assets = self.assets if self.assets is not None else CRYPTO_ASSETS
+        self.snapshots = snapshots
         self.data_frames = []
         
     def extract(self):
-        self.logger.info(f"Extracting data for {len(CRYPTO_ASSETS)} cryptocurrencies")
+        if self.replay_date:
+            self.data_frames = [self.read_archive('crypto')]
+            self.row_counts['extract'] = len(self.data_frames[0])
+            return
+        
+        self.logger.info(f"Extracting data for {len(self.crypto_assets)} cryptocurrencies")
+        self.load_watermarks(DATABASE_TABLES['crypto'], 'Moeda')
+        
+        history_assets, snapshot_assets = self._split_assets()
+        restored = set(self.resumed_units('extracted'))
+        if restored:
+            self.data_frames += [self.restore_unit(unit) for unit in restored]
+            history_assets = [item for item in history_assets if item['coingecko'] not in restored]
+            self.logger.info(f"Restored {len(restored)} assets from checkpoints")
+            
+        if snapshot_assets:
+            history_assets += self._extract_snapshots(snapshot_assets)
+            
+        self.logger.info(f"Fetching full history for {len(history_assets)} assets")
+        with ThreadPoolExecutor(max_workers=CRYPTO_CONFIG['max_workers']) as executor:
+            list(executor.map(self._extract_asset, history_assets))
+            
+        self.row_counts['extract'] = sum(len(df) for df in self.data_frames)
+        if self.data_frames:
+            self.archive('crypto', pd.concat(self.data_frames, ignore_index=True))
+            
+    def _split_assets(self) -> Tuple[List[dict], List[dict]]:
+        if not CRYPTO_CONFIG['bulk_mode'] or self.full_refresh or not self.snapshots:
+            return list(self.crypto_assets), []
         
-        for item in CRYPTO_ASSETS:
-            self._extract_asset(item)
-            time.sleep(RETRY_CONFIG['wait_between_requests'])
+        yesterday = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+        history_assets, snapshot_assets = [], []
+        
+        for item in self.crypto_assets:
+            watermark = self.watermarks.get(self._normalize_coin_name(item['coingecko']))
+            if watermark is not None and watermark >= yesterday:
+                snapshot_assets.append(item)
+            else:
+                history_assets.append(item)
+                
+        return history_assets, snapshot_assets
     
-    def _extract_asset(self, item: dict):
-        if self._try_coingecko(item):
-            return
+    def _extract_snapshots(self, items: List[dict]) -> List[dict]:
+        self.logger.info(f"Fetching latest snapshot for {len(items)} assets in bulk")
+        missing = self._fetch_coingecko_markets(items)
         
-        if item['coingecko'] != 'tether':
-            self._try_binance(item)
+        if missing:
+            missing = self._fetch_binance_tickers(missing)
+            
+        if missing:
+            self.logger.warning(f"No bulk snapshot for {len(missing)} assets, falling back to history")
+        return missing
     
-    def _try_coingecko(self, item: dict) -> bool:
-        try:
-            self.logger.info(f"Fetching {item['coingecko']} from CoinGecko")
-            url = f"{API_CONFIGS['coingecko_base_url']}/coins/{item['coingecko']}/market_chart"
-            params = {'vs_currency': 'usd', 'days': '365', 'interval': 'daily'}
+    def _fetch_coingecko_markets(self, items: List[dict]) -> List[dict]:
+        url = f"{API_CONFIGS['coingecko_base_url']}/coins/markets"
+        page_size = CRYPTO_CONFIG['markets_page_size']
+        by_id = {item['coingecko']: item for item in items}
+        rows = []
+        
+        for offset in range(0, len(items), page_size):
+            ids = [item['coingecko'] for item in items[offset:offset + page_size]]
+            params = {'vs_currency': 'usd', 'ids': ','.join(ids), 'per_page': str(page_size), 'page': '1'}
+            try:
+                rows += self.health.call([('coingecko', lambda: safe_api_call(
+                    self.session, url, params=params, rate_limiter=self.coingecko_limiter, source='coingecko'))])
+            except Exception as e:
+                self.logger.warning(f"CoinGecko markets failed for page {offset // page_size + 1}: {e}")
+                
+        rows = [row for row in rows if row.get('id') in by_id and row.get('current_price') is not None]
+        if rows:
+            self.data_frames.append(self._process_coingecko_markets(rows))
+            self.logger.success(f"Fetched {len(rows)} snapshots from CoinGecko markets")
             
-            data = safe_api_call(self.session, url, params=params)
+        found = {row['id'] for row in rows}
+        return [item for item in items if item['coingecko'] not in found]
+    
+    def _fetch_binance_tickers(self, items: List[dict]) -> List[dict]:
+        candidates = [item for item in items if item['coingecko'] != 'tether']
+        if not candidates:
+            return items
+        
+        try:
+            url = f"{API_CONFIGS['binance_base_url']}/ticker/24hr"
+            data = self.health.call([('binance', lambda: safe_api_call(
+                self.session, url, rate_limiter=self.binance_limiter, source='binance'))])
+        except Exception as e:
+            self.logger.warning(f"Binance 24hr ticker failed: {e}")
+            return items
+        
+        symbols = {item['binance'] for item in candidates}
+        rows = [row for row in data if row.get('symbol') in symbols]
+        if rows:
+            self.data_frames.append(self._process_binance_tickers(rows))
+            self.logger.success(f"Fetched {len(rows)} snapshots from Binance 24hr ticker")
             
-            if all(k in data for k in ['prices', 'market_caps', 'total_volumes']):
-                df = self._process_coingecko_data(data, item)
-                self.data_frames.append(df)
-                self.logger.success(f"Successfully fetched {item['coingecko']} from CoinGecko")
-                return True
-                
+        found = {row['symbol'] for row in rows}
+        return [item for item in items if item not in candidates or item['binance'] not in found]
+    
+    def _extract_asset(self, item: dict):
+        self.check_cancelled()
+        providers = [('coingecko', lambda: self._fetch_coingecko(item))]
+        if item['coingecko'] != 'tether':
+            providers.append(('binance', lambda: self._fetch_binance(item)))
+        
+        try:
+            df = self.health.call(providers)
+        except Exception as e:
+            self.logger.error(f"No provider returned history for {item['coingecko']}: {e}")
+            return
+        self.data_frames.append(df)
+        self.checkpoint(item['coingecko'], 'extracted', df)
+    
+    def _fetch_coingecko(self, item: dict) -> pd.DataFrame:
+        self.logger.item(f"Fetching {item['coingecko']} from CoinGecko", asset=item['coingecko'], provider='coingecko')
+        url = f"{API_CONFIGS['coingecko_base_url']}/coins/{item['coingecko']}/market_chart"
+        start = self.get_start_date(self._normalize_coin_name(item['coingecko']))
+        params = {'vs_currency': 'usd', 'days': str(self._days_since(start)), 'interval': 'daily'}
+        
+        try:
+            data = safe_api_call(self.session, url, params=params, rate_limiter=self.coingecko_limiter,
+                                 source='coingecko')
         except Exception as e:
             self.logger.warning(f"CoinGecko failed for {item['coingecko']}: {e}")
+            raise
+        if not all(k in data for k in ['prices', 'market_caps', 'total_volumes']):
+            raise ValueError(f"Incomplete CoinGecko market chart for {item['coingecko']}")
         
-        return False
+        df = self._filter_since(self._process_coingecko_data(data, item), start)
+        self.logger.item(f"Successfully fetched {item['coingecko']} from CoinGecko", asset=item['coingecko'],
+                         provider='coingecko', rows=len(df))
+        return df
     
-    def _try_binance(self, item: dict):
-        try:
-            self.logger.info(f"Fetching {item['binance']} from Binance")
-            url = f"{API_CONFIGS['binance_base_url']}/klines"
-            params = {'symbol': item['binance'], 'interval': '1d', 'limit': '365'}
+    def _fetch_binance(self, item: dict) -> pd.DataFrame:
+        self.logger.item(f"Fetching {item['binance']} from Binance", asset=item['binance'], provider='binance')
+        url = f"{API_CONFIGS['binance_base_url']}/klines"
+        params = {'symbol': item['binance'], 'interval': '1d', 'limit': str(LOAD_CONFIG['full_history_days'])}
             
-            data = safe_api_call(self.session, url, params=params)
+        start = self.get_start_date(item['binance'].replace('USDT', ''))
+        if start is not None:
+            params['startTime'] = str(int(start.timestamp() * 1000))
             
-            if isinstance(data, list) and len(data) > 0:
-                df = self._process_binance_data(data, item)
-                self.data_frames.append(df)
-                self.logger.success(f"Successfully fetched {item['binance']} from Binance")
-                
-        except Exception as e:
-            self.logger.error(f"Binance failed for {item['binance']}: {e}")
+        data = safe_api_call(self.session, url, params=params, rate_limiter=self.binance_limiter,
+                             source='binance')
+        if not isinstance(data, list) or len(data) == 0:
+            raise ValueError(f"No Binance klines for {item['binance']}")
+            
+        df = self._filter_since(self._process_binance_data(data, item), start)
+        self.logger.item(f"Successfully fetched {item['binance']} from Binance", asset=item['binance'],
+                         provider='binance', rows=len(df))
+        return df
     
     def _process_coingecko_data(self, data: dict, item: dict) -> pd.DataFrame:
         df_prices = pd.DataFrame(data['prices'], columns=['timestamp', 'price'])
@@ -80,26 +192,86 @@ class CryptoETL(BaseETL):
         df_prices['Low Price'] = df_prices['Close Price']
         df_prices['Number of Trades'] = 0
         
+        df_prices['Date'] = df_prices['Date'].dt.normalize()
+        df_prices = df_prices.drop_duplicates(subset=['Date'], keep='last')
+        
         return df_prices[['Date', 'Moeda', 'Open Price', 'High Price', 'Low Price', 
                          'Close Price', 'Volume', 'Number of Trades', 'Market_Cap']]
     
-    def _process_binance_data(self, data: list, item: dict) -> pd.DataFrame:
-        columns = ["Open Time", "Open Price", "High Price", "Low Price", "Close Price", 
-                  "Volume", "Close Time", "Quote Asset Volume", "Number of Trades", 
-                  "Taker Buy Base", "Taker Buy Quote", "Ignore"]
-        df = pd.DataFrame(data, columns=columns)
-        
-        df['Moeda'] = item['binance'].replace('USDT', '')
-        df['Date'] = pd.to_datetime(df['Open Time'], unit='ms')
+    def _process_coingecko_markets(self, rows: List[dict]) -> pd.DataFrame:
+        df = pd.DataFrame(rows)
+        close = pd.to_numeric(df['current_price'])
+        change = pd.to_numeric(df['price_change_24h']).fillna(0)
         
-        for col in ["Open Price", "High Price", "Low Price", "Close Price", "Volume"]:
-            df[col] = pd.to_numeric(df[col])
+        snapshot = pd.DataFrame({
+            'Date': pd.Timestamp.now().normalize(),
+            'Moeda': df['id'].map(self._normalize_coin_name),
+            'Open Price': close - change,
+            'High Price': pd.to_numeric(df['high_24h']).fillna(close),
+            'Low Price': pd.to_numeric(df['low_24h']).fillna(close),
+            'Close Price': close,
+            'Volume': pd.to_numeric(df['total_volume']).fillna(0),
+            'Number of Trades': 0,
+            'Market_Cap': pd.to_numeric(df['market_cap']).fillna(0)
+        })
+        return snapshot
+    
+    def _process_binance_tickers(self, rows: List[dict]) -> pd.DataFrame:
+        df = pd.DataFrame(rows)
         
+        snapshot = pd.DataFrame({
+            'Date': pd.Timestamp.now().normalize(),
+            'Moeda': df['symbol'].str.replace('USDT', '', regex=False),
+            'Open Price': pd.to_numeric(df['openPrice']),
+            'High Price': pd.to_numeric(df['highPrice']),
+            'Low Price': pd.to_numeric(df['lowPrice']),
+            'Close Price': pd.to_numeric(df['lastPrice']),
+            'Volume': pd.to_numeric(df['volume']),
+            'Number of Trades': pd.to_numeric(df['count']),
+            'Market_Cap': 0
+        })
+        return snapshot
+    
+    def _process_binance_data(self, data: list, item: dict) -> pd.DataFrame:
+        df = parse_klines(data, item['binance'].replace('USDT', ''))
+        df['Date'] = df['Open Time']
         df['Market_Cap'] = 0
         
         return df[['Date', 'Moeda', 'Open Price', 'High Price', 'Low Price', 
                   'Close Price', 'Volume', 'Number of Trades', 'Market_Cap']]
     
+    def _days_since(self, start: pd.Timestamp) -> int:
+        if start is None:
+            return LOAD_CONFIG['full_history_days']
+        days = (pd.Timestamp.now().normalize() - start).days + 1
+        return max(1, min(days, LOAD_CONFIG['full_history_days']))
+    
+    def _filter_since(self, df: pd.DataFrame, start: pd.Timestamp) -> pd.DataFrame:
+        if start is None:
+            return df
+        return df[df['Date'] >= start]
+    
+    def shard_items(self) -> List[dict]:
+        return list(self.crypto_assets)
+    
+    def prepare_shards(self) -> List[dict]:
+        self.load_watermarks(DATABASE_TABLES['crypto'], 'Moeda')
+        history_assets, snapshot_assets = self._split_assets()
+        if snapshot_assets:
+            history_assets += self._extract_snapshots(snapshot_assets)
+            
+        if self.data_frames:
+            snapshots = pd.concat(self.data_frames, ignore_index=True)
+            self.row_counts['extract'] = len(snapshots)
+            self.archive('crypto', snapshots)
+        return history_assets
+    
+    def shard_options(self) -> dict:
+        return {**super().shard_options(), 'snapshots': False}
+    
+    def merge_shards(self, frames: Iterable[pd.DataFrame]):
+        super().merge_shards(self.data_frames + list(frames))
+        
     def _normalize_coin_name(self, coingecko_id: str) -> str:
         mapping = {
             'tether': 'USDT',
@@ -116,7 +288,7 @@ class CryptoETL(BaseETL):
         self.df = pd.concat(self.data_frames, ignore_index=True)
         
     def load(self):
-        self.save_to_database(DATABASE_TABLES['crypto'], if_exists='replace')
+        self.upsert_to_database(DATABASE_TABLES['crypto'], 'Moeda')
 
 
 if __name__ == "__main__":
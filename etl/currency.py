@@ -1,48 +1,137 @@
 import pandas as pd
-import requests
+from typing import List
+from sqlalchemy import inspect
 from .base_etl import BaseETL
-from config.settings import API_CONFIGS, DATABASE_TABLES
+from config.database import EngineRegistry
+from config.settings import API_CONFIGS, CURRENCY_CONFIG, DATABASE_TABLES, LOAD_CONFIG
+from utils.helpers import get_session, safe_api_call
+from utils.provider_health import get_provider_health
 
 
 class CurrencyETL(BaseETL):
     
-    def __init__(self):
-        super().__init__("CurrencyETL")
-        self.exchange_rate = None
+    def __init__(self, **options):
+        super().__init__("CurrencyETL", **options)
+        self.session = get_session(self.name)
+        self.health = get_provider_health()
+        self.quotes: pd.DataFrame = None
+        self.legacy_table = False
         
     def extract(self):
+        table_name = DATABASE_TABLES['currency']
+        self.legacy_table = self._is_legacy_table(table_name)
+        if self.legacy_table:
+            self.logger.info(f"{table_name} holds a single overwritten quote, backfilling a dated history to replace it")
+        else:
+            self.load_watermarks(table_name, 'moeda')
+        
+        if self.replay_date:
+            self.quotes = self.read_archive('currency')
+            if 'data_consulta' not in self.quotes:
+                self.quotes['data_consulta'] = pd.Timestamp.now()
+            self.row_counts['extract'] = len(self.quotes)
+            return
+        
+        rows = []
+        start = self.get_start_date(CURRENCY_CONFIG['currency'])
+        today = pd.Timestamp.now().normalize()
+        if start is None or start < today - pd.Timedelta(days=LOAD_CONFIG['overlap_days']):
+            rows += self._fetch_history(start, today)
+            
         self.logger.info("Fetching USD/BRL exchange rate")
-        self.exchange_rate = self._fetch_exchange_rate()
+        rows.append(self._fetch_exchange_rate())
+        
+        self.quotes = pd.DataFrame(rows)
+        self.row_counts['extract'] = len(self.quotes)
+        self.archive('currency', self.quotes)
+        
+    def _is_legacy_table(self, table_name: str) -> bool:
+        if not self.table_exists(table_name):
+            return False
+        columns = {column['name'] for column in inspect(self.engine).get_columns(table_name)}
+        return 'Date' not in columns
+    
+    def _fetch_history(self, start: pd.Timestamp, end: pd.Timestamp) -> List[dict]:
+        start = start if start is not None else end - pd.Timedelta(days=CURRENCY_CONFIG['history_days'])
+        page_days = CURRENCY_CONFIG['history_page_days']
+        self.logger.info(f"Backfilling USD/BRL history from {start:%Y-%m-%d}")
+        rows = []
+        
+        for page_start in pd.date_range(start, end, freq=f'{page_days}D'):
+            self.check_cancelled()
+            page_end = min(page_start + pd.Timedelta(days=page_days - 1), end)
+            params = {'start_date': page_start.strftime('%Y%m%d'), 'end_date': page_end.strftime('%Y%m%d')}
+            try:
+                data = self.health.call([('awesomeapi', lambda: safe_api_call(
+                    self.session, f"{API_CONFIGS['awesomeapi_daily_url']}/{page_days}", params=params,
+                    source='currency'))])
+            except Exception as e:
+                self.logger.warning(f"USD/BRL history failed from {page_start:%Y-%m-%d}: {e}")
+                continue
+            
+            rows += [
+                {
+                    'bid': item['bid'],
+                    'source': 'AwesomeAPI',
+                    'data_consulta': pd.to_datetime(int(item['timestamp']), unit='s')
+                }
+                for item in data
+            ]
+            
+        self.logger.info(f"Fetched {len(rows)} historical USD/BRL quotes")
+        return rows
         
     def _fetch_exchange_rate(self) -> dict:
         try:
-            response = requests.get(API_CONFIGS['awesomeapi_url'])
-            if response.status_code == 200:
-                data = response.json()
-                self.logger.info("Successfully fetched from AwesomeAPI")
-                return {"bid": data['USDBRL']['bid'], "source": "AwesomeAPI"}
+            return self.health.call([
+                ('awesomeapi', self._fetch_awesomeapi),
+                ('currency_fallback', self._fetch_fallback)
+            ])
         except Exception as e:
-            self.logger.warning(f"AwesomeAPI failed: {e}. Trying fallback...")
+            raise Exception(f"All currency APIs failed: {e}")
         
+    def _fetch_awesomeapi(self) -> dict:
         try:
-            response = requests.get(API_CONFIGS['fallback_currency_url'])
-            data = response.json()
-            self.logger.info("Successfully fetched from FallbackAPI")
-            return {"bid": data['usd']['brl'], "source": "FallbackAPI"}
+            data = safe_api_call(self.session, API_CONFIGS['awesomeapi_url'], source='currency')
         except Exception as e:
-            raise Exception(f"All currency APIs failed: {e}")
+            self.logger.warning(f"AwesomeAPI failed: {e}. Trying fallback...")
+            raise
+        self.logger.info("Successfully fetched from AwesomeAPI")
+        return {"bid": data['USDBRL']['bid'], "source": "AwesomeAPI", "data_consulta": pd.Timestamp.now()}
+        
+    def _fetch_fallback(self) -> dict:
+        data = safe_api_call(self.session, API_CONFIGS['fallback_currency_url'], source='currency')
+        self.logger.info("Successfully fetched from FallbackAPI")
+        return {"bid": data['usd']['brl'], "source": "FallbackAPI", "data_consulta": pd.Timestamp.now()}
     
     def transform(self):
         self.logger.info("Transforming currency data")
-        self.df = pd.DataFrame([{
-            "moeda": "USD",
-            "bid": float(self.exchange_rate['bid']),
-            "data_consulta": pd.Timestamp.now()
-        }])
+        quotes = self.quotes.assign(data_consulta=pd.to_datetime(self.quotes['data_consulta']))
+        quotes['Date'] = quotes['data_consulta'].dt.normalize()
+        quotes = quotes.sort_values('data_consulta').drop_duplicates(subset=['Date'], keep='last')
+        
+        start = self.get_start_date(CURRENCY_CONFIG['currency'])
+        if start is not None:
+            quotes = quotes[quotes['Date'] >= start]
+            
+        self.df = pd.DataFrame({
+            'Date': quotes['Date'],
+            'moeda': CURRENCY_CONFIG['currency'],
+            'bid': quotes['bid'].astype('float64'),
+            'data_consulta': quotes['data_consulta'],
+            'fonte': quotes['source']
+        }).reset_index(drop=True)
         
     def load(self):
-        self.db_config.test_connection()
-        self.save_to_database(DATABASE_TABLES['currency'], if_exists='replace')
+        EngineRegistry.shared().warm_up()
+        table_name = DATABASE_TABLES['currency']
+        if self.legacy_table:
+            self.save_to_database(table_name, if_exists='replace', index_columns=['moeda', 'Date'])
+            self.record_changes(table_name, 'moeda')
+        else:
+            self.upsert_to_database(table_name, 'moeda')
+        if self.table_exists(table_name):
+            self.writer.ensure_index(table_name, ['moeda', 'Date'])
 
 
 if __name__ == "__main__":
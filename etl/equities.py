@@ -0,0 +1,180 @@
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List
+from .base_etl import BaseETL
+from config.settings import BULK_LOAD_CONFIG, EQUITY_CONFIG, LOAD_CONFIG
+from utils.helpers import normalize_ticker
+
+
+PRICE_COLUMNS = {'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close', 'Volume': 'Volume'}
+
+
+class EquityETL(BaseETL):
+    
+    def __init__(self, name: str, tickers: List[str], table_name: str, lake_source: str,
+                 ticker_suffix: str = None, extra_columns: Dict[str, str] = None, **options):
+        super().__init__(name, **options)
+        self.tickers = self.assets if self.assets is not None else tickers
+        self.table_name = table_name
+        self.lake_source = lake_source
+        self.ticker_suffix = ticker_suffix
+        self.extra_columns = extra_columns or {}
+        self.batches: Iterator[pd.DataFrame] = iter(())
+        self.rows_loaded = 0
+        
+    def extract(self):
+        self.logger.info(f"Downloading data for {len(self.tickers)} tickers in batches of {EQUITY_CONFIG['batch_size']}")
+        self.load_watermarks(self.table_name, 'Ticker')
+        self.row_counts.update(extract=0, transform=0, load=0)
+        
+        if self.replay_date:
+            self.batches = self._replay_batches()
+        else:
+            self.batches = self._download_batches()
+        
+    def transform(self):
+        self.batches = (self._transform_batch(raw) for raw in self._counted(self.batches, 'extract'))
+        
+    def load(self):
+        target = self.table_name
+        if self.full_refresh and BULK_LOAD_CONFIG['shadow_swap']:
+            target = self.writer.begin_shadow(self.table_name)
+        elif self.full_refresh:
+            self.writer.drop_table(self.table_name)
+            
+        written = []
+        for batch in self._counted(self.batches, 'transform'):
+            if batch.empty:
+                continue
+            self.df = batch
+            self.logger.info(f"Upserting batch of {len(batch)} rows for {batch['Ticker'].nunique()} tickers")
+            self.writer.upsert(batch, target, ['Date', 'Ticker'])
+            self.rows_loaded += len(batch)
+            self.row_counts['load'] = self.rows_loaded
+            self.checkpoint_many(batch.attrs.get('units', []), 'loaded')
+            if target == self.table_name:
+                self.record_changes(self.table_name, 'Ticker', batch)
+            else:
+                written.append(batch.groupby('Ticker', observed=True)['Date'].min().reset_index())
+            
+        if target != self.table_name:
+            self.writer.swap(self.table_name, self.rows_loaded, ['Ticker', 'Date'])
+            if written:
+                self.record_changes(self.table_name, 'Ticker', pd.concat(written, ignore_index=True))
+        self.logger.success(f"Loaded {self.rows_loaded} rows into {self.table_name}")
+        
+    def shard_items(self) -> List[str]:
+        return list(self.tickers)
+    
+    def shard_result(self) -> pd.DataFrame:
+        frames = [batch for batch in self._counted(self.batches, 'transform') if not batch.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    
+    def merge_shards(self, frames: Iterable[pd.DataFrame]):
+        self.row_counts.update(transform=0, load=0)
+        self.batches = iter(frames)
+        
+    def _cleanup(self):
+        if hasattr(self.batches, 'close'):
+            self.batches.close()
+        super()._cleanup()
+        
+    def _counted(self, batches: Iterator[pd.DataFrame], phase: str) -> Iterator[pd.DataFrame]:
+        for batch in batches:
+            self.check_cancelled()
+            self.row_counts[phase] += len(batch)
+            yield batch
+        
+    def _download_batches(self) -> Iterator[pd.DataFrame]:
+        size = EQUITY_CONFIG['batch_size']
+        loaded = set() if self.full_refresh else set(self.resumed_units('loaded'))
+        restored = [ticker for ticker in self.tickers if ticker in self.unit_stages and ticker not in loaded]
+        remaining = [ticker for ticker in self.tickers if ticker not in self.unit_stages]
+        if self.unit_stages:
+            self.logger.info(f"Restored {len(restored)} tickers from checkpoints, "
+                             f"skipping {len(loaded)} already loaded")
+        
+        for i in range(0, len(restored), size):
+            raw = pd.concat([self.restore_unit(ticker) for ticker in restored[i:i + size]], ignore_index=True)
+            raw.attrs['units'] = restored[i:i + size]
+            yield raw
+            
+        batches = deque(remaining[i:i + size] for i in range(0, len(remaining), size))
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=EQUITY_CONFIG['max_workers']) as executor:
+            while batches and len(pending) < EQUITY_CONFIG['max_workers']:
+                pending.append(executor.submit(self._download_batch, batches.popleft()))
+                
+            while pending:
+                raw = pending.popleft().result()
+                if batches:
+                    pending.append(executor.submit(self._download_batch, batches.popleft()))
+                yield raw
+    
+    def _replay_batches(self) -> Iterator[pd.DataFrame]:
+        size = EQUITY_CONFIG['batch_size']
+        for i in range(0, len(self.tickers), size):
+            yield self.read_archive(self.lake_source, filters={'Ticker': self.tickers[i:i + size]})
+    
+    def _download_batch(self, tickers: List[str]) -> pd.DataFrame:
+        import yfinance as yf
+        frames, units = [], []
+        for ticker in tickers:
+            self.check_cancelled()
+            try:
+                history = yf.Ticker(ticker).history(**self._history_window(ticker), actions=False)
+            except Exception as e:
+                self.logger.warning(f"Download failed for {ticker}: {e}")
+                continue
+            
+            if history.empty:
+                self.logger.warning(f"No data returned for {ticker}")
+                continue
+            
+            history = history[list(PRICE_COLUMNS)].rename(columns=PRICE_COLUMNS)
+            history.index = pd.DatetimeIndex(history.index).tz_localize(None).normalize()
+            history['Ticker'] = ticker
+            frames.append(history.rename_axis('Date').reset_index())
+            units.append(ticker)
+            self.checkpoint(ticker, 'extracted', frames[-1])
+            
+        if not frames:
+            return pd.DataFrame()
+        
+        raw = pd.concat(frames, ignore_index=True)
+        self.archive(self.lake_source, raw)
+        raw.attrs['units'] = units
+        return raw
+    
+    def _history_window(self, ticker: str) -> Dict[str, str]:
+        start = self.get_start_date(self._normalize(ticker))
+        if start is None:
+            return {'period': LOAD_CONFIG['full_history_period']}
+        return {'start': start.strftime('%Y-%m-%d')}
+    
+    def _transform_batch(self, raw: pd.DataFrame) -> pd.DataFrame:
+        if raw.empty:
+            return raw
+        
+        df = raw.dropna(subset=['Close'])
+        prices = df[['Close', 'High', 'Low', 'Open']].astype('float64').round(2)
+        if prices.abs().max().max() < EQUITY_CONFIG['float32_price_limit']:
+            prices = prices.astype('float32')
+        batch = pd.DataFrame({
+            'Date': df['Date'],
+            'Ticker': df['Ticker'].map(self._normalize).astype('category'),
+            'Close': prices['Close'],
+            'High': prices['High'],
+            'Low': prices['Low'],
+            'Open': prices['Open'],
+            'Volume': pd.to_numeric(df['Volume'].fillna(0).astype('int64'), downcast='integer')
+        })
+        for column, value in self.extra_columns.items():
+            batch[column] = value
+        batch.attrs = dict(raw.attrs)
+        return batch.reset_index(drop=True)
+    
+    def _normalize(self, ticker: str) -> str:
+        return normalize_ticker(ticker, self.ticker_suffix)
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from sqlalchemy import text
+from .base_etl import BaseETL
+from .mercado_global import MARKET_SOURCES
+from config.settings import DATABASE_TABLES, INDICATORS_CONFIG
+from utils import indicators
+
+
+class TechnicalIndicatorsETL(BaseETL):
+    
+    def __init__(self, **options):
+        super().__init__("TechnicalIndicatorsETL", **options)
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.starts: Dict[str, Optional[pd.Timestamp]] = {}
+        self.peaks: Dict[str, float] = {}
+        self.correlations: pd.DataFrame = None
+        
+    def extract(self):
+        table_name = DATABASE_TABLES['indicators']
+        self.logger.info("Reading close prices for the indicator panel")
+        self.load_watermarks(table_name, 'Ativo')
+        if self.watermarks:
+            self.peaks = self._read_peaks(table_name)
+            
+        for source in MARKET_SOURCES:
+            if not self.table_exists(source['table']):
+                self.logger.warning(f"Source table {source['table']} not found, skipping")
+                continue
+            
+            frame = self._read_source(source)
+            if not frame.empty:
+                self.frames[source['tipo_mercado']] = frame
+        
+        self.row_counts['extract'] = sum(len(frame) for frame in self.frames.values())
+        
+    def _read_peaks(self, table_name: str) -> Dict[str, float]:
+        query = text(f"SELECT [Ativo], MAX([Pico_Historico]) FROM {table_name} GROUP BY [Ativo]")
+        with self.engine.connect() as conn:
+            return {asset: float(peak) for asset, peak in conn.execute(query) if peak is not None}
+        
+    def _read_source(self, source: dict) -> pd.DataFrame:
+        close_column = next(column for column, name in source['columns'].items() if name == 'Close')
+        assets = list(self.read_max_dates(source['table'], source['key']))
+        starts = {asset: self.get_start_date(asset) for asset in assets}
+        self.starts.update(starts)
+        
+        query = f"SELECT [Date], [{source['key']}], [{close_column}] FROM {source['table']}"
+        params = {}
+        if assets and all(start is not None for start in starts.values()):
+            since = min(starts.values()) - pd.Timedelta(days=INDICATORS_CONFIG['warmup_days'])
+            query += " WHERE [Date] >= :since"
+            params['since'] = since.to_pydatetime()
+            
+        frame = pd.read_sql(text(query), self.engine, params=params)
+        frame = frame.rename(columns={source['key']: 'Ativo', close_column: 'Close'})
+        frame['Date'] = pd.to_datetime(frame['Date']).dt.normalize()
+        self.logger.info(f"Read {len(frame)} closes for {frame['Ativo'].nunique()} assets from {source['table']}")
+        return frame
+    
+    def transform(self):
+        if not self.frames:
+            self.df = pd.DataFrame()
+            self.logger.warning("No source rows to compute indicators from")
+            return
+        
+        results, returns = [], []
+        for tipo_mercado, frame in self.frames.items():
+            prices = frame.pivot_table(index='Date', columns='Ativo', values='Close', aggfunc='last').sort_index()
+            self.logger.info(f"Computing indicators for {tipo_mercado}: {prices.shape[0]} dates x {prices.shape[1]} assets")
+            panel, daily_returns = self._compute_panel(prices, tipo_mercado)
+            results.append(panel)
+            returns.append(daily_returns)
+            
+        self.df = pd.concat(results, ignore_index=True)
+        self.correlations = self._compute_correlations(pd.concat(returns, axis=1))
+        self.logger.info(f"Computed {len(self.df)} indicator rows and {len(self.correlations)} correlation pairs")
+        
+    def _compute_panel(self, prices: pd.DataFrame, tipo_mercado: str):
+        observed = prices.notna().to_numpy()
+        values = prices.ffill().to_numpy(dtype='float64')
+        returns = indicators.log_returns(values)
+        
+        columns = {'Preco': values}
+        for window in INDICATORS_CONFIG['sma']:
+            columns[f'SMA_{window}'] = indicators.rolling_mean(values, window)
+        for span in INDICATORS_CONFIG['ema']:
+            columns[f'EMA_{span}'] = indicators.ema(values, span)
+            
+        window = INDICATORS_CONFIG['volatility']
+        periods = INDICATORS_CONFIG['annualization'][tipo_mercado]
+        columns[f'Volatilidade_{window}'] = indicators.rolling_std(returns, window) * np.sqrt(periods)
+        columns[f"RSI_{INDICATORS_CONFIG['rsi']}"] = indicators.rsi(values, INDICATORS_CONFIG['rsi'])
+        
+        initial_peaks = np.array([self.peaks.get(asset, np.nan) for asset in prices.columns])
+        columns['Pico_Historico'], columns['Drawdown'] = indicators.drawdown(values, initial_peaks)
+        
+        dates, assets = np.nonzero(observed)
+        panel = pd.DataFrame({
+            'Date': prices.index[dates],
+            'Ativo': prices.columns[assets],
+            'Tipo_Mercado': tipo_mercado
+        })
+        for name, matrix in columns.items():
+            panel[name] = np.round(matrix[dates, assets], 6)
+            
+        starts = panel['Ativo'].map(self.starts)
+        panel = panel[starts.isna() | (panel['Date'] >= starts)].reset_index(drop=True)
+        return panel, pd.DataFrame(np.where(observed, returns, np.nan), index=prices.index, columns=prices.columns)
+    
+    def _compute_correlations(self, returns: pd.DataFrame) -> pd.DataFrame:
+        if self.df.empty or returns.empty:
+            return pd.DataFrame()
+        
+        window = INDICATORS_CONFIG['correlation']
+        as_of = returns.index.max()
+        recent = returns[returns.index > as_of - pd.Timedelta(days=window)]
+        matrix = recent.corr(min_periods=INDICATORS_CONFIG['correlation_min_periods'])
+        
+        pairs = matrix.rename_axis(index='Ativo_A', columns='Ativo_B').stack().rename('Correlacao').reset_index()
+        pairs.insert(0, 'Date', as_of)
+        pairs['Correlacao'] = pairs['Correlacao'].round(6)
+        pairs['Janela'] = window
+        return pairs
+    
+    def load(self):
+        table_name = DATABASE_TABLES['indicators']
+        self.upsert_to_database(table_name, 'Ativo')
+        if self.table_exists(table_name):
+            self.writer.ensure_index(table_name, ['Ativo', 'Date'])
+            
+        if self.correlations is None or self.correlations.empty:
+            return
+        correlation_table = DATABASE_TABLES['correlations']
+        if self.full_refresh:
+            self.writer.drop_table(correlation_table)
+        self.writer.upsert(self.correlations, correlation_table, ['Date', 'Ativo_A', 'Ativo_B'])
+        self.logger.success(f"Correlation matrix for {self.correlations['Date'].iloc[0]:%Y-%m-%d} saved to {correlation_table}")
+
+
+if __name__ == "__main__":
+    etl = TechnicalIndicatorsETL()
+    etl.execute()
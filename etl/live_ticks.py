@@ -0,0 +1,176 @@
+import json
+import signal
+import threading
+import time
+from typing import Dict, List
+from config.database import EngineRegistry
+from config.settings import API_CONFIGS, CRYPTO_ASSETS, DATABASE_TABLES, LIVE_CONFIG
+from utils.bulk_writer import BulkWriter
+from utils.logger import ETLLogger
+from utils.ticks import CandleAggregator, TickRingBuffer
+
+try:
+    from websockets.sync.client import connect
+except ImportError:
+    connect = None
+
+
+INTERVAL_MS = {'1m': 60_000, '5m': 300_000, '15m': 900_000, '1h': 3_600_000}
+
+
+class LiveTickStream:
+    
+    def __init__(self, symbols: List[str] = None, intervals: List[str] = None, stream_url: str = None):
+        self.name = "LiveTickStream"
+        self.logger = ETLLogger(self.name)
+        self.symbols = symbols or list(dict.fromkeys(item['binance'] for item in CRYPTO_ASSETS))
+        self.intervals = intervals or LIVE_CONFIG['intervals']
+        self.stream_url = stream_url or API_CONFIGS['binance_stream_url']
+        self.buffers: Dict[str, TickRingBuffer] = {
+            symbol: TickRingBuffer(LIVE_CONFIG['buffer_size']) for symbol in self.symbols
+        }
+        self.aggregator = CandleAggregator({interval: INTERVAL_MS[interval] for interval in self.intervals})
+        self.pending: List[tuple] = []
+        self.ticks = 0
+        self.rows_loaded = 0
+        self.writer: BulkWriter = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flush_now = threading.Event()
+        
+    def run_forever(self):
+        self._setup()
+        self._install_signal_handlers()
+        self.logger.info(f"Streaming trades for {len(self.symbols)} symbols into {', '.join(self.intervals)} candles")
+        reader = threading.Thread(target=self._read_forever, name="live-ticks", daemon=True)
+        reader.start()
+        try:
+            self._flush_loop()
+        finally:
+            self.stop()
+            reader.join(timeout=LIVE_CONFIG['flush_interval'])
+            self.flush()
+            self.logger.info(f"Live tick stream stopped after {self.ticks} ticks and {self.rows_loaded} candles")
+    
+    def run_once(self):
+        self._setup()
+        self._consume()
+        self.flush(close_all=True)
+        
+    def stop(self):
+        self._stop.set()
+        self._flush_now.set()
+        
+    def latest_prices(self) -> Dict[str, float]:
+        latest = {}
+        for symbol, buffer in self.buffers.items():
+            tick = buffer.last()
+            if tick is not None:
+                latest[symbol] = tick[1]
+        return latest
+    
+    def flush(self, close_all: bool = False):
+        now = float('inf') if close_all else int(time.time() * 1000)
+        with self._lock:
+            candles = self.pending + self.aggregator.close_expired(now, LIVE_CONFIG['close_delay'] * 1000)
+            self.pending = []
+        if not candles:
+            return
+        
+        try:
+            df = CandleAggregator.to_frame(candles, self._moeda)
+            for interval, frame in df.groupby('Interval', sort=False):
+                frame = frame.drop(columns='Interval').reset_index(drop=True)
+                self.writer.upsert(frame, self._table(interval), ['Date', 'Moeda'])
+                self.rows_loaded += len(frame)
+        except Exception:
+            with self._lock:
+                self.pending = candles + self.pending
+            raise
+        
+    def _setup(self):
+        if connect is None:
+            raise RuntimeError("Live tick mode needs the optional 'websockets' package (pip install websockets)")
+        self.writer = BulkWriter(EngineRegistry.shared().get_engine(), self.logger)
+        
+    def _flush_loop(self):
+        last_status = time.monotonic()
+        while not self._stop.is_set():
+            self._flush_now.wait(LIVE_CONFIG['flush_interval'])
+            self._flush_now.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Candle flush failed, keeping candles for the next flush: {e}")
+                continue
+            
+            if time.monotonic() - last_status >= LIVE_CONFIG['status_interval']:
+                last_status = time.monotonic()
+                prices = ', '.join(f"{self._moeda(symbol)} {price:,.2f}" for symbol, price in self.latest_prices().items())
+                self.logger.info(f"Live: {self.ticks} ticks, {self.rows_loaded} candles written, "
+                                 f"{self.aggregator.late_ticks} late ticks. {prices}")
+    
+    def _read_forever(self):
+        backoff = LIVE_CONFIG['reconnect_backoff']
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                self._consume()
+                attempt, reason = 0, "closed by server"
+            except Exception as e:
+                reason = str(e)
+            if self._stop.is_set():
+                break
+            
+            wait = backoff[min(attempt, len(backoff) - 1)]
+            attempt += 1
+            self.logger.warning(f"Trade stream disconnected ({reason}), reconnecting in {wait}s")
+            self._stop.wait(wait)
+    
+    def _consume(self):
+        streams = '/'.join(f"{symbol.lower()}@trade" for symbol in self.symbols)
+        with connect(f"{self.stream_url}?streams={streams}", open_timeout=LIVE_CONFIG['open_timeout']) as websocket:
+            self.logger.info("Connected to trade stream")
+            for message in websocket:
+                self._on_message(message)
+                if self._stop.is_set():
+                    break
+                
+    def _on_message(self, message: str):
+        payload = json.loads(message)
+        trade = payload.get('data', payload)
+        symbol = trade.get('s')
+        if symbol not in self.buffers:
+            return
+        
+        timestamp, price, quantity = int(trade['T']), float(trade['p']), float(trade['q'])
+        self.buffers[symbol].append(timestamp, price, quantity)
+        with self._lock:
+            self.pending += self.aggregator.add(symbol, timestamp, price, quantity)
+            ready = len(self.pending) >= LIVE_CONFIG['flush_rows']
+        self.ticks += 1
+        if ready:
+            self._flush_now.set()
+    
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        
+        def handle(signum, frame):
+            self.logger.info(f"Received {signal.Signals(signum).name}, flushing closed candles and stopping")
+            signal.signal(signum, signal.SIG_DFL)
+            self.stop()
+            
+        signal.signal(signal.SIGINT, handle)
+        if hasattr(signal, 'SIGTERM'):
+            signal.signal(signal.SIGTERM, handle)
+    
+    def _table(self, interval: str) -> str:
+        return f"{DATABASE_TABLES['crypto_live']}_{interval}"
+    
+    def _moeda(self, symbol: str) -> str:
+        return symbol.replace('USDT', '')
+
+
+if __name__ == "__main__":
+    LiveTickStream().run_forever()
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from .base_etl import BaseETL
+from config.settings import BULK_LOAD_CONFIG, CHANGE_LOG_CONFIG, DATABASE_TABLES, MERCADO_GLOBAL_CONFIG
+from utils.change_log import get_change_log
+
+
+MARKET_SOURCES = [
+    {
+        'table': DATABASE_TABLES['crypto'],
+        'key': 'Moeda',
+        'tipo_mercado': 'Cripto',
+        'moeda_original': 'USD',
+        'columns': {'Open Price': 'Open', 'High Price': 'High', 'Low Price': 'Low',
+                    'Close Price': 'Close', 'Volume': 'Volume', 'Market_Cap': 'Market_Cap'}
+    },
+    {
+        'table': DATABASE_TABLES['nasdaq_stocks'],
+        'key': 'Ticker',
+        'tipo_mercado': 'Acao_USA',
+        'moeda_original': 'USD',
+        'columns': {'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close', 'Volume': 'Volume'}
+    },
+    {
+        'table': DATABASE_TABLES['brazilian_stocks'],
+        'key': 'Ticker',
+        'tipo_mercado': 'Acao_BR',
+        'moeda_original': 'BRL',
+        'columns': {'Open': 'Open', 'High': 'High', 'Low': 'Low', 'Close': 'Close', 'Volume': 'Volume'}
+    }
+]
+
+OUTPUT_COLUMNS = [
+    'Date', 'Ativo', 'Tipo_Mercado', 'Moeda_Original',
+    'Open_BRL', 'High_BRL', 'Low_BRL', 'Preco_BRL',
+    'Open_USD', 'High_USD', 'Low_USD', 'Preco_USD',
+    'Market_Cap_BRL', 'Market_Cap_USD', 'Volume',
+    'Preco_Ontem', 'Preco_Ontem_USD', 'Variacao_Percentual'
+]
+
+
+class MercadoGlobalETL(BaseETL):
+    
+    def __init__(self, **options):
+        super().__init__("MercadoGlobalETL", **options)
+        self.frames: List[pd.DataFrame] = []
+        self.partition_starts: Dict[str, Optional[pd.Timestamp]] = {}
+        self.exchange_rates: pd.DataFrame = None
+        self.change_positions: Dict[str, int] = {}
+        self.rates_since: Optional[pd.Timestamp] = None
+        
+    def extract(self):
+        self.logger.info("Reading touched partitions from history tables")
+        self.load_watermarks(DATABASE_TABLES['mercado_global'], 'Ativo')
+        self.exchange_rates = self._read_exchange_rates()
+        rate_changes = self._pending_changes(DATABASE_TABLES['currency'])
+        if rate_changes:
+            self.rates_since = min(rate_changes.values()).normalize()
+            self.logger.info(f"USD/BRL rates changed from {self.rates_since:%Y-%m-%d}, reconverting later facts")
+        
+        for source in MARKET_SOURCES:
+            if not self.table_exists(source['table']):
+                self.logger.warning(f"Source table {source['table']} not found, skipping")
+                continue
+            
+            frame = self._read_source(source)
+            if not frame.empty:
+                self.frames.append(frame)
+        
+        self.row_counts['extract'] = sum(len(frame) for frame in self.frames)
+    
+    def _read_exchange_rates(self) -> pd.DataFrame:
+        rates = pd.read_sql(text(f"SELECT bid, data_consulta FROM {DATABASE_TABLES['currency']}"), self.engine)
+        if rates.empty:
+            raise ValueError("No USD/BRL rate available for conversion")
+        
+        rates['Date'] = pd.to_datetime(rates['data_consulta']).dt.normalize()
+        rates = rates.sort_values('data_consulta').drop_duplicates(subset=['Date'], keep='last')
+        self.logger.info(f"Loaded {len(rates)} daily USD/BRL rates for as-of conversion")
+        return rates[['Date', 'bid']].reset_index(drop=True)
+    
+    def _rates_as_of(self, dates: pd.Series) -> np.ndarray:
+        rate_dates = self.exchange_rates['Date'].to_numpy(dtype='datetime64[ns]')
+        positions = np.searchsorted(rate_dates, dates.to_numpy(dtype='datetime64[ns]'), side='right') - 1
+        return self.exchange_rates['bid'].to_numpy(dtype='float64')[np.clip(positions, 0, None)]
+    
+    def _read_source(self, source: dict) -> pd.DataFrame:
+        changes = self._pending_changes(source['table'])
+        starts = {}
+        for asset, max_date in self.read_max_dates(source['table'], source['key']).items():
+            start = self.get_start_date(asset)
+            if start is None:
+                starts[asset] = None
+                continue
+            
+            candidates = [since.normalize() for since in [changes.get(asset)] if since is not None]
+            if max_date > self.watermarks[asset]:
+                candidates.append(start)
+            if self.rates_since is not None and self.rates_since <= self.watermarks[asset]:
+                candidates.append(self.rates_since)
+            if candidates:
+                starts[asset] = min(candidates)
+        self.partition_starts.update(starts)
+        
+        if not starts:
+            self.logger.info(f"No changes in {source['table']} since the last materialization")
+            return pd.DataFrame()
+        
+        frame = self._read_partitions(source, starts).rename(columns={source['key']: 'Ativo', **source['columns']})
+        frame['Tipo_Mercado'] = source['tipo_mercado']
+        frame['Moeda_Original'] = source['moeda_original']
+        new_assets = sum(start is None for start in starts.values())
+        self.logger.info(f"Read {len(frame)} rows from {source['table']} "
+                         f"({new_assets} new assets, {len(starts) - new_assets} changed)")
+        return frame
+    
+    def _pending_changes(self, table_name: str) -> Dict[str, pd.Timestamp]:
+        if not CHANGE_LOG_CONFIG['enabled']:
+            return {}
+        changes, position = get_change_log().pending(self.name, table_name)
+        self.change_positions[table_name] = position
+        return changes
+    
+    def _read_partitions(self, source: dict, starts: Dict[str, Optional[pd.Timestamp]]) -> pd.DataFrame:
+        lookback = pd.Timedelta(days=MERCADO_GLOBAL_CONFIG['lookback_days'])
+        keys = pd.DataFrame({
+            'Ativo': list(starts),
+            'Since': pd.to_datetime([start - lookback if start is not None else None for start in starts.values()])
+        })
+        staging = f"{BULK_LOAD_CONFIG['staging_prefix']}{self.name.lower()}_{source['table']}"
+        columns = ', '.join(f"s.[{c}]" for c in ['Date', source['key']] + list(source['columns']))
+        query = text(f"SELECT {columns} FROM {source['table']} AS s JOIN {staging} AS k ON s.[{source['key']}] = k.[Ativo] "
+                     f"WHERE k.[Since] IS NULL OR s.[Date] >= k.[Since]")
+        
+        with self.engine.begin() as conn:
+            keys.to_sql(staging, con=conn, if_exists='replace', index=False,
+                        dtype=self.writer.sql_types(keys, staging=True))
+            frame = pd.read_sql(query, conn)
+            conn.execute(text(f"DROP TABLE {staging}"))
+        return frame
+    
+    def transform(self):
+        if not self.frames:
+            self.df = pd.DataFrame(columns=OUTPUT_COLUMNS)
+            self.logger.warning("No source rows to materialize")
+            return
+        
+        self.logger.info("Building unified market fact rows")
+        df = pd.concat(self.frames, ignore_index=True)
+        df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+        df = df.sort_values(['Ativo', 'Date']).drop_duplicates(subset=['Ativo', 'Date'], keep='last')
+        
+        self.df = self._compute_facts(df.reset_index(drop=True))
+        self.logger.info(f"Materialized {len(self.df)} rows")
+        
+    def _compute_facts(self, df: pd.DataFrame) -> pd.DataFrame:
+        bid = self._rates_as_of(df['Date'])
+        is_brl = (df['Moeda_Original'] == 'BRL').to_numpy()
+        to_brl = np.where(is_brl, 1.0, bid)
+        with np.errstate(divide='ignore'):
+            to_usd = np.where(is_brl, 1.0 / np.where(bid == 0, np.nan, bid), 1.0)
+        
+        facts = pd.DataFrame({
+            'Date': df['Date'],
+            'Ativo': df['Ativo'],
+            'Tipo_Mercado': df['Tipo_Mercado'],
+            'Moeda_Original': df['Moeda_Original']
+        })
+        
+        for column, name in [('Open', 'Open'), ('High', 'High'), ('Low', 'Low'), ('Close', 'Preco')]:
+            values = df[column].to_numpy(dtype='float64')
+            facts[f'{name}_BRL'] = values * to_brl
+            facts[f'{name}_USD'] = values * to_usd
+            
+        market_cap = df['Market_Cap'].to_numpy(dtype='float64') if 'Market_Cap' in df else np.full(len(df), np.nan)
+        market_cap = np.where(df['Tipo_Mercado'].to_numpy() == 'Cripto', market_cap, np.nan)
+        facts['Market_Cap_USD'] = market_cap
+        facts['Market_Cap_BRL'] = market_cap * bid
+        facts['Volume'] = df['Volume'].to_numpy(dtype='float64')
+        
+        grouped = facts.groupby('Ativo', sort=False)
+        facts['Preco_Ontem'] = grouped['Preco_BRL'].shift(1)
+        facts['Preco_Ontem_USD'] = grouped['Preco_USD'].shift(1)
+        
+        previous = facts['Preco_Ontem'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (facts['Preco_BRL'].to_numpy() - previous) / np.where(previous == 0, np.nan, previous)
+        facts['Variacao_Percentual'] = np.round(change, 4)
+        
+        starts = facts['Ativo'].map(self.partition_starts)
+        facts = facts[starts.isna() | (facts['Date'] >= starts)]
+        return facts[OUTPUT_COLUMNS].reset_index(drop=True)
+    
+    def load(self):
+        table_name = DATABASE_TABLES['mercado_global']
+        self.upsert_to_database(table_name, 'Ativo')
+        if self.table_exists(table_name):
+            self.writer.ensure_index(table_name, ['Ativo', 'Date'])
+        if self.change_positions:
+            get_change_log().acknowledge(self.name, self.change_positions)
+
+
+if __name__ == "__main__":
+    etl = MercadoGlobalETL()
+    etl.execute()
@@ -1,44 +1,86 @@
 import pandas as pd
-import feedparser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import text
 from .base_etl import BaseETL
-from config.settings import NEWS_SEARCH_TERMS, API_CONFIGS, DATABASE_TABLES
+from config.settings import NEWS_SEARCH_TERMS, API_CONFIGS, DATABASE_TABLES, NEWS_CONFIG
+from utils.helpers import fetch_content, get_session
+from utils.rate_limiter import get_rate_limiter
+from utils.seen_index import SeenIndex, get_seen_index
 
 
 class NewsETL(BaseETL):
     
-    def __init__(self):
-        super().__init__("NewsETL")
+    def __init__(self, **options):
+        super().__init__("NewsETL", **options)
+        self.session = get_session(self.name)
+        self.rate_limiter = get_rate_limiter('news')
+        self.seen_index = get_seen_index()
         self.news_list = []
+        self.fetched_feeds: Dict[str, bytes] = {}
+        self.new_keys: List[str] = []
         
     def extract(self):
-        self.logger.info("Fetching news from Google News RSS")
+        self._seed_seen_index()
         
-        for item in NEWS_SEARCH_TERMS:
-            self._fetch_news_for_asset(item)
-    
-    def _fetch_news_for_asset(self, item: dict):
+        if self.replay_date:
+            self.news_list = self.read_archive('news').to_dict('records')
+            self.row_counts['extract'] = len(self.news_list)
+            return
+        
+        self.logger.info(f"Fetching news for {len(NEWS_SEARCH_TERMS)} search terms from Google News RSS")
+        
+        with ThreadPoolExecutor(max_workers=NEWS_CONFIG['max_workers']) as executor:
+            for entries in executor.map(self._fetch_news_for_asset, NEWS_SEARCH_TERMS):
+                self.news_list.extend(entries)
+        
+        self.row_counts['extract'] = len(self.news_list)
+        self.archive('news', pd.DataFrame(self.news_list))
+        
+    def _seed_seen_index(self):
+        table_name = DATABASE_TABLES['news']
+        if not self.seen_index.is_empty() or not self.table_exists(table_name):
+            return
+        
+        since = datetime.now() - pd.Timedelta(days=NEWS_CONFIG['seen_retention_days'])
+        existing = pd.read_sql(text(f"SELECT Ativo, Link, UUID FROM {table_name} WHERE Data >= :since"),
+                               self.engine, params={'since': since})
+        keys = [SeenIndex.item_key(*row) for row in existing[['Ativo', 'UUID', 'Link']].itertuples(index=False)]
+        self.seen_index.add(keys)
+        self.logger.info(f"Seeded seen-item index with {len(keys)} stored news items")
+        
+    def _fetch_news_for_asset(self, item: dict) -> List[dict]:
+        self.check_cancelled()
         try:
-            self.logger.info(f"Fetching news for {item['ticker']}")
             search_term = item['query'].replace(' ', '%20')
             rss_url = f"{API_CONFIGS['google_news_base_url']}?q={search_term}&hl=pt-BR&gl=BR&ceid=BR:pt-419"
             
-            feed = feedparser.parse(rss_url)
+            body = fetch_content(self.session, rss_url, rate_limiter=self.rate_limiter, source='news')
+            if not self.seen_index.feed_changed(rss_url, body):
+                self.logger.item(f"Feed for {item['ticker']} unchanged since last load", asset=item['ticker'])
+                return []
             
-            for entry in feed.entries[:6]:
-                self.news_list.append(self._parse_news_entry(entry, item))
-                
-            self.logger.info(f"Fetched {min(6, len(feed.entries))} news items for {item['ticker']}")
+            import feedparser
+            feed = feedparser.parse(body)
+            depth = item.get('depth', NEWS_CONFIG['default_depth'])
+            entries = [self._parse_news_entry(entry, item) for entry in feed.entries[:depth]]
+            self.fetched_feeds[rss_url] = body
             
+            self.logger.item(f"Fetched {len(entries)} news items for {item['ticker']}", asset=item['ticker'],
+                             rows=len(entries))
+            return entries
+        
         except Exception as e:
             self.logger.error(f"Failed to fetch news for {item['ticker']}: {e}")
-    
+            return []
+        
     def _parse_news_entry(self, entry, item: dict) -> dict:
         try:
             dt_pub = datetime(*entry.published_parsed[:6])
         except:
             dt_pub = datetime.now()
-        
+            
         return {
             'Data': dt_pub,
             'Ativo': item['ticker'],
@@ -48,7 +90,7 @@ class NewsETL(BaseETL):
             'Link': entry.link,
             'UUID': entry.id if 'id' in entry else None
         }
-    
+        
     def transform(self):
         self.logger.info("Transforming news data")
         self.df = pd.DataFrame(self.news_list)
@@ -56,17 +98,26 @@ class NewsETL(BaseETL):
         if not self.df.empty:
             self.df = self.df.sort_values(by='Data', ascending=False)
             
-            yesterday = datetime.now() - pd.Timedelta(days=1)
-            self.df = self.df[self.df['Data'] > yesterday]
+            cutoff = datetime.now() - pd.Timedelta(hours=NEWS_CONFIG['max_age_hours'])
+            self.df = self.df[self.df['Data'] > cutoff]
             
-            self.logger.info(f"Filtered to {len(self.df)} recent news items")
-        
+            keys = [SeenIndex.item_key(*row) for row in self.df[['Ativo', 'UUID', 'Link']].itertuples(index=False)]
+            self.df = self.df.assign(_key=keys).drop_duplicates(subset='_key')
+            unseen = self.seen_index.unseen(self.df['_key'])
+            self.df = self.df[self.df['_key'].isin(unseen)]
+            self.new_keys = self.df.pop('_key').tolist()
+            
+            self.logger.info(f"Filtered to {len(self.df)} new recent news items")
+    
     def load(self):
         if self.df.empty:
-            self.logger.warning("No recent news to save")
-            return
+            self.logger.warning("No new news to save")
+        else:
+            self.save_to_database(DATABASE_TABLES['news'], if_exists='append')
+            self.seen_index.add(self.new_keys)
             
-        self.save_to_database(DATABASE_TABLES['news'], if_exists='append')
+        for url, body in self.fetched_feeds.items():
+            self.seen_index.remember_feed(url, body)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from .base_etl import BaseETL
+from config.settings import DATABASE_TABLES, ROLLUPS_CONFIG
+
+
+SNAPSHOT_COLUMNS = [
+    'Ativo', 'Tipo_Mercado', 'Moeda_Original', 'Date',
+    'Preco_BRL', 'Preco_USD', 'Preco_Ontem', 'Preco_Ontem_USD', 'Variacao_Percentual',
+    'Market_Cap_BRL', 'Market_Cap_USD', 'Volume'
+]
+
+ROLLUP_AGGREGATES = {
+    'Tipo_Mercado': ('Tipo_Mercado', 'last'),
+    'Moeda_Original': ('Moeda_Original', 'last'),
+    'Open_BRL': ('Open_BRL', 'first'),
+    'High_BRL': ('High_BRL', 'max'),
+    'Low_BRL': ('Low_BRL', 'min'),
+    'Preco_BRL': ('Preco_BRL', 'last'),
+    'Open_USD': ('Open_USD', 'first'),
+    'High_USD': ('High_USD', 'max'),
+    'Low_USD': ('Low_USD', 'min'),
+    'Preco_USD': ('Preco_USD', 'last'),
+    'Market_Cap_BRL': ('Market_Cap_BRL', 'last'),
+    'Market_Cap_USD': ('Market_Cap_USD', 'last'),
+    'Volume': ('Volume', 'sum'),
+    'Dias': ('Date', 'count'),
+    'Ultima_Data': ('Date', 'max')
+}
+
+
+class MarketRollupsETL(BaseETL):
+    
+    def __init__(self, **options):
+        super().__init__("MarketRollupsETL", **options)
+        self.facts: pd.DataFrame = None
+        self.starts: Dict[str, Optional[pd.Timestamp]] = {}
+        self.tables: Dict[str, pd.DataFrame] = {}
+        self.rows_loaded = 0
+        
+    def extract(self):
+        source = DATABASE_TABLES['mercado_global']
+        if not self.table_exists(source):
+            self.facts = pd.DataFrame()
+            self.logger.warning(f"Source table {source} not found, nothing to roll up")
+            return
+        
+        self.load_watermarks(DATABASE_TABLES['latest_snapshot'], 'Ativo')
+        assets = list(self.read_max_dates(source, 'Ativo'))
+        self.starts = {asset: self.get_start_date(asset) for asset in assets}
+        
+        query, params = f"SELECT * FROM {source}", {}
+        if assets and all(start is not None for start in self.starts.values()):
+            since = (min(self.starts.values()) - pd.DateOffset(months=1)).to_period('M').start_time
+            query += " WHERE [Date] >= :since"
+            params['since'] = (since - pd.Timedelta(days=7)).to_pydatetime()
+            
+        self.facts = pd.read_sql(text(query), self.engine, params=params)
+        self.facts['Date'] = pd.to_datetime(self.facts['Date']).dt.normalize()
+        self.facts = self.facts.sort_values(['Ativo', 'Date']).reset_index(drop=True)
+        self.row_counts['extract'] = len(self.facts)
+        self.logger.info(f"Read {len(self.facts)} rows for {self.facts['Ativo'].nunique()} assets from {source}")
+        
+    def transform(self):
+        if self.facts.empty:
+            self.logger.warning("No market rows to roll up")
+            return
+        
+        starts = self.facts['Ativo'].map(self.starts)
+        touched = self.facts[starts.isna() | (self.facts['Date'] >= starts)]
+        
+        self.tables[DATABASE_TABLES['latest_snapshot']] = self._snapshot(touched)
+        for table_key, freq in ROLLUPS_CONFIG['periods'].items():
+            self.tables[DATABASE_TABLES[table_key]] = self._rollup(freq)
+        self.tables[DATABASE_TABLES['market_summary']] = self._summary(touched)
+        
+        self.df = self.tables[DATABASE_TABLES['latest_snapshot']]
+        self.row_counts['transform'] = sum(len(frame) for frame in self.tables.values())
+        self.logger.info(', '.join(f"{len(frame)} rows for {table}" for table, frame in self.tables.items()))
+        
+    def _snapshot(self, touched: pd.DataFrame) -> pd.DataFrame:
+        latest = touched.groupby('Ativo', sort=False).tail(1)
+        return latest[SNAPSHOT_COLUMNS].reset_index(drop=True)
+    
+    def _rollup(self, freq: str) -> pd.DataFrame:
+        periods = self.facts['Date'].dt.to_period(freq).dt.start_time
+        grouped = self.facts.groupby(['Ativo', periods.rename('Date')], sort=True)
+        rollup = grouped.agg(**ROLLUP_AGGREGATES).reset_index()
+        
+        previous = rollup.groupby('Ativo', sort=False)['Preco_BRL'].shift(1).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = rollup['Preco_BRL'].to_numpy() / np.where(previous == 0, np.nan, previous) - 1
+        rollup['Preco_Anterior'] = previous
+        rollup['Variacao_Percentual'] = np.round(change, 4)
+        
+        starts = pd.to_datetime(rollup['Ativo'].map(self.starts))
+        period_starts = starts.dt.to_period(freq).dt.start_time
+        return rollup[starts.isna() | (rollup['Date'] >= period_starts)].reset_index(drop=True)
+    
+    def _summary(self, touched: pd.DataFrame) -> pd.DataFrame:
+        dates = touched['Date'].unique()
+        daily = self.facts[self.facts['Date'].isin(dates)]
+        daily = pd.concat([daily, daily.assign(Tipo_Mercado=ROLLUPS_CONFIG['all_markets'])], ignore_index=True)
+        change = daily['Variacao_Percentual']
+        
+        return daily.assign(Alta=change > 0, Baixa=change < 0, Estavel=change == 0).groupby(
+            ['Date', 'Tipo_Mercado'], sort=True
+        ).agg(
+            Ativos=('Ativo', 'nunique'),
+            Altas=('Alta', 'sum'),
+            Baixas=('Baixa', 'sum'),
+            Estaveis=('Estavel', 'sum'),
+            Variacao_Media=('Variacao_Percentual', 'mean'),
+            Variacao_Mediana=('Variacao_Percentual', 'median'),
+            Volume=('Volume', 'sum'),
+            Market_Cap_BRL=('Market_Cap_BRL', 'sum'),
+            Market_Cap_USD=('Market_Cap_USD', 'sum')
+        ).round({'Variacao_Media': 4, 'Variacao_Mediana': 4}).reset_index()
+        
+    def load(self):
+        keys = {
+            DATABASE_TABLES['latest_snapshot']: ['Ativo'],
+            DATABASE_TABLES['market_summary']: ['Date', 'Tipo_Mercado']
+        }
+        for table_name, frame in self.tables.items():
+            self._save(frame, table_name, keys.get(table_name, ['Date', 'Ativo']))
+            
+        self.row_counts['load'] = self.rows_loaded
+        self.logger.success(f"Rolled up {self.rows_loaded} rows into {len(self.tables)} tables")
+        
+    def _save(self, frame: pd.DataFrame, table_name: str, key_columns: List[str]):
+        if frame.empty:
+            return
+        if self.full_refresh or not self.table_exists(table_name):
+            self.writer.replace(frame, table_name, key_columns[::-1])
+        else:
+            self.writer.upsert(frame, table_name, key_columns)
+        self.rows_loaded += len(frame)
+
+
+if __name__ == "__main__":
+    etl = MarketRollupsETL()
+    etl.execute()
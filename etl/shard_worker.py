@@ -0,0 +1,108 @@
+import os
+import signal
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import List
+from . import load_etl
+from config.settings import QUEUE_CONFIG
+from utils.logger import ETLLogger
+from utils.work_queue import WorkQueue, get_work_queue
+
+
+class ShardWorker:
+    
+    def __init__(self, etl_names: List[str] = None, queue: WorkQueue = None, stop_event=None):
+        self.name = "ShardWorker"
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = ETLLogger(self.name)
+        self.etl_names = etl_names or None
+        self.queue = queue or get_work_queue()
+        self.stop_event = stop_event
+        self.processed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+        
+    def run_forever(self, idle_timeout: float = None):
+        self._install_signal_handlers()
+        scope = ', '.join(self.etl_names) if self.etl_names else "all ETLs"
+        self.logger.info(f"Worker {self.worker_id} claiming shards for {scope}")
+        idle_since = time.monotonic()
+        
+        while not self._stop.is_set():
+            shard = self.queue.claim(self.worker_id, QUEUE_CONFIG['lease_seconds'], self.etl_names)
+            if shard is not None:
+                self.process(shard)
+                idle_since = time.monotonic()
+                continue
+            
+            if self.stop_event is not None and self.stop_event.is_set():
+                break
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            self._stop.wait(QUEUE_CONFIG['poll_interval'])
+            
+        self.logger.info(f"Worker {self.worker_id} stopped after {self.processed} shards ({self.failed} failed)")
+        
+    def stop(self):
+        self._stop.set()
+        
+    def process(self, shard: dict):
+        label = f"{shard['etl']} shard {shard['shard']} (run {shard['run_id']}, attempt {shard['attempt']})"
+        self.logger.info(f"Processing {label} with {len(shard['items'])} assets")
+        
+        try:
+            with self._heartbeat(shard):
+                etl = load_etl(shard['etl'])(assets=shard['items'], **shard['options'])
+                frame = etl.run_shard()
+        except Exception as e:
+            self.failed += 1
+            status = self.queue.fail(shard, self.worker_id, str(e))
+            self.logger.error(f"{label} failed, shard is now {status}: {e}")
+            return
+        
+        if self.queue.complete(shard, self.worker_id, frame):
+            self.processed += 1
+            self.logger.success(f"{label} done with {0 if frame is None else len(frame)} rows")
+        else:
+            self.logger.warning(f"{label} finished after its lease was lost, result discarded")
+    
+    @contextmanager
+    def _heartbeat(self, shard: dict):
+        done = threading.Event()
+        
+        def beat():
+            while not done.wait(QUEUE_CONFIG['heartbeat_interval']):
+                if not self.queue.extend_lease(shard, self.worker_id, QUEUE_CONFIG['lease_seconds']):
+                    self.logger.warning(f"Lost the lease on {shard['etl']} shard {shard['shard']}")
+                    return
+                
+        thread = threading.Thread(target=beat, name="shard-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+    
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        
+        def handle(signum, frame):
+            self.logger.info(f"Received {signal.Signals(signum).name}, stopping after the current shard")
+            signal.signal(signum, signal.SIG_DFL)
+            self.stop()
+            
+        signal.signal(signal.SIGINT, handle)
+        if hasattr(signal, 'SIGTERM'):
+            signal.signal(signal.SIGTERM, handle)
+
+
+def run_worker_process(etl_names: List[str] = None, stop_event=None, idle_timeout: float = None):
+    ShardWorker(etl_names, stop_event=stop_event).run_forever(idle_timeout=idle_timeout)
+
+
+if __name__ == "__main__":
+    ShardWorker().run_forever()
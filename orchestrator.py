@@ -1,68 +1,217 @@
-import sys
-from typing import List, Type
-from etl import (
-    BaseETL,
-    CurrencyETL,
-    NewsETL,
-    BrazilianStocksETL,
-    NasdaqStocksETL,
-    CryptoETL
+import argparse
+import multiprocessing
+import threading
+from typing import Dict, List, Type
+from etl import load_etl
+from config.database import EngineRegistry
+from config.settings import (
+    CHECKPOINT_CONFIG,
+    DAEMON_CONFIG,
+    DAEMON_SCHEDULE,
+    ETL_DEPENDENCIES,
+    ETL_UPSTREAM_HOSTS,
+    METRICS_CONFIG,
+    QUEUE_CONFIG
 )
+from utils.daemon import Cadence, RefreshDaemon
+from utils.http_cache import get_http_cache
 from utils.logger import ETLLogger
+from utils.metrics import reset_run_metrics
+from utils.provider_health import get_provider_health
+from utils.scheduler import DAGScheduler
 
 
 class ETLOrchestrator:
     
-    def __init__(self):
+    def __init__(self, full_refresh: bool = False, max_workers: int = None, replay_date: str = None,
+                 sharded: bool = False, run_id: str = None):
         self.logger = ETLLogger("Orchestrator")
-        self.etl_pipeline: List[Type[BaseETL]] = [
-            CurrencyETL,
-            NewsETL,
-            BrazilianStocksETL,
-            NasdaqStocksETL,
-            CryptoETL
+        self.full_refresh = full_refresh
+        self.replay_date = replay_date
+        self.max_workers = max_workers
+        self.sharded = sharded
+        self.engines = EngineRegistry.shared()
+        self.metrics = reset_run_metrics(run_id)
+        self.etl_pipeline: List[str] = [
+            'CurrencyETL',
+            'NewsETL',
+            'BrazilianStocksETL',
+            'NasdaqStocksETL',
+            'CryptoETL',
+            'MercadoGlobalETL',
+            'MarketRollupsETL',
+            'TechnicalIndicatorsETL'
+        ]
+        self.on_demand: List[str] = [
+            'BinanceKlinesETL'
         ]
         self.results = {}
+        self.resuming = False
         
     def run_all(self):
         self.logger.info("Starting ETL orchestration")
-        total = len(self.etl_pipeline)
-        
-        for idx, etl_class in enumerate(self.etl_pipeline, 1):
-            etl_name = etl_class.__name__
-            self.logger.info(f"[{idx}/{total}] Running {etl_name}")
-            
-            try:
-                etl = etl_class()
-                etl.execute()
-                self.results[etl_name] = "SUCCESS"
-                
-            except Exception as e:
-                self.logger.error(f"{etl_name} failed: {str(e)}")
-                self.results[etl_name] = f"FAILED: {str(e)}"
-        
-        self._print_summary()
+        self._run_pipeline(self.etl_pipeline)
         
     def run_specific(self, etl_names: List[str]):
         self.logger.info(f"Running specific ETLs: {etl_names}")
+        self._run_pipeline(self._select(etl_names))
+        
+    def run_resume(self, run_id: str = None):
+        from utils.checkpoints import get_checkpoint_store
+        store = get_checkpoint_store()
+        run_id, pending = store.resumable(None if run_id == 'latest' else run_id)
+        if not pending:
+            self.logger.info("No unfinished run to resume")
+            return
+        
+        options = next(iter(pending.values()))
+        self.full_refresh = options.get('full_refresh', False)
+        self.replay_date = options.get('replay_date')
+        self.metrics = reset_run_metrics(run_id)
+        self.resuming = True
+        
+        progress = store.summary(run_id)
+        self.logger.info(f"Resuming run {run_id}: " + ', '.join(
+            f"{etl_name} ({', '.join(f'{count} {stage}' for stage, count in progress.get(etl_name, {}).items()) or 'not started'})"
+            for etl_name in pending))
+        self._run_pipeline(list(pending))
+        
+    def run_live(self):
+        self.logger.info("Starting live tick stream")
+        load_etl('LiveTickStream')().run_forever()
         
-        etl_map = {etl.__name__: etl for etl in self.etl_pipeline}
+    def run_sharded(self, etl_names: List[str] = None, processes: int = None):
+        processes = QUEUE_CONFIG['local_workers'] if processes is None else processes
+        self.logger.info(f"Sharding run {self.metrics.run_id} across the work queue with {processes} local workers")
+        context = multiprocessing.get_context('spawn')
+        stop_event = context.Event()
+        workers = self._start_workers(context, processes, stop_event=stop_event)
+        
+        try:
+            self._run_pipeline(self._select(etl_names) if etl_names else self.etl_pipeline)
+        finally:
+            stop_event.set()
+            for worker in workers:
+                worker.join(timeout=DAEMON_CONFIG['shutdown_timeout'])
+                if worker.is_alive():
+                    worker.terminate()
+    
+    def run_workers(self, etl_names: List[str] = None, processes: int = 1):
+        if processes <= 1:
+            load_etl('ShardWorker')(etl_names).run_forever()
+            return
+        
+        self.logger.info(f"Starting {processes} shard worker processes")
+        for worker in self._start_workers(multiprocessing.get_context('spawn'), processes, etl_names):
+            worker.join()
+    
+    def _start_workers(self, context, processes: int, etl_names: List[str] = None, stop_event=None) -> list:
+        from etl.shard_worker import run_worker_process
+        workers = [
+            context.Process(target=run_worker_process, args=(etl_names, stop_event), name=f"shard-worker-{i}")
+            for i in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        return workers
+    
+    def rollback(self, table_names: List[str]):
+        from utils.bulk_writer import BulkWriter
+        writer = BulkWriter(self.engines.get_engine(), self.logger)
+        for table_name in table_names:
+            writer.rollback(table_name)
+        
+    def run_daemon(self, etl_names: List[str] = None, live: bool = False):
+        etl_names = self._select(etl_names) if etl_names else self.etl_pipeline
+        self.logger.info(f"Starting ETL daemon for {len(etl_names)} ETLs")
+        
+        try:
+            self.engines.warm_up()
+        except Exception as e:
+            self.logger.warning(f"Database warm-up failed: {str(e)}")
+            
+        daemon = RefreshDaemon(self.logger, max_workers=self.max_workers, on_complete=self._record_daemon_run)
+        for etl_name in etl_names:
+            schedule = DAEMON_SCHEDULE.get(etl_name)
+            if schedule is None:
+                self.logger.warning(f"No daemon schedule for {etl_name}, skipping")
+                continue
+            daemon.add_job(etl_name, self._make_job(load_etl(etl_name)), Cadence(**schedule))
+            
+        stream, stream_thread = None, None
+        if live:
+            stream = load_etl('LiveTickStream')()
+            stream_thread = threading.Thread(target=stream.run_forever, name="live-stream", daemon=True)
+            stream_thread.start()
+            
+        daemon.run_forever()
+        if stream is not None:
+            stream.stop()
+            stream_thread.join(timeout=DAEMON_CONFIG['shutdown_timeout'])
+        self.logger.info("ETL daemon stopped")
+        
+    def _record_daemon_run(self, etl_name: str, status: str, seconds: float):
+        self.results[etl_name] = status
+        self.metrics.record_etl(etl_name, status=status)
+        self._export_metrics()
+        
+    def _select(self, etl_names: List[str]) -> List[str]:
+        known = set(self.etl_pipeline + self.on_demand)
+        selected = []
         
         for name in etl_names:
-            if name not in etl_map:
+            if name not in known:
                 self.logger.warning(f"ETL '{name}' not found, skipping")
                 continue
+            selected.append(name)
+        return selected
                 
-            try:
-                etl = etl_map[name]()
-                etl.execute()
-                self.results[name] = "SUCCESS"
-                
-            except Exception as e:
-                self.logger.error(f"{name} failed: {str(e)}")
-                self.results[name] = f"FAILED: {str(e)}"
+    def _load(self, etl_names: List[str]) -> Dict[str, Type]:
+        return {etl_name: load_etl(etl_name) for etl_name in etl_names}
+    
+    def _run_pipeline(self, etl_names: List[str]):
+        try:
+            self.engines.warm_up()
+        except Exception as e:
+            self.logger.warning(f"Database warm-up failed: {str(e)}")
+            
+        scheduler = DAGScheduler(self.logger, max_workers=self.max_workers)
+        checkpoints = CHECKPOINT_CONFIG['enabled'] and not self.sharded and not self.replay_date
+        if checkpoints:
+            from utils.checkpoints import get_checkpoint_store
+            get_checkpoint_store().plan(self.metrics.run_id, etl_names,
+                                        {'full_refresh': self.full_refresh, 'replay_date': self.replay_date})
+        
+        etl_classes = self._load(etl_names)
+        for etl_name, etl_class in etl_classes.items():
+            scheduler.add_job(
+                etl_name,
+                self._make_job(etl_class, checkpoints),
+                depends_on=ETL_DEPENDENCIES.get(etl_name, []),
+                host=ETL_UPSTREAM_HOSTS.get(etl_name)
+            )
+            
+        statuses = scheduler.run()
+        for etl_name in etl_classes:
+            self.results[etl_name] = statuses[etl_name]
+            self.metrics.record_etl(etl_name, status=statuses[etl_name])
+        self.metrics.finish()
         
         self._print_summary()
+        self._export_metrics()
+        
+    def _make_job(self, etl_class: Type, checkpoints: bool = False):
+        def job():
+            options = {'full_refresh': self.full_refresh, 'replay_date': self.replay_date}
+            if checkpoints:
+                options.update(run_id=self.metrics.run_id, resume=self.resuming)
+            etl = etl_class(**options)
+            if self.sharded and etl.shard_items() is not None:
+                from utils.work_queue import get_work_queue
+                etl.execute_sharded(get_work_queue(), self.metrics.run_id)
+            else:
+                etl.execute()
+        return job
     
     def _print_summary(self):
         self.logger.info("=" * 60)
@@ -77,17 +226,111 @@ class ETLOrchestrator:
         
         self.logger.info("=" * 60)
         self.logger.info(f"Total: {success_count}/{total_count} successful")
+        
+        cache_stats = get_http_cache().stats()
+        self.logger.info(f"HTTP cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, "
+                         f"{cache_stats['misses']} misses")
+        
+        pool_stats = self.engines.pool_status()
+        self.logger.info(f"DB pool: {pool_stats['checkouts']} checkouts, {pool_stats['connections_opened']} connections "
+                         f"opened, {pool_stats['wait_seconds']}s total wait (max {pool_stats['max_wait_seconds']}s)")
+        
+        for provider, health in get_provider_health().summary().items():
+            self.logger.info(f"Provider {provider}: circuit {health['state']}, {health['success_rate']:.0%} of "
+                             f"{health['requests']} recent requests ok, p50 {health['p50_seconds']:.3f}s, "
+                             f"p95 {health['p95_seconds']:.3f}s")
+        
+        report = self.metrics.as_dict()
+        for host, stats in report['http'].items():
+            latency = stats['latency_seconds']
+            mean = latency['sum'] / latency['count'] if latency['count'] else 0.0
+            self.logger.info(f"HTTP {host}: {stats['requests']} requests, {stats['retries']} retries, "
+                             f"{stats['errors']} errors, {stats['bytes'] / 1024:.0f} KiB, {mean:.3f}s mean latency")
+        self.logger.info(f"Run {report['run_id']} took {report['duration_seconds']:.1f}s")
         self.logger.info("=" * 60)
+        
+    def _export_metrics(self):
+        if not METRICS_CONFIG['enabled']:
+            return
+        try:
+            paths = self.metrics.export()
+            self.logger.info(f"Run report written to {paths['json']} and {paths['prometheus']}")
+        except OSError as e:
+            self.logger.warning(f"Could not write run report: {e}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Market data ETL orchestrator")
+    parser.add_argument('etl_names', nargs='*', help="ETLs to run (default: all)")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Ignore stored watermarks and reload the full history")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Maximum ETLs running concurrently (1 runs them sequentially)")
+    parser.add_argument('--replay', nargs='?', const='latest', default=None, metavar='YYYY-MM-DD[/RUN]',
+                        help="Re-run transform/load from the local data lake instead of the network")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Stay resident and refresh each ETL on its DAEMON_SCHEDULE cadence")
+    parser.add_argument('--live', action='store_true',
+                        help="Stream Binance trades into 1m/1h candles (LIVE_CONFIG); combine with --daemon to run both")
+    parser.add_argument('--sharded', action='store_true',
+                        help="Split each market's assets into shards on the work queue (QUEUE_CONFIG) and load the merged results")
+    parser.add_argument('--worker', action='store_true',
+                        help="Claim and process shards from the work queue until stopped (optionally only for the named ETLs)")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="Local worker processes started by --sharded or --worker")
+    parser.add_argument('--run-id', default=None,
+                        help="Reuse a sharded run, re-queueing only its failed shards")
+    parser.add_argument('--resume', nargs='?', const='latest', default=None, metavar='RUN_ID',
+                        help="Resume the latest (or given) unfinished run, skipping checkpointed work")
+    parser.add_argument('--rollback', nargs='+', default=None, metavar='TABLE',
+                        help="Swap the most recent retained version of each table back in (BULK_LOAD_CONFIG)")
+    args = parser.parse_args()
+    
+    if args.daemon and (args.full_refresh or args.replay):
+        parser.error("--daemon cannot be combined with --full-refresh or --replay")
+    if args.live and (args.full_refresh or args.replay):
+        parser.error("--live cannot be combined with --full-refresh or --replay")
+    if args.live and args.etl_names and not args.daemon:
+        parser.error("ETL names are only accepted with --live when --daemon is also given")
+    if args.worker and (args.sharded or args.daemon or args.live or args.full_refresh or args.replay):
+        parser.error("--worker takes its options from the queued shards and runs on its own")
+    if args.sharded and (args.daemon or args.live or args.replay):
+        parser.error("--sharded cannot be combined with --daemon, --live or --replay")
+    if args.run_id and not args.sharded:
+        parser.error("--run-id is only used with --sharded")
+    if args.rollback and (args.etl_names or args.daemon or args.live or args.worker or args.sharded
+                          or args.full_refresh or args.replay):
+        parser.error("--rollback runs on its own")
+    if args.resume and (args.etl_names or args.daemon or args.live or args.worker or args.sharded or args.run_id
+                        or args.rollback or args.full_refresh or args.replay):
+        parser.error("--resume takes its ETLs and options from the interrupted run")
+    return args
 
 
 def main():
-    orchestrator = ETLOrchestrator()
+    args = parse_args()
+    orchestrator = ETLOrchestrator(full_refresh=args.full_refresh, max_workers=args.workers,
+                                   replay_date=args.replay, sharded=args.sharded, run_id=args.run_id)
     
-    if len(sys.argv) > 1:
-        etl_names = sys.argv[1:]
-        orchestrator.run_specific(etl_names)
-    else:
-        orchestrator.run_all()
+    try:
+        if args.rollback:
+            orchestrator.rollback(args.rollback)
+        elif args.resume:
+            orchestrator.run_resume(args.resume)
+        elif args.worker:
+            orchestrator.run_workers(args.etl_names, processes=args.processes or 1)
+        elif args.sharded:
+            orchestrator.run_sharded(args.etl_names, processes=args.processes)
+        elif args.daemon:
+            orchestrator.run_daemon(args.etl_names, live=args.live)
+        elif args.live:
+            orchestrator.run_live()
+        elif args.etl_names:
+            orchestrator.run_specific(args.etl_names)
+        else:
+            orchestrator.run_all()
+    finally:
+        orchestrator.engines.dispose()
 
 
 if __name__ == "__main__":
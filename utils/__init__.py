@@ -1,2 +1,52 @@
-from .logger import ETLLogger
-from .helpers import create_robust_session, normalize_ticker, safe_api_call
+import importlib
+
+
+_EXPORTS = {
+    'ETLLogger': 'logger',
+    'create_robust_session': 'helpers',
+    'fetch_content': 'helpers',
+    'get_session': 'helpers',
+    'normalize_ticker': 'helpers',
+    'safe_api_call': 'helpers',
+    'BulkWriter': 'bulk_writer',
+    'DAGScheduler': 'scheduler',
+    'TokenBucket': 'rate_limiter',
+    'get_rate_limiter': 'rate_limiter',
+    'HTTPCache': 'http_cache',
+    'get_http_cache': 'http_cache',
+    'DataLake': 'data_lake',
+    'RunMetrics': 'metrics',
+    'get_run_metrics': 'metrics',
+    'Cadence': 'daemon',
+    'RefreshDaemon': 'daemon',
+    'BloomFilter': 'seen_index',
+    'SeenIndex': 'seen_index',
+    'get_seen_index': 'seen_index',
+    'CandleAggregator': 'ticks',
+    'TickRingBuffer': 'ticks',
+    'CircuitBreaker': 'provider_health',
+    'ProviderHealth': 'provider_health',
+    'get_provider_health': 'provider_health',
+    'reset_provider_health': 'provider_health',
+    'WorkQueue': 'work_queue',
+    'get_work_queue': 'work_queue',
+    'CheckpointStore': 'checkpoints',
+    'get_checkpoint_store': 'checkpoints',
+    'ChangeLog': 'change_log',
+    'get_change_log': 'change_log',
+    'reset_change_log': 'change_log'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
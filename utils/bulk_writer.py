@@ -0,0 +1,259 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.types import BigInteger, Boolean, DateTime, Float, Unicode
+from config.settings import BULK_LOAD_CONFIG
+from utils.metrics import get_run_metrics
+
+
+class BulkWriter:
+    
+    def __init__(self, engine: Engine, logger, chunk_size: int = None):
+        self.engine = engine
+        self.logger = logger
+        self.chunk_size = chunk_size or BULK_LOAD_CONFIG['chunk_size']
+        self.quote = engine.dialect.identifier_preparer.quote
+        
+    def write(self, df: pd.DataFrame, table_name: str, if_exists: str = 'replace',
+              key_columns: List[str] = None) -> Dict[str, float]:
+        start = time.perf_counter()
+        df = self._widen(df)
+        df.to_sql(table_name, con=self.engine, if_exists=if_exists, index=False,
+                  chunksize=self.chunk_size, dtype=self.sql_types(df, key_columns))
+        return self._report(table_name, len(df), start)
+    
+    def replace(self, df: pd.DataFrame, table_name: str, index_columns: List[str] = None) -> Dict[str, float]:
+        if not BULK_LOAD_CONFIG['shadow_swap']:
+            return self.write(df, table_name, if_exists='replace', key_columns=index_columns)
+        
+        start = time.perf_counter()
+        df = self._widen(df)
+        shadow = self.begin_shadow(table_name)
+        df.to_sql(shadow, con=self.engine, index=False, chunksize=self.chunk_size,
+                  dtype=self.sql_types(df, index_columns))
+        self.swap(table_name, len(df), index_columns)
+        return self._report(table_name, len(df), start)
+    
+    def begin_shadow(self, table_name: str) -> str:
+        shadow = self.shadow_name(table_name)
+        if inspect(self.engine).has_table(shadow):
+            with self.engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE {self.quote(shadow)}"))
+        return shadow
+    
+    def swap(self, table_name: str, expected_rows: int, index_columns: List[str] = None) -> bool:
+        shadow = self.shadow_name(table_name)
+        if not inspect(self.engine).has_table(shadow):
+            self.logger.warning(f"No shadow table for {table_name}, keeping the live table")
+            return False
+        
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT COUNT(*) FROM {self.quote(shadow)}")).scalar()
+        if rows != expected_rows:
+            raise ValueError(f"{shadow} holds {rows} rows but {expected_rows} were loaded, "
+                             f"keeping the live {table_name}")
+        
+        if index_columns:
+            columns = '_'.join(c.lower() for c in index_columns)
+            self.ensure_index(shadow, index_columns,
+                              index_name=f"ix_{table_name}_{columns}_{pd.Timestamp.now():%Y%m%d%H%M%S%f}")
+        
+        version = self._next_version(table_name)
+        
+        if self._swap_tables(table_name, incoming=shadow, outgoing=version):
+            self.logger.info(f"Swapped {rows} rows into {table_name}, previous version kept as {version}")
+            self._prune_versions(table_name)
+        else:
+            self.logger.info(f"Swapped {rows} rows into new table {table_name}")
+        return True
+    
+    def rollback(self, table_name: str) -> str:
+        versions = self.versions(table_name)
+        if not versions:
+            raise ValueError(f"No retained versions of {table_name} to roll back to")
+        
+        shadow = self.begin_shadow(table_name)
+        self._swap_tables(table_name, incoming=versions[0], outgoing=shadow)
+        self.logger.info(f"Rolled {table_name} back to {versions[0]}, replaced version kept as {shadow}")
+        return versions[0]
+    
+    def versions(self, table_name: str) -> List[str]:
+        prefix = f"{table_name}{BULK_LOAD_CONFIG['version_separator']}"
+        names = inspect(self.engine).get_table_names()
+        return sorted((name for name in names if name.startswith(prefix)), reverse=True)
+    
+    def shadow_name(self, table_name: str) -> str:
+        return f"{BULK_LOAD_CONFIG['shadow_prefix']}{table_name}"
+    
+    def upsert(self, df: pd.DataFrame, table_name: str, key_columns: List[str]) -> Dict[str, float]:
+        start = time.perf_counter()
+        df = self._widen(df)
+        staging = f"{BULK_LOAD_CONFIG['staging_prefix']}{table_name}"
+        
+        with self.engine.begin() as conn:
+            if not inspect(conn).has_table(table_name):
+                df.head(0).to_sql(table_name, con=conn, index=False, dtype=self.sql_types(df, key_columns))
+                
+            df.to_sql(staging, con=conn, if_exists='replace', index=False,
+                      chunksize=self.chunk_size, dtype=self.sql_types(df, staging=True))
+            keys = ', '.join(self.quote(c) for c in key_columns)
+            conn.execute(text(f"CREATE INDEX {self.quote('ix_' + staging)} ON {self.quote(staging)} ({keys})"))
+            self._merge(conn, staging, table_name, list(df.columns), key_columns)
+            conn.execute(text(f"DROP TABLE {self.quote(staging)}"))
+            
+        return self._report(table_name, len(df), start)
+    
+    def drop_table(self, table_name: str):
+        if inspect(self.engine).has_table(table_name):
+            with self.engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE {self.quote(table_name)}"))
+            self.logger.info(f"Dropped {table_name} for full reload")
+    
+    def ensure_index(self, table_name: str, columns: List[str], clustered: bool = False, index_name: str = None):
+        index_name = index_name or f"ix_{table_name}_{'_'.join(c.lower() for c in columns)}"
+        existing = inspect(self.engine).get_indexes(table_name)
+        if any(index['name'] == index_name or index['column_names'] == list(columns) for index in existing):
+            return
+        
+        kind = 'CLUSTERED ' if clustered and self.engine.dialect.name == 'mssql' else ''
+        column_list = ', '.join(self.quote(c) for c in columns)
+        with self.engine.begin() as conn:
+            conn.execute(text(f"CREATE {kind}INDEX {self.quote(index_name)} ON {self.quote(table_name)} ({column_list})"))
+        self.logger.info(f"Created index {index_name} on {table_name}")
+        
+    def _swap_tables(self, table_name: str, incoming: str, outgoing: str) -> bool:
+        exists = inspect(self.engine).has_table(table_name)
+        retries = BULK_LOAD_CONFIG['swap_retries']
+        
+        for attempt in range(1, retries + 1):
+            try:
+                with self.engine.connect() as conn, self._swap_session(conn):
+                    with conn.begin():
+                        if self.engine.dialect.name == 'sqlite':
+                            conn.exec_driver_sql("BEGIN IMMEDIATE")
+                        if exists:
+                            self._rename(conn, table_name, outgoing)
+                        self._rename(conn, incoming, table_name)
+                return exists
+            except DBAPIError as e:
+                if attempt == retries:
+                    raise
+                self.logger.warning(f"Swap of {table_name} waited too long for readers "
+                                    f"(attempt {attempt}/{retries}): {e}")
+                time.sleep(attempt)
+    
+    @contextmanager
+    def _swap_session(self, conn: Connection) -> Iterator[None]:
+        dialect = self.engine.dialect.name
+        timeout = BULK_LOAD_CONFIG['swap_lock_timeout_ms']
+        if dialect == 'mssql':
+            conn.exec_driver_sql(f"SET LOCK_TIMEOUT {int(timeout)}")
+        elif dialect == 'postgresql':
+            conn.exec_driver_sql(f"SET lock_timeout = {int(timeout)}")
+        elif dialect == 'sqlite':
+            conn.exec_driver_sql("PRAGMA legacy_alter_table = ON")
+        conn.commit()
+        
+        try:
+            yield
+        finally:
+            if dialect == 'mssql':
+                conn.exec_driver_sql("SET LOCK_TIMEOUT -1")
+            elif dialect == 'postgresql':
+                conn.exec_driver_sql("RESET lock_timeout")
+            elif dialect == 'sqlite':
+                conn.exec_driver_sql("PRAGMA legacy_alter_table = OFF")
+            conn.commit()
+    
+    def _rename(self, conn: Connection, old: str, new: str):
+        if self.engine.dialect.name == 'mssql':
+            conn.execute(text("EXEC sp_rename :old, :new"), {'old': old, 'new': new})
+        else:
+            conn.execute(text(f"ALTER TABLE {self.quote(old)} RENAME TO {self.quote(new)}"))
+    
+    def _next_version(self, table_name: str) -> str:
+        stamp = pd.Timestamp.now().strftime('%Y%m%d%H%M%S')
+        version = f"{table_name}{BULK_LOAD_CONFIG['version_separator']}{stamp}"
+        existing = set(self.versions(table_name))
+        counter = 1
+        while version in existing:
+            version = f"{table_name}{BULK_LOAD_CONFIG['version_separator']}{stamp}_{counter}"
+            counter += 1
+        return version
+    
+    def _prune_versions(self, table_name: str):
+        for version in self.versions(table_name)[BULK_LOAD_CONFIG['retain_versions']:]:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"DROP TABLE {self.quote(version)}"))
+            self.logger.info(f"Dropped retired version {version}")
+    
+    def _merge(self, conn: Connection, staging: str, table_name: str,
+               columns: List[str], key_columns: List[str]):
+        target, source = self.quote(table_name), self.quote(staging)
+        column_list = ', '.join(self.quote(c) for c in columns)
+        match = ' AND '.join(f"t.{self.quote(c)} = s.{self.quote(c)}" for c in key_columns)
+        
+        if self.engine.dialect.name == 'mssql':
+            updates = ', '.join(f"t.{self.quote(c)} = s.{self.quote(c)}" for c in columns if c not in key_columns)
+            values = ', '.join(f"s.{self.quote(c)}" for c in columns)
+            conn.execute(text(
+                f"MERGE {target} WITH (HOLDLOCK) AS t USING {source} AS s ON {match} "
+                f"WHEN MATCHED THEN UPDATE SET {updates} "
+                f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({values});"
+            ))
+            return
+        
+        match = ' AND '.join(f"{target}.{self.quote(c)} = s.{self.quote(c)}" for c in key_columns)
+        conn.execute(text(f"DELETE FROM {target} WHERE EXISTS (SELECT 1 FROM {source} AS s WHERE {match})"))
+        conn.execute(text(f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {source}"))
+        
+    def sql_types(self, df: pd.DataFrame, key_columns: List[str] = None, staging: bool = False) -> Dict[str, object]:
+        key_columns = key_columns or []
+        dtypes = {}
+        for column, dtype in df.dtypes.items():
+            if pd.api.types.is_bool_dtype(dtype):
+                dtypes[column] = Boolean()
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                dtypes[column] = DateTime()
+            elif pd.api.types.is_integer_dtype(dtype):
+                dtypes[column] = BigInteger()
+            elif pd.api.types.is_float_dtype(dtype):
+                dtypes[column] = Float(precision=53)
+            elif staging:
+                dtypes[column] = Unicode(self._string_length(df[column]))
+            elif column in key_columns:
+                dtypes[column] = Unicode(self._string_length(df[column], BULK_LOAD_CONFIG['key_string_length']))
+            else:
+                dtypes[column] = Unicode()
+        return dtypes
+    
+    def _widen(self, df: pd.DataFrame) -> pd.DataFrame:
+        narrow = [column for column, dtype in df.dtypes.items() if dtype == 'float32']
+        if not narrow:
+            return df
+        df = df.copy(deep=False)
+        for column in narrow:
+            df[column] = df[column].to_numpy().astype(str).astype('float64')
+        return df
+    
+    def _string_length(self, series: pd.Series, minimum: int = 64) -> Optional[int]:
+        longest = series.dropna().astype(str).str.len().max()
+        if pd.isna(longest):
+            longest = 0
+        if longest > BULK_LOAD_CONFIG['max_string_length']:
+            return None
+        length = minimum
+        while length < longest:
+            length *= 2
+        return min(length, BULK_LOAD_CONFIG['max_string_length'])
+    
+    def _report(self, table_name: str, rows: int, start: float) -> Dict[str, float]:
+        seconds = time.perf_counter() - start
+        rows_per_sec = rows / seconds if seconds > 0 else float(rows)
+        get_run_metrics().record_db_write(table_name, rows, seconds)
+        self.logger.info(f"Wrote {rows} rows to {table_name} in {seconds:.2f}s ({rows_per_sec:,.0f} rows/s)")
+        return {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows_per_sec}
@@ -0,0 +1,109 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+import pandas as pd
+from config.settings import CHANGE_LOG_CONFIG
+
+
+class ChangeLog:
+    
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else Path(__file__).parent.parent / CHANGE_LOG_CONFIG['path']
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=CHANGE_LOG_CONFIG['busy_timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA journal_mode={CHANGE_LOG_CONFIG['journal_mode']}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                asset TEXT NOT NULL,
+                since TEXT NOT NULL,
+                recorded REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_changes_source_seq ON changes (source, seq)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cursors (
+                consumer TEXT NOT NULL,
+                source TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (consumer, source)
+            )
+        """)
+        self._prune()
+        
+    def record(self, source: str, changes: Dict[str, pd.Timestamp]):
+        now = time.time()
+        rows = [(source, str(asset), pd.Timestamp(since).isoformat(), now)
+                for asset, since in changes.items() if not pd.isna(since)]
+        with self._transaction() as conn:
+            conn.executemany("INSERT INTO changes (source, asset, since, recorded) VALUES (?, ?, ?, ?)", rows)
+    
+    def pending(self, consumer: str, source: str) -> Tuple[Dict[str, pd.Timestamp], int]:
+        with self._lock:
+            row = self._conn.execute("SELECT seq FROM cursors WHERE consumer = ? AND source = ?",
+                                     (consumer, source)).fetchone()
+            cursor = row[0] if row else 0
+            rows = self._conn.execute("""
+                SELECT asset, MIN(since), MAX(seq) FROM changes
+                WHERE source = ? AND seq > ? GROUP BY asset
+            """, (source, cursor)).fetchall()
+        changes = {asset: pd.Timestamp(since) for asset, since, _ in rows}
+        return changes, max((seq for _, _, seq in rows), default=cursor)
+    
+    def acknowledge(self, consumer: str, positions: Dict[str, int]):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany("""
+                INSERT INTO cursors (consumer, source, seq, updated) VALUES (?, ?, ?, ?)
+                ON CONFLICT (consumer, source) DO UPDATE SET
+                    seq = MAX(cursors.seq, excluded.seq),
+                    updated = excluded.updated
+            """, [(consumer, source, seq, now) for source, seq in positions.items()])
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def _prune(self):
+        cutoff = time.time() - CHANGE_LOG_CONFIG['retention_days'] * 86400
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM changes WHERE recorded < ?", (cutoff,))
+
+
+_log: ChangeLog = None
+_log_lock = threading.Lock()
+
+
+def get_change_log() -> ChangeLog:
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = ChangeLog()
+        return _log
+
+
+def reset_change_log(path: Path = None) -> ChangeLog:
+    global _log
+    with _log_lock:
+        if _log is not None:
+            _log.close()
+        _log = ChangeLog(path) if path else None
+        return _log
@@ -0,0 +1,167 @@
+import io
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from config.settings import CHECKPOINT_CONFIG
+
+
+class CheckpointStore:
+    
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else Path(__file__).parent.parent / CHECKPOINT_CONFIG['path']
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=CHECKPOINT_CONFIG['busy_timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA journal_mode={CHECKPOINT_CONFIG['journal_mode']}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT NOT NULL,
+                etl TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                options TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (run_id, etl)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS units (
+                run_id TEXT NOT NULL,
+                etl TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                rows INTEGER,
+                payload BLOB,
+                updated REAL NOT NULL,
+                PRIMARY KEY (run_id, etl, unit)
+            )
+        """)
+        self._prune()
+        
+    def plan(self, run_id: str, etl_names: List[str], options: dict):
+        now = time.time()
+        rows = [(run_id, etl, position, json.dumps(options), now, now) for position, etl in enumerate(etl_names)]
+        with self._transaction() as conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO runs (run_id, etl, position, options, status, created, updated)
+                VALUES (?, ?, ?, ?, 'pending', ?, ?)
+            """, rows)
+    
+    def begin(self, run_id: str, etl: str, resume: bool = False) -> Dict[str, str]:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("""
+                INSERT INTO runs (run_id, etl, position, options, status, created, updated)
+                VALUES (?, ?, 0, '{}', 'running', ?, ?)
+                ON CONFLICT (run_id, etl) DO UPDATE SET status = 'running', error = NULL, updated = excluded.updated
+            """, (run_id, etl, now, now))
+            if not resume:
+                conn.execute("DELETE FROM units WHERE run_id = ? AND etl = ?", (run_id, etl))
+                return {}
+            return dict(conn.execute("SELECT unit, stage FROM units WHERE run_id = ? AND etl = ?", (run_id, etl)))
+        
+    def save(self, run_id: str, etl: str, unit: str, stage: str, frame: pd.DataFrame = None):
+        payload, rows = None, None
+        if frame is not None:
+            rows = len(frame)
+            buffer = io.BytesIO()
+            frame.to_parquet(buffer, index=False)
+            payload = buffer.getvalue()
+            
+        with self._transaction() as conn:
+            conn.execute("""
+                INSERT INTO units (run_id, etl, unit, stage, rows, payload, updated) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, etl, unit) DO UPDATE SET
+                    stage = excluded.stage,
+                    rows = COALESCE(excluded.rows, units.rows),
+                    payload = COALESCE(excluded.payload, units.payload),
+                    updated = excluded.updated
+            """, (run_id, etl, unit, stage, rows, payload, time.time()))
+    
+    def mark(self, run_id: str, etl: str, units: List[str], stage: str):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany("UPDATE units SET stage = ?, updated = ? WHERE run_id = ? AND etl = ? AND unit = ?",
+                             [(stage, now, run_id, etl, unit) for unit in units])
+    
+    def frame(self, run_id: str, etl: str, unit: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM units WHERE run_id = ? AND etl = ? AND unit = ?",
+                                     (run_id, etl, unit)).fetchone()
+        if row is None:
+            return None
+        if row[0] is None:
+            return pd.DataFrame()
+        return pd.read_parquet(io.BytesIO(row[0]))
+    
+    def finish(self, run_id: str, etl: str, status: str, error: str = None):
+        with self._transaction() as conn:
+            conn.execute("UPDATE runs SET status = ?, error = ?, updated = ? WHERE run_id = ? AND etl = ?",
+                         (status, error, time.time(), run_id, etl))
+            if status == 'done':
+                conn.execute("DELETE FROM units WHERE run_id = ? AND etl = ?", (run_id, etl))
+    
+    def resumable(self, run_id: str = None) -> Tuple[Optional[str], Dict[str, dict]]:
+        with self._lock:
+            if run_id is None:
+                row = self._conn.execute("""
+                    SELECT run_id FROM runs GROUP BY run_id
+                    HAVING SUM(status != 'done') > 0 ORDER BY MAX(updated) DESC LIMIT 1
+                """).fetchone()
+                if row is None:
+                    return None, {}
+                run_id = row[0]
+            rows = self._conn.execute(
+                "SELECT etl, options FROM runs WHERE run_id = ? AND status != 'done' ORDER BY position",
+                (run_id,)).fetchall()
+        return run_id, {etl: json.loads(options) for etl, options in rows}
+    
+    def summary(self, run_id: str) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT etl, stage, COUNT(*) FROM units WHERE run_id = ? GROUP BY etl, stage", (run_id,)).fetchall()
+        summary: Dict[str, Dict[str, int]] = {}
+        for etl, stage, count in rows:
+            summary.setdefault(etl, {})[stage] = count
+        return summary
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def _prune(self):
+        cutoff = time.time() - CHECKPOINT_CONFIG['retention_days'] * 86400
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM units WHERE updated < ?", (cutoff,))
+            conn.execute("DELETE FROM runs WHERE updated < ?", (cutoff,))
+
+
+_store: CheckpointStore = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+        return _store
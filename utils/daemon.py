@@ -0,0 +1,178 @@
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+from config.settings import DAEMON_CONFIG, SCHEDULER_CONFIG
+
+
+class Cadence:
+    
+    def __init__(self, interval: int = None, daily_at: str = None, timezone: str = 'UTC',
+                 weekdays: List[int] = None, after: List[str] = None, min_interval: int = 0):
+        if not (interval or daily_at or after):
+            raise ValueError("A cadence needs an interval, a daily_at time or an 'after' trigger")
+        self.interval = interval
+        self.daily_at = datetime.strptime(daily_at, '%H:%M').time() if daily_at else None
+        self.timezone = ZoneInfo(timezone)
+        self.weekdays = set(weekdays if weekdays is not None else range(7))
+        self.after = list(after or [])
+        self.min_interval = min_interval
+        
+    def next_run(self, now: float) -> Optional[float]:
+        if self.interval:
+            return now + self.interval
+        if self.daily_at is None:
+            return None
+        
+        local = datetime.fromtimestamp(now, self.timezone)
+        candidate = datetime.combine(local.date(), self.daily_at, tzinfo=self.timezone)
+        if candidate <= local:
+            candidate += timedelta(days=1)
+        while candidate.weekday() not in self.weekdays:
+            candidate += timedelta(days=1)
+        return candidate.timestamp()
+    
+    def describe(self) -> str:
+        if self.interval:
+            return f"every {self.interval}s"
+        if self.daily_at:
+            return f"daily at {self.daily_at:%H:%M} {self.timezone.key}"
+        if self.min_interval:
+            return f"after {', '.join(self.after)} (at most every {self.min_interval}s)"
+        return f"after {', '.join(self.after)}"
+
+
+class RefreshDaemon:
+    
+    def __init__(self, logger, max_workers: int = None,
+                 on_complete: Callable[[str, str, float], None] = None):
+        self.logger = logger
+        self.max_workers = max_workers or SCHEDULER_CONFIG['max_workers']
+        self.on_complete = on_complete
+        self.jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        
+    def add_job(self, name: str, func: Callable[[], None], cadence: Cadence):
+        now = time.time()
+        run_now = DAEMON_CONFIG['run_on_start'] and not cadence.after
+        self.jobs[name] = {
+            'func': func,
+            'cadence': cadence,
+            'next_run': now if run_now else cadence.next_run(now),
+            'running': False,
+            'rerun': False,
+            'last_start': None,
+            'runs': 0,
+            'skipped': 0
+        }
+        
+    def run_forever(self):
+        self._install_signal_handlers()
+        for name, job in self.jobs.items():
+            self.logger.info(f"Scheduled {name} {job['cadence'].describe()}")
+            
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="daemon")
+        futures = set()
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                now = time.time()
+                for name, job in self.jobs.items():
+                    if job['next_run'] is not None and job['next_run'] <= now:
+                        job['next_run'] = job['cadence'].next_run(now)
+                        future = self._submit(executor, name)
+                        if future is not None:
+                            futures.add(future)
+                
+                futures = {future for future in futures if not future.done()}
+                self._wake.wait(self._sleep_time())
+        finally:
+            self.logger.info(f"Shutting down, waiting for {len(futures)} running job(s)")
+            _, still_running = wait(futures, timeout=DAEMON_CONFIG['shutdown_timeout'])
+            if still_running:
+                self.logger.warning(f"{len(still_running)} job(s) still running after "
+                                    f"{DAEMON_CONFIG['shutdown_timeout']}s, abandoning them")
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        
+    def _submit(self, executor: ThreadPoolExecutor, name: str):
+        job = self.jobs[name]
+        with self._lock:
+            if job['running']:
+                job['skipped'] += 1
+                self.logger.warning(f"{name} is still running, skipping this run ({job['skipped']} skipped so far)")
+                return None
+            job['running'] = True
+        return executor.submit(self._run_job, name)
+    
+    def _run_job(self, name: str):
+        job = self.jobs[name]
+        job['last_start'] = time.time()
+        start = time.monotonic()
+        try:
+            job['func']()
+            status = "SUCCESS"
+        except Exception as e:
+            status = f"FAILED: {str(e)}"
+            self.logger.error(f"{name} failed: {str(e)}")
+        finally:
+            with self._lock:
+                job['running'] = False
+                job['runs'] += 1
+                if job['rerun']:
+                    job['rerun'] = False
+                    job['next_run'] = self._triggered_run(job)
+                    self._wake.set()
+        
+        seconds = time.monotonic() - start
+        self.logger.info(f"{name} finished in {seconds:.1f}s: {status}")
+        if self.on_complete:
+            self.on_complete(name, status, seconds)
+        if status == "SUCCESS":
+            self._trigger_dependents(name)
+    
+    def _trigger_dependents(self, name: str):
+        if self._stop.is_set():
+            return
+        with self._lock:
+            for dependent, job in self.jobs.items():
+                if name not in job['cadence'].after:
+                    continue
+                if job['running']:
+                    job['rerun'] = True
+                else:
+                    job['next_run'] = self._triggered_run(job)
+                    self._wake.set()
+    
+    def _triggered_run(self, job: dict) -> float:
+        now = time.time()
+        if job['last_start'] is None:
+            return now
+        return max(now, job['last_start'] + job['cadence'].min_interval)
+    
+    def _sleep_time(self) -> float:
+        due = [job['next_run'] for job in self.jobs.values() if job['next_run'] is not None]
+        if not due:
+            return DAEMON_CONFIG['max_sleep']
+        return min(max(0.0, min(due) - time.time()), DAEMON_CONFIG['max_sleep'])
+    
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        
+        def handle(signum, frame):
+            self.logger.info(f"Received {signal.Signals(signum).name}, stopping after running jobs finish")
+            signal.signal(signum, signal.SIG_DFL)
+            self.stop()
+            
+        signal.signal(signal.SIGINT, handle)
+        if hasattr(signal, 'SIGTERM'):
+            signal.signal(signal.SIGTERM, handle)
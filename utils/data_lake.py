@@ -0,0 +1,81 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from config.settings import LAKE_CONFIG
+
+
+class DataLake:
+    
+    def __init__(self, root: Path = None):
+        self.root = root or Path(__file__).parent.parent / LAKE_CONFIG['directory']
+        self._filesystem = None
+        
+    @property
+    def filesystem(self):
+        if self._filesystem is None:
+            from pyarrow import fs
+            self._filesystem = fs.LocalFileSystem(use_mmap=True)
+        return self._filesystem
+        
+    def write(self, source: str, df: pd.DataFrame, ingest_date: str, ingest_run: str):
+        if df is None or df.empty:
+            return
+        
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        table = pa.Table.from_pandas(df.assign(ingest_date=ingest_date, ingest_run=ingest_run), preserve_index=False)
+        ds.write_dataset(
+            table,
+            str(self.root / source),
+            format='parquet',
+            partitioning=self._partitioning(source),
+            existing_data_behavior='delete_matching',
+            basename_template='part-{i}.parquet',
+            filesystem=self.filesystem
+        )
+        
+    def read(self, source: str, ingest_date: str = None, columns: List[str] = None,
+             filters: Dict[str, Iterable] = None, ingest_run: str = None) -> pd.DataFrame:
+        if not (self.root / source).exists():
+            return pd.DataFrame(columns=columns)
+        
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(str(self.root / source), format='parquet',
+                             partitioning=self._partitioning(source), filesystem=self.filesystem)
+        expression = None
+        if ingest_date is not None:
+            expression = ds.field('ingest_date') == ingest_date
+        if ingest_run is not None:
+            condition = ds.field('ingest_run') == ingest_run
+            expression = condition if expression is None else expression & condition
+        for column, values in (filters or {}).items():
+            condition = ds.field(column).isin(list(values))
+            expression = condition if expression is None else expression & condition
+            
+        partition_column = LAKE_CONFIG['sources'].get(source)
+        read_columns = columns
+        if columns is not None:
+            read_columns = list(dict.fromkeys(columns + [c for c in (partition_column, 'ingest_run') if c]))
+        df = dataset.to_table(columns=read_columns, filter=expression).to_pandas()
+        
+        if ingest_run is None and not df.empty:
+            runs = df['ingest_run'].astype('string').fillna('')
+            latest = runs.groupby(df[partition_column]).transform('max') if partition_column else runs.max()
+            df = df[runs == latest].reset_index(drop=True)
+        df = df.drop(columns=['ingest_date', 'ingest_run'], errors='ignore')
+        return df[columns] if columns is not None else df
+    
+    def latest_ingest_date(self, source: str) -> Optional[str]:
+        source_dir = self.root / source
+        if not source_dir.exists():
+            return None
+        dates = {path.name.split('=', 1)[1] for path in source_dir.rglob('ingest_date=*') if path.is_dir()}
+        return max(dates) if dates else None
+    
+    def _partitioning(self, source: str):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        partition_column = LAKE_CONFIG['sources'].get(source)
+        fields = [(partition_column, pa.string())] if partition_column else []
+        fields += [('ingest_date', pa.string()), ('ingest_run', pa.string())]
+        return ds.partitioning(pa.schema(fields), flavor='hive')
@@ -1,24 +1,49 @@
+import json
+import threading
 import requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from typing import Dict, Any
-from config.settings import RETRY_CONFIG
+from typing import Dict, Any, Optional
+from config.settings import CACHE_CONFIG, METRICS_CONFIG, RETRY_CONFIG
+from utils.http_cache import get_http_cache
+from utils.metrics import get_run_metrics, observe_response
+from utils.rate_limiter import TokenBucket
 
 
-def create_robust_session() -> requests.Session:
+_sessions: Dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def create_robust_session(retry_rate_limited: bool = True) -> requests.Session:
     session = requests.Session()
+    status_forcelist = RETRY_CONFIG['status_forcelist']
+    if not retry_rate_limited:
+        status_forcelist = [status for status in status_forcelist if status != 429]
+        
     retry = Retry(
         total=RETRY_CONFIG['max_retries'],
         backoff_factor=RETRY_CONFIG['backoff_factor'],
-        status_forcelist=RETRY_CONFIG['status_forcelist'],
+        status_forcelist=status_forcelist,
         allowed_methods=["HEAD", "GET", "OPTIONS"]
     )
     adapter = HTTPAdapter(max_retries=retry)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
+    if METRICS_CONFIG['enabled']:
+        session.hooks['response'].append(observe_response)
     return session
 
 
+def get_session(owner: str, retry_rate_limited: bool = True) -> requests.Session:
+    key = (owner, retry_rate_limited)
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = create_robust_session(retry_rate_limited)
+        return _sessions[key]
+
+
 def normalize_ticker(ticker: str, remove_suffix: str = None) -> str:
     if remove_suffix:
         return ticker.replace(remove_suffix, '')
@@ -26,10 +51,68 @@ def normalize_ticker(ticker: str, remove_suffix: str = None) -> str:
 
 
 def safe_api_call(session: requests.Session, url: str, params: Dict[str, Any] = None, 
-                  headers: Dict[str, str] = None, timeout: int = None) -> Dict[str, Any]:
+                  headers: Dict[str, str] = None, timeout: int = None,
+                  rate_limiter: TokenBucket = None, source: str = None) -> Dict[str, Any]:
+    return json.loads(fetch_content(session, url, params=params, headers=headers, timeout=timeout,
+                                    rate_limiter=rate_limiter, source=source))
+
+
+def fetch_content(session: requests.Session, url: str, params: Dict[str, Any] = None,
+                  headers: Dict[str, str] = None, timeout: int = None,
+                  rate_limiter: TokenBucket = None, source: str = None) -> bytes:
     timeout = timeout or RETRY_CONFIG['timeout']
     headers = headers or {'User-Agent': 'Mozilla/5.0'}
     
-    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    def send(extra_headers: Dict[str, str]) -> requests.Response:
+        return _send_request(session, url, params, {**headers, **extra_headers}, timeout, rate_limiter)
+    
+    ttl = CACHE_CONFIG['ttl'].get(source) if CACHE_CONFIG['enabled'] else None
+    if ttl:
+        return get_http_cache().fetch(url, params, ttl, send)
+    return send({}).content
+
+
+def _send_request(session: requests.Session, url: str, params: Dict[str, Any], headers: Dict[str, str],
+                  timeout: int, rate_limiter: TokenBucket = None) -> requests.Response:
+    if rate_limiter is None:
+        response = _get(session, url, params, headers, timeout)
+        response.raise_for_status()
+        return response
+    
+    for attempt in range(RETRY_CONFIG['max_retries'] + 1):
+        rate_limiter.acquire()
+        response = _get(session, url, params, headers, timeout)
+        if response.status_code != 429:
+            break
+        rate_limiter.penalize(parse_retry_after(response.headers.get('Retry-After')))
+        if attempt < RETRY_CONFIG['max_retries']:
+            get_run_metrics().record_retry(url)
+        
     response.raise_for_status()
-    return response.json()
+    rate_limiter.reward()
+    return response
+
+
+def _get(session: requests.Session, url: str, params: Dict[str, Any], headers: Dict[str, str],
+         timeout: int) -> requests.Response:
+    try:
+        return session.get(url, params=params, headers=headers, timeout=timeout)
+    except requests.RequestException:
+        get_run_metrics().record_error(url)
+        raise
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+import requests
+from config.settings import CACHE_CONFIG
+
+
+class HTTPCache:
+    
+    def __init__(self, directory: Path = None, max_size_mb: int = None):
+        self.directory = directory or Path(__file__).parent.parent / CACHE_CONFIG['directory']
+        self.max_bytes = (max_size_mb or CACHE_CONFIG['max_size_mb']) * 1024 * 1024
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._size = None
+        self._lock = threading.Lock()
+        
+    def fetch(self, url: str, params: Dict[str, Any], ttl: int,
+              send: Callable[[Dict[str, str]], requests.Response]) -> bytes:
+        key = self._key(url, params)
+        meta = self._read_meta(key)
+        body_path = self.directory / f"{key}.body"
+        
+        if meta and body_path.exists():
+            if time.time() - meta['fetched_at'] < ttl:
+                self._touch(key)
+                self._count('hits')
+                return body_path.read_bytes()
+            
+            response = send(self._conditional_headers(meta))
+            if response.status_code == 304:
+                meta['fetched_at'] = time.time()
+                self._write(self.directory / f"{key}.json", json.dumps(meta).encode())
+                self._count('revalidated')
+                return body_path.read_bytes()
+        else:
+            response = send({})
+            
+        self._count('misses')
+        self._store(key, url, response)
+        return response.content
+    
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+    
+    def _key(self, url: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _conditional_headers(self, meta: dict) -> Dict[str, str]:
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+    
+    def _read_meta(self, key: str) -> dict:
+        try:
+            return json.loads((self.directory / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        
+    def _store(self, key: str, url: str, response: requests.Response):
+        meta = {
+            'url': url,
+            'fetched_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        body_path = self.directory / f"{key}.body"
+        self._write(self.directory / f"{key}.json", json.dumps(meta).encode())
+        
+        with self._lock:
+            replaced = self._file_size(body_path)
+            self._write(body_path, response.content)
+            if self._size is None:
+                self._size = sum(self._file_size(path) for path in self.directory.glob('*.body'))
+            else:
+                self._size += len(response.content) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+                
+    def _evict(self):
+        bodies = sorted(self.directory.glob('*.body'), key=self._last_used)
+        target = self.max_bytes * 0.9
+        
+        for body_path in bodies:
+            if self._size <= target:
+                break
+            try:
+                self._size -= body_path.stat().st_size
+                body_path.unlink()
+                body_path.with_suffix('.json').unlink(missing_ok=True)
+            except OSError:
+                continue
+            
+    def _file_size(self, path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+            
+    def _last_used(self, body_path: Path) -> float:
+        try:
+            return body_path.with_suffix('.json').stat().st_mtime
+        except OSError:
+            return 0.0
+        
+    def _touch(self, key: str):
+        try:
+            os.utime(self.directory / f"{key}.json")
+        except OSError:
+            pass
+        
+    def _write(self, path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+_cache: HTTPCache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache()
+        return _cache
@@ -0,0 +1,65 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window, axis=0).mean(axis=-1)
+    return out
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window, axis=0).std(axis=-1, ddof=1)
+    return out
+
+
+def smooth(values: np.ndarray, alpha: float) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    current = np.full(values.shape[1:], np.nan)
+    for t, row in enumerate(values):
+        blended = alpha * row + (1 - alpha) * current
+        current = np.where(np.isnan(current), row, np.where(np.isnan(row), current, blended))
+        out[t] = current
+    return out
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    return smooth(values, 2 / (span + 1))
+
+
+def log_returns(values: np.ndarray) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = np.log(values[1:] / values[:-1])
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def rsi(values: np.ndarray, window: int) -> np.ndarray:
+    delta = np.full(values.shape, np.nan)
+    delta[1:] = values[1:] - values[:-1]
+    average_gain = smooth(np.where(np.isnan(delta), np.nan, np.clip(delta, 0, None)), 1 / window)
+    average_loss = smooth(np.where(np.isnan(delta), np.nan, np.clip(-delta, 0, None)), 1 / window)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = 100 - 100 / (1 + average_gain / average_loss)
+    out = np.where((average_loss == 0) & (average_gain > 0), 100.0, out)
+    out[np.cumsum(~np.isnan(delta), axis=0) < window] = np.nan
+    return out
+
+
+def drawdown(values: np.ndarray, initial_peaks: np.ndarray = None):
+    filled = np.where(np.isnan(values), -np.inf, values)
+    if initial_peaks is not None:
+        start = np.where(np.isnan(initial_peaks), -np.inf, initial_peaks)
+        filled = np.vstack([start, filled])
+    peaks = np.maximum.accumulate(filled, axis=0)
+    if initial_peaks is not None:
+        peaks = peaks[1:]
+    peaks = np.where(np.isinf(peaks), np.nan, peaks)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return peaks, values / peaks - 1
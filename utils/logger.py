@@ -1,47 +1,146 @@
+import atexit
+import copy
+import gzip
+import itertools
+import json
 import logging
+import os
+import queue
+import shutil
 import sys
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from config.settings import LOGGING_CONFIG
+from utils.metrics import get_run_metrics
+
+
+class JsonFormatter(logging.Formatter):
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'etl': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _compress(source: str, dest: str):
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _file_handler() -> logging.Handler:
+    log_dir = Path(__file__).parent.parent / LOGGING_CONFIG['directory']
+    log_dir.mkdir(parents=True, exist_ok=True)
+    
+    handler = TimedRotatingFileHandler(log_dir / LOGGING_CONFIG['file'], when=LOGGING_CONFIG['rotate_when'],
+                                       backupCount=LOGGING_CONFIG['backup_count'], encoding='utf-8', delay=True)
+    if LOGGING_CONFIG['compress']:
+        handler.namer = lambda name: f"{name}.gz"
+        handler.rotator = _compress
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(lambda record: getattr(record, 'to_file', True))
+    return handler
+
+
+_handler: QueueHandler = None
+_listener: QueueListener = None
+_handler_lock = threading.Lock()
+
+
+def get_log_handler() -> QueueHandler:
+    global _handler, _listener
+    with _handler_lock:
+        if _handler is None:
+            console = logging.StreamHandler(sys.stdout)
+            console.setFormatter(logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            ))
+            log_queue = queue.SimpleQueue()
+            _listener = QueueListener(log_queue, console, _file_handler(), respect_handler_level=True)
+            _listener.start()
+            _handler = StructuredQueueHandler(log_queue)
+            atexit.register(shutdown_logging)
+        return _handler
+
+
+def shutdown_logging():
+    global _handler, _listener
+    with _handler_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _handler, _listener = None, None
 
 
 class ETLLogger:
     
     def __init__(self, name: str, log_to_file: bool = True):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.INFO)
+        self.logger.setLevel(LOGGING_CONFIG['level'])
+        self.logger.propagate = False
+        self.log_to_file = log_to_file
+        self.phase: str = None
+        self.item_level = logging.getLevelName(LOGGING_CONFIG['item_level'])
+        self._items = itertools.count()
         
-        if self.logger.handlers:
-            self.logger.handlers.clear()
+        handler = get_log_handler()
+        if handler not in self.logger.handlers:
+            for stale in list(self.logger.handlers):
+                self.logger.removeHandler(stale)
+            self.logger.addHandler(handler)
+    
+    def info(self, message: str, **fields):
+        self._log(logging.INFO, message, fields)
         
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+    def warning(self, message: str, **fields):
+        self._log(logging.WARNING, message, fields)
         
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+    def error(self, message: str, exc_info: bool = False, **fields):
+        self._log(logging.ERROR, message, fields, exc_info=exc_info)
         
-        if log_to_file:
-            log_dir = Path(__file__).parent.parent / 'logs'
-            log_dir.mkdir(exist_ok=True)
-            
-            log_file = log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-    
-    def info(self, message: str):
-        self.logger.info(message)
-    
-    def warning(self, message: str):
-        self.logger.warning(message)
-    
-    def error(self, message: str, exc_info: bool = False):
-        self.logger.error(message, exc_info=exc_info)
-    
-    def success(self, message: str):
-        self.logger.info(f"SUCCESS: {message}")
-    
-    def debug(self, message: str):
-        self.logger.debug(message)
+    def success(self, message: str, **fields):
+        self._log(logging.INFO, f"SUCCESS: {message}", fields)
+        
+    def debug(self, message: str, **fields):
+        self._log(logging.DEBUG, message, fields)
+        
+    def item(self, message: str, **fields):
+        if not self.logger.isEnabledFor(self.item_level):
+            return
+        if next(self._items) % LOGGING_CONFIG['item_every']:
+            return
+        self._log(self.item_level, message, fields)
+        
+    def _log(self, level: int, message: str, fields: dict, exc_info: bool = False):
+        if not self.logger.isEnabledFor(level):
+            return
+        context = {'run_id': get_run_metrics().run_id}
+        if self.phase:
+            context['phase'] = self.phase
+        context.update(fields)
+        self.logger.log(level, message, exc_info=exc_info,
+                        extra={'fields': context, 'to_file': self.log_to_file})
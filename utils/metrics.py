@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import requests
+from config.settings import METRICS_CONFIG
+
+
+class Histogram:
+    
+    def __init__(self, buckets: List[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+    
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            'buckets': {str(bound): count for bound, count in zip(self.buckets, self.counts)},
+            'count': self.count,
+            'sum': round(self.sum, 4)
+        }
+
+
+class HostStats:
+    
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.status_codes: Dict[int, int] = defaultdict(int)
+        self.latency = Histogram(METRICS_CONFIG['latency_buckets'])
+        
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'status_codes': {str(code): count for code, count in sorted(self.status_codes.items())},
+            'latency_seconds': self.latency.as_dict()
+        }
+
+
+class RunMetrics:
+    
+    def __init__(self, run_id: str = None):
+        self.run_id = run_id or f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        self.started_at = time.time()
+        self.finished_at: float = None
+        self.etls: Dict[str, Dict[str, object]] = defaultdict(lambda: {'status': None, 'seconds': None, 'phases': {}})
+        self.hosts: Dict[str, HostStats] = defaultdict(HostStats)
+        self.db_writes: Dict[str, Dict[str, float]] = defaultdict(lambda: {'writes': 0, 'rows': 0, 'seconds': 0.0})
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        
+    def record_phase(self, etl: str, phase: str, wall_seconds: float, cpu_seconds: float,
+                     rows_in: Optional[int], rows_out: Optional[int]):
+        with self._lock:
+            self.etls[etl]['phases'][phase] = {
+                'wall_seconds': round(wall_seconds, 4),
+                'cpu_seconds': round(cpu_seconds, 4),
+                'rows_in': rows_in,
+                'rows_out': rows_out
+            }
+    
+    def record_etl(self, etl: str, status: str = None, seconds: float = None):
+        with self._lock:
+            if status is not None:
+                self.etls[etl]['status'] = status
+            if seconds is not None:
+                self.etls[etl]['seconds'] = round(seconds, 4)
+    
+    def record_response(self, response: requests.Response):
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', ())
+        with self._lock:
+            stats = self.hosts[self._host(response.url)]
+            stats.requests += 1
+            stats.retries += len(retries)
+            stats.bytes += len(response.content)
+            stats.status_codes[response.status_code] += 1
+            stats.latency.observe(response.elapsed.total_seconds())
+    
+    def record_retry(self, url: str):
+        with self._lock:
+            self.hosts[self._host(url)].retries += 1
+    
+    def record_error(self, url: str):
+        with self._lock:
+            self.hosts[self._host(url)].errors += 1
+    
+    def record_db_write(self, table: str, rows: int, seconds: float):
+        with self._lock:
+            stats = self.db_writes[table]
+            stats['writes'] += 1
+            stats['rows'] += rows
+            stats['seconds'] = round(stats['seconds'] + seconds, 4)
+    
+    def finish(self):
+        self.finished_at = time.time()
+        
+    def as_dict(self) -> Dict[str, object]:
+        finished_at = self.finished_at or time.time()
+        with self._lock:
+            return {
+                'run_id': self.run_id,
+                'started_at': self.started_at,
+                'finished_at': finished_at,
+                'duration_seconds': round(finished_at - self.started_at, 4),
+                'etls': {name: dict(etl) for name, etl in self.etls.items()},
+                'http': {host: stats.as_dict() for host, stats in self.hosts.items()},
+                'db_writes': {table: dict(stats) for table, stats in self.db_writes.items()}
+            }
+    
+    def export(self, directory: Path = None) -> Dict[str, Path]:
+        directory = directory or Path(__file__).parent.parent / METRICS_CONFIG['directory']
+        directory.mkdir(parents=True, exist_ok=True)
+        report = self.as_dict()
+        
+        json_path = directory / f"run_{self.run_id}.json"
+        prometheus_path = directory / METRICS_CONFIG['prometheus_file']
+        with self._export_lock:
+            self._write(json_path, json.dumps(report, indent=2, default=str))
+            self._write(prometheus_path, self.to_prometheus(report))
+        return {'json': json_path, 'prometheus': prometheus_path}
+    
+    def to_prometheus(self, report: Dict[str, object] = None) -> str:
+        report = report or self.as_dict()
+        lines = []
+        
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{self._escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        
+        metric('etl_run_duration_seconds', 'gauge', "Wall time of the last orchestrator run",
+               [({}, report['duration_seconds'])])
+        metric('etl_run_finished_timestamp_seconds', 'gauge', "Unix time the last run finished",
+               [({}, round(report['finished_at'], 3))])
+        
+        etls = report['etls']
+        metric('etl_success', 'gauge', "1 if the ETL succeeded in the last run",
+               [({'etl': name}, int(etl['status'] == 'SUCCESS')) for name, etl in etls.items()])
+        metric('etl_duration_seconds', 'gauge', "Wall time of the ETL in the last run",
+               [({'etl': name}, etl['seconds']) for name, etl in etls.items() if etl['seconds'] is not None])
+        
+        phases = [(name, phase, stats) for name, etl in etls.items() for phase, stats in etl['phases'].items()]
+        for key, help_text in [('wall_seconds', "Wall time per ETL phase"),
+                               ('cpu_seconds', "CPU time of the ETL thread per phase"),
+                               ('rows_in', "Rows entering each ETL phase"),
+                               ('rows_out', "Rows produced by each ETL phase")]:
+            metric(f'etl_phase_{key}', 'gauge', help_text,
+                   [({'etl': name, 'phase': phase}, stats[key]) for name, phase, stats in phases
+                    if stats[key] is not None])
+        
+        hosts = report['http']
+        for key, help_text in [('requests', "HTTP responses received per upstream host"),
+                               ('errors', "HTTP requests that failed without a response"),
+                               ('retries', "HTTP retries per upstream host"),
+                               ('bytes', "HTTP response bytes per upstream host")]:
+            metric(f'etl_http_{key}_total', 'counter', help_text,
+                   [({'host': host}, stats[key]) for host, stats in hosts.items()])
+        
+        lines.append("# HELP etl_http_request_duration_seconds HTTP request latency per upstream host")
+        lines.append("# TYPE etl_http_request_duration_seconds histogram")
+        for host, stats in hosts.items():
+            latency = stats['latency_seconds']
+            label = self._escape(host)
+            for bound, count in latency['buckets'].items():
+                lines.append(f'etl_http_request_duration_seconds_bucket{{host="{label}",le="{bound}"}} {count}')
+            lines.append(f'etl_http_request_duration_seconds_bucket{{host="{label}",le="+Inf"}} {latency["count"]}')
+            lines.append(f'etl_http_request_duration_seconds_sum{{host="{label}"}} {latency["sum"]}')
+            lines.append(f'etl_http_request_duration_seconds_count{{host="{label}"}} {latency["count"]}')
+            
+        writes = report['db_writes']
+        metric('etl_db_write_seconds_total', 'counter', "Time spent writing to each table",
+               [({'table': table}, stats['seconds']) for table, stats in writes.items()])
+        metric('etl_db_rows_written_total', 'counter', "Rows written to each table",
+               [({'table': table}, stats['rows']) for table, stats in writes.items()])
+        return '\n'.join(lines) + '\n'
+    
+    def _host(self, url: str) -> str:
+        return urlparse(url).netloc or 'unknown'
+    
+    def _escape(self, value: object) -> str:
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    
+    def _write(self, path: Path, content: str):
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+
+
+_metrics: RunMetrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_run_metrics() -> RunMetrics:
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = RunMetrics()
+        return _metrics
+
+
+def reset_run_metrics(run_id: str = None) -> RunMetrics:
+    global _metrics
+    with _metrics_lock:
+        _metrics = RunMetrics(run_id)
+        return _metrics
+
+
+def observe_response(response: requests.Response, *args, **kwargs):
+    get_run_metrics().record_response(response)
@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, TypeVar
+from config.settings import HEALTH_CONFIG
+from utils.logger import ETLLogger
+from utils.rate_limiter import WaitTracker, track_waits
+
+
+T = TypeVar('T')
+
+
+class CircuitBreaker:
+    
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)
+        self.state = 'closed'
+        self.open_until = 0.0
+        self.trips = 0
+        self.probing = False
+        
+    def success_rate(self) -> float:
+        if not self.samples:
+            return 1.0
+        return sum(1 for ok, _, _ in self.samples if ok) / len(self.samples)
+    
+    def latency(self, quantile: float) -> float:
+        latencies = sorted(latency for _, latency, _ in self.samples)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+    
+    def as_dict(self) -> dict:
+        return {
+            'samples': [list(sample) for sample in self.samples],
+            'state': self.state,
+            'open_until': self.open_until,
+            'trips': self.trips
+        }
+
+
+class ProviderHealth:
+    
+    def __init__(self, path: Path = None, logger=None):
+        self.path = path or Path(__file__).parent.parent / HEALTH_CONFIG['path']
+        self.logger = logger
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._saved_at = 0.0
+        self._load()
+        
+    def allow(self, provider: str) -> bool:
+        with self._lock:
+            breaker = self._breaker(provider)
+            if breaker.state == 'closed':
+                return True
+            if time.time() < breaker.open_until or breaker.probing:
+                return False
+            breaker.state, breaker.probing = 'half_open', True
+        self._log(f"Circuit for {provider} half-open, sending a probe request", warning=False)
+        return True
+    
+    def record(self, provider: str, ok: bool, latency: float):
+        with self._lock:
+            breaker = self._breaker(provider)
+            previous = breaker.state
+            if previous == 'half_open':
+                breaker.probing = False
+                if ok:
+                    breaker.state, breaker.trips = 'closed', 0
+                    breaker.samples.clear()
+                else:
+                    self._trip(breaker)
+            breaker.samples.append((ok, round(latency, 4), time.time()))
+            if previous == 'closed' and self._should_trip(breaker):
+                self._trip(breaker)
+            changed = breaker.state != previous
+            due = changed or time.monotonic() - self._saved_at >= HEALTH_CONFIG['save_interval']
+            
+        if changed:
+            self._log(f"Circuit for {provider} {breaker.state} (success rate {breaker.success_rate():.0%} "
+                      f"over {len(breaker.samples)} requests)", warning=breaker.state == 'open')
+        if due:
+            self.save()
+    
+    def call(self, attempts: List[Tuple[str, Callable[[], T]]]) -> T:
+        attempts = list(attempts)
+        errors = []
+        pending: Dict[Future, dict] = {}
+        launch_next, hedged = True, None
+        
+        while attempts or pending:
+            if attempts and launch_next:
+                provider, func = attempts.pop(0)
+                if not self.allow(provider):
+                    errors.append(f"{provider}: circuit open")
+                    continue
+                attempt = {'provider': provider, 'started': time.perf_counter(), 'waits': WaitTracker(),
+                           'hedge_after': HEALTH_CONFIG['hedge_after'].get(provider)}
+                pending[self._start(attempt, func)] = attempt
+                launch_next = False
+                hedged = attempt if attempt['hedge_after'] and attempts else None
+                
+            if not pending:
+                continue
+            timeout = None if hedged is None else max(0.0, hedged['hedge_after'] - self._latency(hedged))
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if self._latency(hedged) >= hedged['hedge_after']:
+                    self._log(f"{hedged['provider']} slower than {hedged['hedge_after']}s, also trying the fallback",
+                              warning=False)
+                    launch_next, hedged = True, None
+                continue
+            
+            for future in done:
+                attempt = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(f"{attempt['provider']}: {e}")
+                    launch_next, hedged = True, None
+        
+        raise RuntimeError(f"All providers failed ({'; '.join(errors)})")
+    
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                provider: {
+                    'state': breaker.state,
+                    'requests': len(breaker.samples),
+                    'success_rate': round(breaker.success_rate(), 3),
+                    'p50_seconds': breaker.latency(0.5),
+                    'p95_seconds': breaker.latency(0.95)
+                }
+                for provider, breaker in self.breakers.items()
+            }
+    
+    def save(self):
+        with self._lock:
+            state = {provider: breaker.as_dict() for provider, breaker in self.breakers.items()}
+            self._saved_at = time.monotonic()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix('.tmp')
+            temporary.write_text(json.dumps(state))
+            os.replace(temporary, self.path)
+        except OSError as e:
+            self._log(f"Could not persist provider health: {e}")
+    
+    def _start(self, attempt: dict, func: Callable[[], T]) -> Future:
+        future = Future()
+        
+        def run():
+            try:
+                with track_waits(attempt['waits']):
+                    result = func()
+            except Exception as e:
+                self.record(attempt['provider'], False, self._latency(attempt))
+                future.set_exception(e)
+                return
+            self.record(attempt['provider'], True, self._latency(attempt))
+            future.set_result(result)
+            
+        threading.Thread(target=run, name=f"provider-{attempt['provider']}", daemon=True).start()
+        return future
+    
+    def _latency(self, attempt: dict) -> float:
+        return time.perf_counter() - attempt['started'] - attempt['waits'].total()
+        
+    def _should_trip(self, breaker: CircuitBreaker) -> bool:
+        return (len(breaker.samples) >= HEALTH_CONFIG['min_requests']
+                and breaker.success_rate() < HEALTH_CONFIG['min_success_rate'])
+    
+    def _trip(self, breaker: CircuitBreaker):
+        cooldown = min(HEALTH_CONFIG['cooldown'] * 2 ** breaker.trips, HEALTH_CONFIG['max_cooldown'])
+        breaker.state = 'open'
+        breaker.open_until = time.time() + cooldown
+        breaker.trips += 1
+        
+    def _breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker(HEALTH_CONFIG['window'])
+        return self.breakers[provider]
+    
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            self._log(f"Ignoring unreadable provider health file: {e}")
+            return
+        
+        cutoff = time.time() - HEALTH_CONFIG['max_age']
+        for provider, saved in state.items():
+            breaker = self._breaker(provider)
+            breaker.samples.extend(tuple(sample) for sample in saved['samples'] if sample[2] >= cutoff)
+            breaker.trips = saved['trips']
+            if saved['state'] != 'closed':
+                breaker.state, breaker.open_until = 'open', saved['open_until']
+    
+    def _log(self, message: str, warning: bool = True):
+        if self.logger is None:
+            return
+        if warning:
+            self.logger.warning(message)
+        else:
+            self.logger.info(message)
+
+
+_health: ProviderHealth = None
+_health_lock = threading.Lock()
+
+
+def get_provider_health() -> ProviderHealth:
+    global _health
+    with _health_lock:
+        if _health is None:
+            _health = ProviderHealth(logger=ETLLogger("ProviderHealth"))
+        return _health
+
+
+def reset_provider_health(path: Path = None) -> ProviderHealth:
+    global _health
+    with _health_lock:
+        _health = ProviderHealth(path, logger=ETLLogger("ProviderHealth"))
+        return _health
@@ -0,0 +1,102 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from config.settings import RATE_LIMITS
+
+
+_local = threading.local()
+
+
+class WaitTracker:
+    
+    def __init__(self):
+        self.waited = 0.0
+        self.since: float = None
+        self._lock = threading.Lock()
+        
+    def total(self) -> float:
+        with self._lock:
+            current = time.perf_counter() - self.since if self.since is not None else 0.0
+            return self.waited + current
+        
+    def start(self):
+        with self._lock:
+            if self.since is None:
+                self.since = time.perf_counter()
+    
+    def stop(self):
+        with self._lock:
+            if self.since is not None:
+                self.waited += time.perf_counter() - self.since
+                self.since = None
+
+
+@contextmanager
+def track_waits(tracker: WaitTracker) -> Iterator[WaitTracker]:
+    previous = getattr(_local, 'tracker', None)
+    _local.tracker = tracker
+    try:
+        yield tracker
+    finally:
+        _local.tracker = previous
+
+
+class TokenBucket:
+    
+    def __init__(self, rate: float, capacity: int, min_rate: float = None):
+        self.max_rate = rate
+        self.min_rate = min_rate or rate / 10
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        
+    def acquire(self):
+        tracker = getattr(_local, 'tracker', None)
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now >= self.blocked_until and self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+                if tracker is not None:
+                    tracker.start()
+                time.sleep(wait)
+        finally:
+            if tracker is not None:
+                tracker.stop()
+            
+    def penalize(self, retry_after: float = None):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.blocked_until = max(self.blocked_until, now + pause)
+            
+    def reward(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    with _buckets_lock:
+        if provider not in _buckets:
+            config = RATE_LIMITS[provider]
+            _buckets[provider] = TokenBucket(config['rate'], config['capacity'])
+        return _buckets[provider]
@@ -0,0 +1,170 @@
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Iterable, List
+from config.settings import SCHEDULER_CONFIG
+
+
+class JobCancelled(Exception):
+    pass
+
+
+_current = threading.local()
+
+
+def current_cancel_event() -> threading.Event:
+    event = getattr(_current, 'cancel_event', None)
+    return event if event is not None else threading.Event()
+
+
+class DAGScheduler:
+    
+    def __init__(self, logger, max_workers: int = None, job_timeout: int = None):
+        self.logger = logger
+        self.max_workers = max_workers or SCHEDULER_CONFIG['max_workers']
+        self.job_timeout = job_timeout or SCHEDULER_CONFIG['job_timeout']
+        self.jobs: Dict[str, dict] = {}
+        self._host_locks: Dict[str, threading.BoundedSemaphore] = {}
+        self._registry_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        
+    def add_job(self, name: str, func: Callable[[], None], depends_on: Iterable[str] = (),
+                host: str = None, timeout: int = None):
+        self.jobs[name] = {
+            'func': func,
+            'depends_on': list(depends_on),
+            'host': host,
+            'timeout': timeout or self.job_timeout,
+            'started_at': None,
+            'cancel': threading.Event()
+        }
+        
+    def run(self) -> Dict[str, str]:
+        self._validate()
+        results: Dict[str, str] = {}
+        pending = dict(self.jobs)
+        running: Dict[Future, str] = {}
+        
+        try:
+            while pending or running:
+                for name in self._ready_jobs(pending, results):
+                    job = pending.pop(name)
+                    self.logger.info(f"Scheduling {name}")
+                    running[self._submit(name, job)] = name
+                    
+                for name in self._blocked_jobs(pending, results):
+                    failed = [dep for dep in pending.pop(name)['depends_on'] if results.get(dep, "SUCCESS") != "SUCCESS"]
+                    results[name] = f"SKIPPED: dependency {', '.join(failed)} failed"
+                    self.logger.warning(f"{name}: {results[name]}")
+                    
+                if not running:
+                    continue
+                
+                done, _ = wait(running, timeout=SCHEDULER_CONFIG['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if name in results:
+                        self.logger.info(f"{name} stopped after timing out")
+                    elif error is None:
+                        results[name] = "SUCCESS"
+                    else:
+                        self.logger.error(f"{name} failed: {str(error)}")
+                        results[name] = f"FAILED: {str(error)}"
+                        
+                for future, name in list(running.items()):
+                    job = self.jobs[name]
+                    if name not in results and self._timed_out(job):
+                        job['cancel'].set()
+                        results[name] = f"FAILED: timed out after {job['timeout']}s"
+                        self.logger.error(f"{name} {results[name]}, waiting up to "
+                                          f"{SCHEDULER_CONFIG['cancel_grace']}s for it to stop")
+                    elif name in results and self._timed_out(job, SCHEDULER_CONFIG['cancel_grace']):
+                        running.pop(future)
+                        results[name] += " (abandoned)"
+                        self.logger.error(f"{name} did not stop within {SCHEDULER_CONFIG['cancel_grace']}s "
+                                          f"of timing out, abandoning it")
+        except BaseException:
+            for job in self.jobs.values():
+                job['cancel'].set()
+            raise
+        finally:
+            _, still_running = wait(running, timeout=SCHEDULER_CONFIG['cancel_grace'])
+            if still_running:
+                self.logger.warning(f"{len(still_running)} job(s) still running after "
+                                    f"{SCHEDULER_CONFIG['cancel_grace']}s, abandoning them")
+            
+        return results
+    
+    def _submit(self, name: str, job: dict) -> Future:
+        future = Future()
+        
+        def run():
+            with self._slots:
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    self._run_job(name, job)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(None)
+        
+        threading.Thread(target=run, name=f"etl-{name}", daemon=True).start()
+        return future
+    
+    def _run_job(self, name: str, job: dict):
+        with self._host_lock(job['host']):
+            if job['cancel'].is_set():
+                raise JobCancelled(f"{name} cancelled before it started")
+            job['started_at'] = time.monotonic()
+            self.logger.info(f"Running {name}")
+            _current.cancel_event = job['cancel']
+            try:
+                job['func']()
+            finally:
+                _current.cancel_event = None
+            
+    def _host_lock(self, host: str):
+        if host is None:
+            return nullcontext()
+        with self._registry_lock:
+            if host not in self._host_locks:
+                limit = SCHEDULER_CONFIG['host_concurrency'].get(host, SCHEDULER_CONFIG['default_host_concurrency'])
+                self._host_locks[host] = threading.BoundedSemaphore(limit)
+            return self._host_locks[host]
+        
+    def _ready_jobs(self, pending: Dict[str, dict], results: Dict[str, str]) -> List[str]:
+        return [
+            name for name, job in pending.items()
+            if all(results.get(dep) == "SUCCESS" for dep in job['depends_on'] if dep in self.jobs)
+        ]
+        
+    def _blocked_jobs(self, pending: Dict[str, dict], results: Dict[str, str]) -> List[str]:
+        return [
+            name for name, job in pending.items()
+            if any(dep in results and results[dep] != "SUCCESS" for dep in job['depends_on'])
+        ]
+        
+    def _timed_out(self, job: dict, grace: float = 0) -> bool:
+        started_at = job['started_at']
+        return started_at is not None and time.monotonic() - started_at > job['timeout'] + grace
+    
+    def _validate(self):
+        visiting, visited = set(), set()
+        
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at {name}")
+            visiting.add(name)
+            for dep in self.jobs[name]['depends_on']:
+                if dep in self.jobs:
+                    visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            
+        for name in self.jobs:
+            visit(name)
@@ -0,0 +1,110 @@
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Set
+from config.settings import NEWS_CONFIG
+
+
+class BloomFilter:
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+    
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+
+class SeenIndex:
+    
+    def __init__(self, path: Path = None, retention_days: int = None):
+        self.path = path or Path(__file__).parent.parent / NEWS_CONFIG['seen_index']
+        self.retention_days = retention_days or NEWS_CONFIG['seen_retention_days']
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, first_seen REAL NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS feeds (url TEXT PRIMARY KEY, digest TEXT NOT NULL)")
+        self._prune()
+        self.bloom = BloomFilter(NEWS_CONFIG['bloom_capacity'], NEWS_CONFIG['bloom_error_rate'])
+        for (key,) in self._conn.execute("SELECT key FROM seen"):
+            self.bloom.add(key)
+    
+    @staticmethod
+    def item_key(scope: str, uuid: str = None, link: str = None) -> str:
+        identity = f"{scope}|uuid:{uuid}" if uuid else f"{scope}|link:{link}"
+        return hashlib.sha1(identity.encode()).hexdigest()
+    
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone() is None
+        
+    def unseen(self, keys: Iterable[str]) -> Set[str]:
+        keys = set(keys)
+        candidates = [key for key in keys if key in self.bloom]
+        new_keys = keys - set(candidates)
+        if not candidates:
+            return new_keys
+        
+        with self._lock:
+            known = set()
+            for i in range(0, len(candidates), 500):
+                chunk = candidates[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                known.update(row[0] for row in self._conn.execute(
+                    f"SELECT key FROM seen WHERE key IN ({placeholders})", chunk))
+        return new_keys | (set(candidates) - known)
+    
+    def add(self, keys: Iterable[str]):
+        now = time.time()
+        keys = list(keys)
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO seen (key, first_seen) VALUES (?, ?)",
+                                   [(key, now) for key in keys])
+        for key in keys:
+            self.bloom.add(key)
+    
+    def feed_changed(self, url: str, body: bytes) -> bool:
+        digest = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM feeds WHERE url = ?", (url,)).fetchone()
+        return row is None or row[0] != digest
+    
+    def remember_feed(self, url: str, body: bytes):
+        digest = hashlib.sha1(body).hexdigest()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO feeds (url, digest) VALUES (?, ?)", (url, digest))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def _prune(self):
+        cutoff = time.time() - self.retention_days * 86400
+        with self._conn:
+            self._conn.execute("DELETE FROM seen WHERE first_seen < ?", (cutoff,))
+
+
+_index: SeenIndex = None
+_index_lock = threading.Lock()
+
+
+def get_seen_index() -> SeenIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SeenIndex()
+        return _index
@@ -0,0 +1,96 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+CANDLE_COLUMNS = ['Date', 'Moeda', 'Open Price', 'High Price', 'Low Price',
+                  'Close Price', 'Volume', 'Number of Trades', 'Market_Cap']
+
+
+class TickRingBuffer:
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype='int64')
+        self.prices = np.zeros(capacity, dtype='float64')
+        self.quantities = np.zeros(capacity, dtype='float64')
+        self.count = 0
+        
+    def append(self, timestamp: int, price: float, quantity: float):
+        position = self.count % self.capacity
+        self.times[position] = timestamp
+        self.prices[position] = price
+        self.quantities[position] = quantity
+        self.count += 1
+        
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    def last(self) -> Optional[Tuple[int, float, float]]:
+        if not self.count:
+            return None
+        position = (self.count - 1) % self.capacity
+        return int(self.times[position]), float(self.prices[position]), float(self.quantities[position])
+    
+    def snapshot(self) -> pd.DataFrame:
+        order = np.arange(self.count - len(self), self.count) % self.capacity
+        return pd.DataFrame({
+            'Time': pd.to_datetime(self.times[order], unit='ms'),
+            'Price': self.prices[order],
+            'Quantity': self.quantities[order]
+        })
+
+
+class CandleAggregator:
+    
+    def __init__(self, intervals: Dict[str, int]):
+        self.intervals = intervals
+        self.candles: Dict[Tuple[str, str], list] = {}
+        self.closed_until: Dict[Tuple[str, str], int] = {}
+        self.late_ticks = 0
+        
+    def add(self, symbol: str, timestamp: int, price: float, quantity: float) -> List[tuple]:
+        closed = []
+        late = False
+        for interval, step in self.intervals.items():
+            key = (symbol, interval)
+            start = timestamp - timestamp % step
+            candle = self.candles.get(key)
+            
+            if start < self.closed_until.get(key, start) or (candle is not None and start < candle[0]):
+                late = True
+            elif candle is None or start > candle[0]:
+                if candle is not None:
+                    closed.append(self._close(key, candle))
+                self.candles[key] = [start, price, price, price, price, quantity, 1]
+            else:
+                candle[2] = max(candle[2], price)
+                candle[3] = min(candle[3], price)
+                candle[4] = price
+                candle[5] += quantity
+                candle[6] += 1
+        
+        self.late_ticks += late
+        return closed
+    
+    def close_expired(self, now: int, delay: int = 0) -> List[tuple]:
+        closed = []
+        for key, candle in list(self.candles.items()):
+            if candle[0] + self.intervals[key[1]] + delay <= now:
+                closed.append(self._close(key, candle))
+                del self.candles[key]
+        return closed
+    
+    def _close(self, key: Tuple[str, str], candle: list) -> tuple:
+        symbol, interval = key
+        self.closed_until[key] = candle[0] + self.intervals[interval]
+        return (interval, symbol, *candle)
+    
+    @staticmethod
+    def to_frame(candles: List[tuple], moeda) -> pd.DataFrame:
+        df = pd.DataFrame(candles, columns=['Interval', 'Symbol', 'Start', 'Open Price', 'High Price',
+                                            'Low Price', 'Close Price', 'Volume', 'Number of Trades'])
+        df['Date'] = pd.to_datetime(df['Start'], unit='ms')
+        df['Moeda'] = df['Symbol'].map(moeda)
+        df['Market_Cap'] = 0
+        return df[['Interval'] + CANDLE_COLUMNS]
@@ -0,0 +1,196 @@
+import io
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+from config.settings import QUEUE_CONFIG
+
+
+class WorkQueue:
+    
+    def __init__(self, path: Path = None, max_attempts: int = None):
+        self.path = Path(path) if path else Path(__file__).parent.parent / QUEUE_CONFIG['path']
+        self.max_attempts = max_attempts or QUEUE_CONFIG['max_attempts']
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=QUEUE_CONFIG['busy_timeout'],
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA journal_mode={QUEUE_CONFIG['journal_mode']}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS shards (
+                run_id TEXT NOT NULL,
+                etl TEXT NOT NULL,
+                shard INTEGER NOT NULL,
+                items TEXT NOT NULL,
+                options TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                available_at REAL NOT NULL,
+                rows INTEGER,
+                result BLOB,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (run_id, etl, shard)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_shards_status ON shards (status, available_at)")
+        self._prune()
+        
+    def publish(self, run_id: str, etl: str, shards: List[list], options: dict = None) -> int:
+        now = time.time()
+        rows = [
+            (run_id, etl, number, json.dumps(items), json.dumps(options or {}), now, now, now)
+            for number, items in enumerate(shards)
+        ]
+        with self._transaction() as conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO shards (run_id, etl, shard, items, options, status, available_at, created, updated)
+                VALUES (?, ?, ?, ?, ?, 'pending', ?, ?, ?)
+            """, rows)
+            conn.execute("""
+                UPDATE shards SET status = 'pending', attempts = 0, error = NULL, available_at = ?, updated = ?
+                WHERE run_id = ? AND etl = ? AND status = 'failed'
+            """, (now, now, run_id, etl))
+            return conn.execute("SELECT COUNT(*) FROM shards WHERE run_id = ? AND etl = ? AND status != 'done'",
+                                (run_id, etl)).fetchone()[0]
+    
+    def claim(self, worker: str, lease_seconds: int, etl_names: List[str] = None) -> Optional[dict]:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("""
+                UPDATE shards SET status = 'failed', worker = NULL, updated = ?,
+                       error = 'lease expired on the last attempt'
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+            """, (now, now, self.max_attempts))
+            
+            query = """
+                SELECT run_id, etl, shard, items, options, attempts FROM shards
+                WHERE ((status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?))
+            """
+            params = [now, now]
+            if etl_names:
+                query += f" AND etl IN ({','.join('?' * len(etl_names))})"
+                params += etl_names
+            row = conn.execute(query + " ORDER BY created, shard LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            
+            run_id, etl, shard, items, options, attempts = row
+            conn.execute("""
+                UPDATE shards SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, updated = ?
+                WHERE run_id = ? AND etl = ? AND shard = ?
+            """, (worker, now + lease_seconds, now, run_id, etl, shard))
+            
+        return {
+            'run_id': run_id,
+            'etl': etl,
+            'shard': shard,
+            'items': json.loads(items),
+            'options': json.loads(options),
+            'attempt': attempts + 1
+        }
+        
+    def extend_lease(self, shard: dict, worker: str, lease_seconds: int) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE shards SET lease_expires = ?, updated = ?
+                WHERE run_id = ? AND etl = ? AND shard = ? AND status = 'leased' AND worker = ?
+            """, (now + lease_seconds, now, shard['run_id'], shard['etl'], shard['shard'], worker))
+            return cursor.rowcount == 1
+        
+    def complete(self, shard: dict, worker: str, frame: pd.DataFrame) -> bool:
+        result = None
+        rows = 0 if frame is None else len(frame)
+        if rows:
+            buffer = io.BytesIO()
+            frame.to_parquet(buffer, index=False)
+            result = buffer.getvalue()
+            
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE shards SET status = 'done', rows = ?, result = ?, error = NULL, worker = NULL, updated = ?
+                WHERE run_id = ? AND etl = ? AND shard = ? AND status = 'leased' AND worker = ?
+            """, (rows, result, time.time(), shard['run_id'], shard['etl'], shard['shard'], worker))
+            return cursor.rowcount == 1
+        
+    def fail(self, shard: dict, worker: str, error: str) -> str:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("""
+                UPDATE shards SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                       available_at = ? + ? * attempts, error = ?, worker = NULL, updated = ?
+                WHERE run_id = ? AND etl = ? AND shard = ? AND status = 'leased' AND worker = ?
+            """, (self.max_attempts, now, QUEUE_CONFIG['retry_delay'], error, now,
+                  shard['run_id'], shard['etl'], shard['shard'], worker))
+            row = conn.execute("SELECT status FROM shards WHERE run_id = ? AND etl = ? AND shard = ?",
+                               (shard['run_id'], shard['etl'], shard['shard'])).fetchone()
+        return row[0] if row else 'missing'
+    
+    def counts(self, run_id: str, etl: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT status, COUNT(*), COALESCE(SUM(rows), 0) FROM shards
+                WHERE run_id = ? AND etl = ? GROUP BY status
+            """, (run_id, etl)).fetchall()
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0, 'rows': 0}
+        for status, count, shard_rows in rows:
+            counts[status] = count
+            counts['rows'] += shard_rows
+        return counts
+    
+    def failures(self, run_id: str, etl: str) -> Dict[int, str]:
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT shard, error FROM shards WHERE run_id = ? AND etl = ? AND status = 'failed' ORDER BY shard",
+                (run_id, etl)))
+    
+    def results(self, run_id: str, etl: str) -> Iterator[pd.DataFrame]:
+        with self._lock:
+            shards = [row[0] for row in self._conn.execute(
+                "SELECT shard FROM shards WHERE run_id = ? AND etl = ? AND status = 'done' AND rows > 0 ORDER BY shard",
+                (run_id, etl))]
+        for shard in shards:
+            with self._lock:
+                row = self._conn.execute("SELECT result FROM shards WHERE run_id = ? AND etl = ? AND shard = ?",
+                                         (run_id, etl, shard)).fetchone()
+            yield pd.read_parquet(io.BytesIO(row[0]))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def _prune(self):
+        cutoff = time.time() - QUEUE_CONFIG['retention_days'] * 86400
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM shards WHERE updated < ? AND status IN ('done', 'failed')", (cutoff,))
+
+
+_queue: WorkQueue = None
+_queue_lock = threading.Lock()
+
+
+def get_work_queue() -> WorkQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WorkQueue()
+        return _queue